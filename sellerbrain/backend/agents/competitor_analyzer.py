@@ -13,15 +13,24 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.apify_tool import apify_crawl_product
 from tools.vision_tool import analyze_product_image, compare_product_images
+from utils.llm_instrumentation import langchain_callbacks
+from utils.model_router import get_model_router
+from utils.resilience import provider_timeout
 
 
-# LLM 설정
+# LLM 설정 (모델은 에이전트를 만들 때 모델 라우터가 선택)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.5-pro",
-    temperature=0.3,
-    google_api_key=GEMINI_API_KEY
-)
+
+
+def get_llm() -> ChatGoogleGenerativeAI:
+    model = get_model_router().route("google", "competitor_analysis")
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=0.3,
+        timeout=provider_timeout("google"),
+        google_api_key=GEMINI_API_KEY,
+        callbacks=langchain_callbacks("CompetitorAnalyzer", model=model)
+    )
 
 
 def create_competitor_analysis_agent() -> Agent:
@@ -52,7 +61,7 @@ def create_competitor_analysis_agent() -> Agent:
             analyze_product_image,         # 단일 이미지 분석
             compare_product_images         # 여러 이미지 비교
         ],
-        llm=llm,
+        llm=get_llm(),
         verbose=True,
         allow_delegation=False,
         memory=True  # 과거 분석 패턴 기억
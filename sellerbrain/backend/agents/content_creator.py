@@ -12,15 +12,24 @@ import sys
 # Tools import
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.imagen_tool import generate_product_image, generate_image_from_competitor_analysis
-from tools.claude_tool import generate_product_titles, generate_detail_html
-from config import GEMINI_MODEL, GEMINI_API_KEY, GEMINI_TEMPERATURE
-
-# LLM 설정
-llm = ChatGoogleGenerativeAI(
-    model=GEMINI_MODEL,
-    temperature=GEMINI_TEMPERATURE,
-    google_api_key=GEMINI_API_KEY
-) if GEMINI_API_KEY else None
+from tools.claude_tool import generate_product_titles, generate_detail_html, generate_page_copy
+from config import GEMINI_API_KEY, GEMINI_TEMPERATURE
+from utils.llm_instrumentation import langchain_callbacks
+from utils.model_router import get_model_router
+from utils.resilience import provider_timeout
+
+# LLM 설정 (모델은 에이전트를 만들 때 모델 라우터가 선택)
+def get_llm():
+    if not GEMINI_API_KEY:
+        return None
+    model = get_model_router().route("google", "content_creation")
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=GEMINI_TEMPERATURE,
+        timeout=provider_timeout("google"),
+        google_api_key=GEMINI_API_KEY,
+        callbacks=langchain_callbacks("ContentCreator", model=model)
+    )
 
 
 def create_content_creator_agent() -> Agent:
@@ -49,12 +58,13 @@ def create_content_creator_agent() -> Agent:
         경쟁사 분석을 바탕으로 차별화된 가치를 전달합니다.
         """,
         tools=[
+            generate_page_copy,                # Claude: 제목 3가지 + 상세페이지 HTML 동시 생성
             generate_product_titles,           # Claude: 제목 3가지 생성
             generate_detail_html,              # Claude: 상세페이지 HTML 생성
             generate_product_image,            # Imagen 3: 이미지 생성
             generate_image_from_competitor_analysis  # Imagen 3: 스타일 기반 이미지 생성
         ],
-        llm=llm,
+        llm=get_llm(),
         verbose=True,
         allow_delegation=False,
         memory=True
@@ -112,8 +122,10 @@ def create_content_generation_task(
 
         **생성할 콘텐츠:**
 
+        제목(1)과 상세페이지 HTML(3)은 generate_page_copy 도구로 한 번에 생성하세요 (두 작업이 동시에 실행되어 더 빠름).
+        한쪽만 다시 만들 때는 generate_product_titles / generate_detail_html 도구를 사용하세요.
+
         1. **제목 3가지 옵션**
-           - generate_product_titles 도구 사용
            - 경쟁사 패턴 기반 (길이, 구조, 키워드 배치)
            - 황금 키워드 최대 2-3개 포함
            - 각 제목 최대 50자 이내
@@ -126,7 +138,6 @@ def create_content_generation_task(
            - 옵션 B: 약간 차별화된 스타일 (더 밝게/어둡게)
 
         3. **상세페이지 HTML**
-           - generate_detail_html 도구 사용
            - 경쟁사 구조 참고 (섹션 순서, 강조 포인트)
            - 쿠팡/네이버 업로드용 HTML (인라인 CSS)
            - FAQ 섹션 포함 (최소 3개)
@@ -325,6 +336,56 @@ def regenerate_html_only(
     )
 
 
+def regenerate_from_feedback(
+    parsed: Dict[str, Any],
+    product_name: str,
+    golden_keywords: List[str],
+    competitor_analysis: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    파싱된 피드백 → 재생성된 GeneratedContent 필드 (utils.content_feedback.apply_feedback에 전달)
+
+    Args:
+        parsed: parse_user_feedback 결과 (action, target, parameters)
+        product_name: 상품명
+        golden_keywords: 황금키워드
+        competitor_analysis: CompetitorAnalysis dict
+
+    Returns:
+        바뀐 필드 (승인/거부처럼 재생성이 없으면 빈 dict)
+    """
+    action = parsed.get("action")
+    parameters = parsed.get("parameters") or {}
+
+    if action in ("regenerate_title", "modify_title", "remove_keyword"):
+        titles = regenerate_titles_only(
+            product_name=product_name,
+            golden_keywords=golden_keywords,
+            competitor_pattern=competitor_analysis.get("title_pattern", {}),
+            max_length=parameters.get("max_length", 50),
+            remove_keywords=parameters.get("remove_keywords")
+        )
+        return {"titles": titles}
+    if action == "regenerate_image":
+        images = regenerate_images_only(
+            product_name=product_name,
+            competitor_style=competitor_analysis.get("image_analysis", {}),
+            style_modifications=parameters.get("style_changes")
+        )
+        return {"images": images}
+    if action == "regenerate_html":
+        structure = competitor_analysis.get("detail_structure", {})
+        html = regenerate_html_only(
+            product_name=product_name,
+            features=structure.get("emphasis_points", []),
+            value_proposition=competitor_analysis.get("value_proposition", ""),
+            target_audience=competitor_analysis.get("target_audience", ""),
+            competitor_structure=structure
+        )
+        return {"detail_html": html}
+    return {}
+
+
 # ============================================
 # 테스트/디버깅용 함수
 # ============================================
@@ -0,0 +1,88 @@
+"""
+모델 생성 경로 비교 벤치마크 (문서 1건당 µs)
+- validate: 문서마다 model_validate
+- construct: model_construct (검증 생략, 단 중첩 모델은 dict 그대로 남음)
+- load_many: TypeAdapter(List[Model]) 한 번으로 일괄 검증 (utils.model_loader)
+
+실행:
+    python benchmarks/bench_model_construct.py [반복 횟수]
+
+결과 (pydantic 2.14): 세 경로 모두 문서당 5~12µs로 차이가 측정 오차 수준
+→ 검증 생략 경로를 두지 않고, 저장소 읽기는 load_many 일괄 검증 사용
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models import CompetitorAnalysis, GeneratedContent
+from utils.ids import new_id
+from utils.model_loader import load_many
+
+
+def _generated_content_payload(html_kb: int) -> dict:
+    section = '<div style="padding: 40px 20px;"><h2 style="font-size: 24px;">주요 특징</h2><p>30시간 초장시간 재생</p></div>'
+    return {
+        "id": new_id(),
+        "product_id": new_id(),
+        "analysis_id": new_id(),
+        "generated_at": datetime.now(),
+        "titles": [
+            {"text": "노이즈캔슬링 TWS 블루투스 이어폰 30시간 재생", "length": 25, "keywords_used": ["TWS", "노이즈캔슬링"], "score": 95},
+            {"text": "30시간 초장시간 무선 이어폰 블루투스 5.3", "length": 22, "keywords_used": ["30시간", "무선"], "score": 88},
+            {"text": "무선 이어폰 프리미엄 TWS", "length": 14, "keywords_used": ["TWS"], "score": 82},
+        ],
+        "images": [
+            {"url": "https://example.com/1.png", "style": "밝은 톤, 45도 각도", "prompt_used": "무선 이어폰, 흰색 배경", "provider": "imagen"},
+            {"url": "https://example.com/2.png", "style": "파스텔 톤, 정면", "prompt_used": "무선 이어폰, 그라데이션 배경", "provider": "imagen"},
+        ],
+        "detail_html": section * max(1, (html_kb * 1024) // len(section.encode("utf-8"))),
+        "concept": {"value_proposition": "출퇴근 걱정 끝", "target_audience": "20-30대 출퇴근족", "tone": "고급스러움 + 기술력"},
+        "trademark_safe": True,
+        "risky_keywords": ["삼성", "애플"],
+        "quality_score": 92.5,
+    }
+
+
+def _competitor_analysis_payload() -> dict:
+    return {
+        "id": new_id(),
+        "product_id": new_id(),
+        "competitor_url": "https://www.coupang.com/vp/products/123456",
+        "analyzed_at": datetime.now(),
+        "title_pattern": {"length": 45, "pattern": "기능 + 제품명 + 특징", "keywords": ["TWS", "블루투스"], "has_numbers": True},
+        "image_analysis": {"color_tone": "밝은 톤", "composition": "45도 각도", "text_overlay": "30% OFF", "style_keywords": ["고급스러움", "미니멀"]},
+        "detail_structure": {"sections": ["제품 소개", "주요 특징", "FAQ"], "emphasis_points": ["30시간 재생"], "has_faq": True},
+        "key_insights": ["제목에 숫자 포함으로 구체성 강조", "밝은 톤 + 45도 각도"],
+        "value_proposition": "30시간 재생으로 출퇴근 고민 끝",
+        "target_audience": "20-30대 출퇴근족",
+    }
+
+
+def run(number: int = 50, batch: int = 100):
+    cases = [
+        ("CompetitorAnalysis", CompetitorAnalysis, _competitor_analysis_payload()),
+        ("GeneratedContent (html 4KB)", GeneratedContent, _generated_content_payload(4)),
+        ("GeneratedContent (html 40KB)", GeneratedContent, _generated_content_payload(40)),
+    ]
+
+    def per_doc(func) -> float:
+        # 여러 번 반복해 최솟값 사용 (다른 프로세스 간섭 제거)
+        return min(timeit.repeat(func, number=number, repeat=7)) / (number * batch) * 1e6
+
+    print(f"{'payload':<30} {'validate':>10} {'construct':>10} {'load_many':>10}")
+    for label, model_cls, payload in cases:
+        documents = [dict(payload) for _ in range(batch)]
+        # 일괄 검증 결과가 문서별 검증과 같은지 먼저 확인
+        assert load_many(model_cls, documents) == [model_cls.model_validate(document) for document in documents]
+
+        validate = per_doc(lambda: [model_cls.model_validate(document) for document in documents])
+        construct = per_doc(lambda: [model_cls.model_construct(**document) for document in documents])
+        batched = per_doc(lambda: load_many(model_cls, documents))
+        print(f"{label:<30} {validate:>10.2f} {construct:>10.2f} {batched:>10.2f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,353 @@
+"""
+소싱 파이프라인 부하 테스트 (POST /sourcing/ → 워커 → WebSocket)
+- N건의 소싱 요청을 동시성 C로 보내고, WebSocket 리스너가 진행 메시지/결과 이벤트 도착 시각을 기록
+- 워커는 녹화된 LLM/Serper 응답을 재생 (utils/llm_fixtures.py, 지연 시간 배율 조정 가능) → 외부 API 호출 없음
+- 측정 범위: API / 수락 제어 / 큐 / 워커 / WebSocket 오버헤드만 (크루는 픽스처 재생으로 대체되어 CrewAI·LLM 클라이언트 비용은 빠짐)
+  크루 내부 오버헤드는 benchmarks/replay_pipeline.py replay --time-scale 0 으로 별도 측정
+- 리포트: 요청 처리량(req/s), 작업 완료 시간 분포, 첫 진행 이벤트 지연, 워커당 메모리, 429/503 거절 수
+
+실행:
+    # 한 프로세스 안에서 전체 스택 (BACKEND_MODE=memory + 워커 스레드 풀)
+    python benchmarks/loadtest_sourcing.py --requests 200 --concurrency 50 --workers 16 --latency-scale 0.05
+
+    # 실행 중인 API + Celery 워커 대상 (워커는 LLM_FIXTURE_PATH를 지정해서 시작)
+    LLM_FIXTURE_PATH=benchmarks/fixtures/sourcing_crew.json celery -A worker.celery_app worker -c 8
+    python benchmarks/loadtest_sourcing.py --url http://localhost:8000 --worker-pid 4242 --worker-pid 4243
+
+    --json 결과 파일을 남겨두면 이후 실행과 비교해 회귀 확인 가능
+- 필요 패키지: pip install httpx websockets uvicorn (+ 한 프로세스 모드는 mongomock mongomock-motor fakeredis)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+DEFAULT_FIXTURE = os.path.join(BACKEND_DIR, "benchmarks", "fixtures", "sourcing_crew.json")
+
+try:
+    import httpx
+    import websockets
+except ImportError:
+    print("⚠️  부하 테스트에 필요한 패키지가 설치되지 않았습니다.")
+    print("   pip install httpx websockets uvicorn")
+    raise
+
+
+@dataclass
+class RequestRecord:
+    query: str
+    sent_at: float
+    responded_at: Optional[float] = None
+    status_code: Optional[int] = None
+    task_id: Optional[str] = None
+    first_event_at: Optional[float] = None
+    completed_at: Optional[float] = None
+
+
+@dataclass
+class LoadTestState:
+    records: Dict[str, RequestRecord] = field(default_factory=dict)   # query → 기록
+    by_task: Dict[str, RequestRecord] = field(default_factory=dict)   # task_id → 기록
+    early_results: Dict[str, float] = field(default_factory=dict)     # POST 응답보다 먼저 도착한 결과
+    messages: int = 0
+
+    def on_message(self, message, received_at: float):
+        self.messages += 1
+        raw = message if isinstance(message, bytes) else message.encode("utf-8")
+        if raw.startswith(b"{"):
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                return
+            if event.get("type") == "result" and event.get("task_id"):
+                record = self.by_task.get(event["task_id"])
+                if record is None:
+                    self.early_results[event["task_id"]] = received_at
+                elif record.completed_at is None:
+                    record.completed_at = received_at
+            return
+        # 워커 진행 메시지 "소싱 작업 시작: {query}" → 요청별 첫 진행 이벤트
+        text = raw.decode("utf-8", errors="replace")
+        _, _, query = text.partition("소싱 작업 시작: ")
+        record = self.records.get(query)
+        if record is not None and record.first_event_at is None:
+            record.first_event_at = received_at
+
+    def on_accepted(self, record: RequestRecord):
+        self.by_task[record.task_id] = record
+        if record.task_id in self.early_results:
+            record.completed_at = self.early_results.pop(record.task_id)
+
+    def pending(self) -> int:
+        return sum(1 for record in self.by_task.values() if record.completed_at is None)
+
+
+# ============================================
+# 메모리 측정
+# ============================================
+
+def rss_bytes(pid: str = "self") -> Optional[int]:
+    """현재 RSS (리눅스 /proc, 그 외 OS는 자기 프로세스 최대 RSS로 대체)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid == "self":
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    return None
+
+
+async def sample_memory(pids: List[str], peaks: Dict[str, int], stop: asyncio.Event, interval: float = 0.2):
+    while not stop.is_set():
+        for pid in pids:
+            value = rss_bytes(pid)
+            if value is not None:
+                peaks[pid] = max(peaks.get(pid, 0), value)
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), interval)
+
+
+# ============================================
+# 한 프로세스 모드 (API + 워커 스레드)
+# ============================================
+
+def configure_in_process(args):
+    """config 모듈 import 전에 환경변수로 로컬 백엔드/픽스처 재생 지정"""
+    os.environ.update({
+        "BACKEND_MODE": "memory",
+        "CELERY_EXECUTION": "threads",
+        "IN_PROCESS_WORKER_CONCURRENCY": str(args.workers),
+        "LLM_FIXTURE_PATH": args.fixture,
+        "LLM_FIXTURE_LATENCY_SCALE": str(args.latency_scale),
+        "LLM_FIXTURE_LATENCY_JITTER": str(args.latency_jitter),
+        "STATUS_EVENTS_ENABLED": "false",
+    })
+    if args.max_queue_depth is not None:
+        os.environ["SOURCING_MAX_QUEUE_DEPTH"] = str(args.max_queue_depth)
+        os.environ["SOURCING_MAX_ESTIMATED_WAIT"] = str(10 ** 9)
+
+
+def start_in_process_server() -> str:
+    import uvicorn
+    import main
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="loadtest-api", daemon=True).start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("API 서버 시작 시간 초과")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+# ============================================
+# 부하 발생
+# ============================================
+
+async def listen(ws_url: str, state: LoadTestState, ready: asyncio.Event, stop: asyncio.Event):
+    async with websockets.connect(ws_url, max_size=None) as ws:
+        ready.set()
+        while not stop.is_set():
+            try:
+                message = await asyncio.wait_for(ws.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            state.on_message(message, time.perf_counter())
+
+
+async def send_request(client: "httpx.AsyncClient", query: str, state: LoadTestState, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        record = RequestRecord(query=query, sent_at=time.perf_counter())
+        state.records[query] = record
+        try:
+            response = await client.post("/sourcing/", json={"query": query})
+        except httpx.HTTPError as e:
+            print(f"요청 오류 ({query}): {e}", file=sys.__stderr__)
+            return
+        record.responded_at = time.perf_counter()
+        record.status_code = response.status_code
+        if response.status_code == 200:
+            record.task_id = response.json()["task_id"]
+            state.on_accepted(record)
+
+
+async def run_load(base_url: str, args, worker_pids: List[str]) -> dict:
+    state = LoadTestState()
+    ws_url = base_url.replace("http", "ws", 1) + "/ws"
+    stop = asyncio.Event()
+    peaks: Dict[str, int] = {}
+    baseline = {pid: rss_bytes(pid) or 0 for pid in worker_pids}
+
+    readies = [asyncio.Event() for _ in range(args.listeners)]
+    listeners = [asyncio.create_task(listen(ws_url, state, ready, stop)) for ready in readies]
+    sampler = asyncio.create_task(sample_memory(worker_pids, peaks, stop))
+    await asyncio.wait_for(asyncio.gather(*(ready.wait() for ready in readies)), 10)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await asyncio.gather(*(
+            send_request(client, f"{args.query} #{index}", state, semaphore)
+            for index in range(args.requests)
+        ))
+    sent = time.perf_counter()
+
+    deadline = sent + args.timeout
+    while state.pending() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    finished = time.perf_counter()
+
+    stop.set()
+    await asyncio.gather(*listeners, sampler, return_exceptions=True)
+    return build_report(state, args, started, sent, finished, baseline, peaks)
+
+
+# ============================================
+# 리포트
+# ============================================
+
+def _distribution(values: List[float]) -> dict:
+    from utils.agent_log import percentile
+
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1],
+    }
+
+
+def build_report(state: LoadTestState, args, started: float, sent: float, finished: float,
+                 baseline: Dict[str, int], peaks: Dict[str, int]) -> dict:
+    records = list(state.records.values())
+    accepted = [record for record in records if record.task_id]
+    completed = [record for record in accepted if record.completed_at is not None]
+    statuses: Dict[str, int] = {}
+    for record in records:
+        key = str(record.status_code or "error")
+        statuses[key] = statuses.get(key, 0) + 1
+
+    memory = {}
+    for pid, peak in peaks.items():
+        memory[pid] = {"baseline_mb": baseline.get(pid, 0) / 2 ** 20, "peak_mb": peak / 2 ** 20}
+    if args.url is None and "self" in memory:
+        # 한 프로세스 모드: 워커 슬롯 1개당 증가분 = (최대 RSS - 시작 RSS) / 워커 수
+        memory["self"]["per_worker_mb"] = (peaks["self"] - baseline["self"]) / 2 ** 20 / args.workers
+
+    return {
+        "scope": "api+queue+websocket (crew replaced by fixture replay)",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "workers": args.workers if args.url is None else None,
+        "latency_scale": args.latency_scale if args.url is None else None,
+        "statuses": statuses,
+        "accepted": len(accepted),
+        "completed": len(completed),
+        "incomplete": len(accepted) - len(completed),
+        "send_seconds": sent - started,
+        "wall_seconds": finished - started,
+        "requests_per_second": len(records) / (sent - started) if sent > started else 0.0,
+        "tasks_per_second": len(completed) / (finished - started) if finished > started else 0.0,
+        "post_latency": _distribution([r.responded_at - r.sent_at for r in records if r.responded_at]),
+        "first_event_latency": _distribution([r.first_event_at - r.sent_at for r in accepted if r.first_event_at]),
+        "completion_time": _distribution([r.completed_at - r.sent_at for r in completed]),
+        "websocket_messages": state.messages,
+        "memory": memory,
+    }
+
+
+def print_report(report: dict):
+    print(f"요청 {report['requests']}건 / 동시성 {report['concurrency']}"
+          + (f" / 워커 {report['workers']} / 지연 배율 {report['latency_scale']}" if report["workers"] else ""))
+    print(f"측정 범위: {report['scope']}")
+    print(f"응답 코드: {report['statuses']}  수락 {report['accepted']} / 완료 {report['completed']} / 미완료 {report['incomplete']}")
+    print(f"요청 처리량: {report['requests_per_second']:.1f} req/s  (발송 {report['send_seconds']:.2f}s)")
+    print(f"작업 처리량: {report['tasks_per_second']:.2f} tasks/s  (전체 {report['wall_seconds']:.2f}s)")
+    print(f"WebSocket 메시지: {report['websocket_messages']}건")
+    print()
+    print(f"{'지표 (초)':<24} {'count':>6} {'mean':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for label, key in (("POST /sourcing/ 응답", "post_latency"),
+                       ("첫 진행 이벤트", "first_event_latency"),
+                       ("작업 완료", "completion_time")):
+        stats = report[key]
+        if not stats["count"]:
+            print(f"{label:<24} {0:>6}")
+            continue
+        print(f"{label:<24} {stats['count']:>6} " + " ".join(
+            f"{stats[name]:>8.3f}" for name in ("mean", "p50", "p90", "p95", "p99", "max")
+        ))
+    print()
+    for pid, memory in report["memory"].items():
+        line = f"메모리 [{pid}]: 시작 {memory['baseline_mb']:.1f}MB → 최대 {memory['peak_mb']:.1f}MB"
+        if "per_worker_mb" in memory:
+            line += f"  (워커당 +{memory['per_worker_mb']:.2f}MB)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="소싱 파이프라인 부하 테스트")
+    parser.add_argument("--requests", type=int, default=100, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수")
+    parser.add_argument("--listeners", type=int, default=1, help="WebSocket 리스너 수 (방송 부하)")
+    parser.add_argument("--query", default="캠핑 의자", help="요청 쿼리 접두어 (요청마다 #번호 추가)")
+    parser.add_argument("--timeout", type=float, default=600, help="발송 후 작업 완료 대기 한도 (초)")
+    parser.add_argument("--url", help="실행 중인 API 주소 (생략 시 한 프로세스 모드)")
+    parser.add_argument("--worker-pid", action="append", default=[], help="메모리를 측정할 Celery 워커 PID (--url 모드)")
+    parser.add_argument("--workers", type=int, default=8, help="한 프로세스 모드 워커 스레드 수")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="녹화된 크루 응답 픽스처")
+    parser.add_argument("--latency-scale", type=float, default=0.05, help="녹화 지연 시간 배율 (1.0 = 실제와 동일)")
+    parser.add_argument("--latency-jitter", type=float, default=0.2, help="지연 시간 흔들림 비율")
+    parser.add_argument("--max-queue-depth", type=int, help="수락 제어 대기열 한도 덮어쓰기 (한 프로세스 모드)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--verbose", action="store_true", help="워커 진행 로그 출력")
+    args = parser.parse_args()
+
+    if args.url:
+        base_url, worker_pids = args.url.rstrip("/"), list(args.worker_pid)
+    else:
+        configure_in_process(args)
+        base_url, worker_pids = None, ["self"]
+
+    # 워커 진행 로그(print)가 리포트를 덮지 않도록 실행 중에는 숨김
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        if base_url is None:
+            base_url = start_in_process_server()
+        report = asyncio.run(run_load(base_url, args, worker_pids))
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+파이프라인 오프라인 벤치마크 (utils/cassette.py 녹화/재생)
+- record: 실제 Gemini/Claude/Serper/Apify를 호출하면서 요청-응답과 소요 시간을 카세트에 녹화 (.env API 키 필요)
+- replay: 카세트 응답만으로 같은 파이프라인을 N번 실행해 소요 시간 측정 (외부 호출 없음 → CI에서 회귀 확인)
+    --time-scale 1 = 녹화 당시 외부 지연 그대로, 0 = 외부 대기 없이 파이프라인 자체 오버헤드만
+- 녹화/재생 모두 LLM/검색 캐시를 끄고 실행 (캐시 적중 여부에 따라 외부 호출이 달라지지 않도록)
+
+실행:
+    python benchmarks/replay_pipeline.py record --pipeline sourcing --query "캠핑 의자"
+    python benchmarks/replay_pipeline.py replay --pipeline sourcing --query "캠핑 의자" --time-scale 0 --repeat 5 --json out.json
+
+    --pipeline competitor (run_competitor_analysis, --url / --keywords)
+    --pipeline content (run_content_generation, --product-name / --keywords)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+CASSETTE_DIR = os.path.join(BACKEND_DIR, "benchmarks", "cassettes")
+
+# 재생 모드에서 "API 키 없음 → mock 데이터" 분기로 빠지지 않도록 넣는 자리표시 키
+PLACEHOLDER_KEYS = ("GOOGLE_API_KEY", "GEMINI_API_KEY", "CLAUDE_API_KEY", "SERPER_API_KEY", "APIFY_API_KEY")
+
+
+def _pipelines(args):
+    """파이프라인 이름 → 실행 함수 (import는 환경 변수 설정 이후)"""
+    keywords = [keyword.strip() for keyword in args.keywords.split(",") if keyword.strip()]
+
+    def sourcing():
+        from crew import create_sourcing_crew
+        return create_sourcing_crew(args.query, execution_mode=args.execution_mode)
+
+    def competitor():
+        from agents.competitor_analyzer import run_competitor_analysis
+        return run_competitor_analysis(args.url, keywords)
+
+    def content():
+        from agents.content_creator import run_content_generation
+        return run_content_generation(args.product_name, keywords, {})
+
+    return {"sourcing": sourcing, "competitor": competitor, "content": content}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 녹화/재생 벤치마크")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--pipeline", choices=["sourcing", "competitor", "content"], default="sourcing")
+    parser.add_argument("--cassette", help="카세트 파일 (기본 benchmarks/cassettes/<pipeline>.jsonl)")
+    parser.add_argument("--query", default="캠핑 의자", help="소싱 쿼리")
+    parser.add_argument("--execution-mode", choices=["sequential", "dag"], help="소싱 크루 실행 방식")
+    parser.add_argument("--url", default="https://www.coupang.com/vp/products/123456", help="경쟁사 상품 URL")
+    parser.add_argument("--keywords", default="경량 캠핑 의자,접이식 캠핑 의자", help="황금 키워드 (쉼표 구분)")
+    parser.add_argument("--product-name", default="경량 캠핑 의자", help="콘텐츠 생성 상품명")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="재생 시 녹화 지연 배율 (0 = 대기 없음)")
+    parser.add_argument("--repeat", type=int, default=1, help="재생 반복 횟수")
+    parser.add_argument("--append", action="store_true", help="기존 카세트 뒤에 이어서 녹화")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    os.environ["LLM_CACHE_BACKEND"] = "none"
+    os.environ["SERPER_CACHE_BACKEND"] = "none"
+    if args.mode == "replay":
+        for name in PLACEHOLDER_KEYS:
+            os.environ.setdefault(name, "cassette-replay")
+
+    from utils.cassette import use_cassette
+
+    cassette_path = args.cassette or os.path.join(CASSETTE_DIR, f"{args.pipeline}.jsonl")
+    if args.mode == "record" and not args.append and os.path.exists(cassette_path):
+        os.remove(cassette_path)
+
+    run = _pipelines(args)[args.pipeline]
+    runs = 1 if args.mode == "record" else max(args.repeat, 1)
+    durations = []
+    with use_cassette(cassette_path, args.mode, time_scale=args.time_scale) as cassette:
+        for _ in range(runs):
+            started = time.perf_counter()
+            run()
+            durations.append(time.perf_counter() - started)
+
+    durations.sort()
+    report = {
+        "mode": args.mode,
+        "pipeline": args.pipeline,
+        "cassette": cassette_path,
+        "time_scale": args.time_scale,
+        "runs": runs,
+        "min_seconds": round(durations[0], 4),
+        "p50_seconds": round(durations[len(durations) // 2], 4),
+        "max_seconds": round(durations[-1], 4),
+        **cassette.stats,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
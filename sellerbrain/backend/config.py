@@ -11,6 +11,7 @@
     GEMINI_MODEL=gemini-2.0-flash-exp
     IMAGEN_MODEL=imagen-3.0-generate-001
     CLAUDE_MODEL=claude-3-5-sonnet-20241022
+    GEMINI_FAST_MODEL=gemini-1.5-flash, CLAUDE_FAST_MODEL=claude-3-5-haiku-20241022 (가벼운 단계용)
 """
 
 import os
@@ -36,6 +37,9 @@ GEMINI_VISION_MODEL = os.getenv(
     "gemini-1.5-flash"  # Vision 작업용 빠른 모델
 )
 
+# Gemini 빠른 모델 (모델 라우터 fast 등급: 키워드 검증, 이미지 분석 등 가벼운 단계)
+GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", GEMINI_VISION_MODEL)
+
 # Imagen 이미지 생성 모델
 # 최신 모델: https://cloud.google.com/vertex-ai/generative-ai/docs/image/overview
 IMAGEN_MODEL = os.getenv(
@@ -58,6 +62,12 @@ CLAUDE_MODEL = os.getenv(
     "claude-3-5-sonnet-20241022"  # Claude 3.5 Sonnet (2024년 10월)
 )
 
+# Claude 빠른 모델 (모델 라우터 fast 등급: 피드백 파싱 등)
+CLAUDE_FAST_MODEL = os.getenv(
+    "CLAUDE_FAST_MODEL",
+    "claude-3-5-haiku-20241022"  # Claude 3.5 Haiku
+)
+
 # Claude API Key
 CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY")
 
@@ -75,6 +85,256 @@ IMAGEN_ASPECT_RATIO = os.getenv("IMAGEN_ASPECT_RATIO", "1:1")  # 1:1, 3:4, 16:9
 IMAGEN_NUMBER_OF_IMAGES = int(os.getenv("IMAGEN_NUMBER_OF_IMAGES", "2"))
 
 
+# ============================================
+# CrewAI 실행 설정
+# ============================================
+
+# sequential: 4단계 순차 실행, dag: 경쟁사 분석을 키워드별로 나눠 병렬 실행 후 병합
+CREW_EXECUTION_MODE = os.getenv("CREW_EXECUTION_MODE", "sequential").lower()
+
+# dag 모드에서 병렬 분석할 키워드 수 / 동시 실행 수 (프로세스 전체 한도)
+CREW_FANOUT_KEYWORDS = int(os.getenv("CREW_FANOUT_KEYWORDS", "3"))
+CREW_FANOUT_CONCURRENCY = int(os.getenv("CREW_FANOUT_CONCURRENCY", "3"))
+
+
+# ============================================
+# LLM 응답 캐시 (utils/llm_cache.py)
+# ============================================
+
+# 저장소 (redis / sqlite / none) + 유지 시간 (초) / 최대 항목 수 (초과 시 LRU 제거)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "redis").lower()
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".cache", "llm.sqlite3"))
+
+# 이 값보다 temperature가 높은 호출은 같은 작업(task_id) 안에서만 캐시 (요청마다 다른 결과가 필요한 생성)
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
+
+
+# ============================================
+# LLM 사용량/비용 집계 (utils/llm_instrumentation.py)
+# ============================================
+
+# 모델 단가 덮어쓰기 (JSON, 100만 토큰당 USD [입력, 출력]) 예: {"gemini-1.5-pro": [1.25, 5.0]}
+LLM_PRICE_OVERRIDES = os.getenv("LLM_PRICE_OVERRIDES", "")
+
+# Claude SDK 자동 재시도 횟수 (재시도 횟수는 호출별로 AgentLog에 기록)
+# 모델 라우터 타임아웃 재시도(MODEL_ROUTER_TIMEOUT_RETRY)나 헤지 요청(LLM_HEDGING)이 켜져 있으면 0으로 사용 (재시도 중첩 방지)
+CLAUDE_MAX_RETRIES = int(os.getenv("CLAUDE_MAX_RETRIES", "2"))
+
+# 비동기 Claude 클라이언트 공용 연결 풀 크기 (제목/HTML 동시 생성, tools/claude_tool.py)
+CLAUDE_MAX_CONNECTIONS = int(os.getenv("CLAUDE_MAX_CONNECTIONS", "20"))
+CLAUDE_MAX_KEEPALIVE = int(os.getenv("CLAUDE_MAX_KEEPALIVE", "10"))
+
+
+# ============================================
+# 외부 API 녹화/재생 (utils/cassette.py)
+# ============================================
+
+# off / record (실제 호출 + 녹화) / replay (녹화 응답만 사용, 외부 호출 없음)
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").lower()
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", os.path.join(os.path.dirname(__file__), "benchmarks", "cassettes", "sourcing.jsonl"))
+
+# 재생 시 녹화된 소요 시간 배율 (1.0 = 실제와 동일, 0 = 대기 없음)
+CASSETTE_TIME_SCALE = float(os.getenv("CASSETTE_TIME_SCALE", "1.0"))
+
+
+# ============================================
+# 모델 라우터 (utils/model_router.py)
+# ============================================
+
+# 단계별 등급 덮어쓰기 (JSON, fast / balanced / quality) 예: {"content_creation": "balanced"}
+MODEL_ROUTER_STAGE_TIERS = os.getenv("MODEL_ROUTER_STAGE_TIERS", "")
+
+# balanced 등급은 입력이 이 글자 수 이하면 fast, fast 등급도 이 글자 수를 넘으면 quality
+MODEL_ROUTER_SMALL_INPUT_CHARS = int(os.getenv("MODEL_ROUTER_SMALL_INPUT_CHARS", "2000"))
+MODEL_ROUTER_FAST_MAX_INPUT_CHARS = int(os.getenv("MODEL_ROUTER_FAST_MAX_INPUT_CHARS", "30000"))
+
+# 관측 지연 시간 EWMA 가중치 / 타임아웃 난 모델을 피하는 시간 (초)
+MODEL_ROUTER_EWMA_ALPHA = float(os.getenv("MODEL_ROUTER_EWMA_ALPHA", "0.2"))
+MODEL_ROUTER_TIMEOUT_COOLDOWN = float(os.getenv("MODEL_ROUTER_TIMEOUT_COOLDOWN", "60"))
+
+# 타임아웃 시 다른 등급 모델로 1번 더 호출 (켜져 있으면 Claude SDK 자동 재시도는 끔)
+MODEL_ROUTER_TIMEOUT_RETRY = os.getenv("MODEL_ROUTER_TIMEOUT_RETRY", "true").lower() == "true"
+
+# 모델별 최근 지연 시간 표본 수 (헤지 요청의 p95 계산용)
+MODEL_ROUTER_LATENCY_WINDOW = int(os.getenv("MODEL_ROUTER_LATENCY_WINDOW", "200"))
+
+
+# ============================================
+# LLM 장애 대응 (utils/resilience.py)
+# ============================================
+
+# provider별 요청 타임아웃 (초), 이미지 다운로드 타임아웃 (초)
+LLM_TIMEOUT_ANTHROPIC = float(os.getenv("LLM_TIMEOUT_ANTHROPIC", "60"))
+LLM_TIMEOUT_GOOGLE = float(os.getenv("LLM_TIMEOUT_GOOGLE", "60"))
+IMAGE_DOWNLOAD_TIMEOUT = float(os.getenv("IMAGE_DOWNLOAD_TIMEOUT", "15"))
+
+# 논리적 LLM 호출 1건(모델 라우터 재시도 + 헤지 + provider 대체 포함)의 전체 시간 예산 (초)
+# 각 SDK 요청 타임아웃은 min(provider 타임아웃, 남은 예산)
+LLM_CALL_DEADLINE = float(os.getenv("LLM_CALL_DEADLINE", "120"))
+
+# 서킷 브레이커: 최근 CIRCUIT_WINDOW_SECONDS초 동안 CIRCUIT_MIN_CALLS건 이상 중 오류 비율이 CIRCUIT_ERROR_RATE 이상이면
+# CIRCUIT_OPEN_SECONDS초 동안 해당 provider 호출 차단 (이후 1건 시험 호출)
+CIRCUIT_WINDOW_SECONDS = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "60"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+
+# 헤지 요청: 관측 지연 시간 p95가 지나도 응답이 없으면 같은 요청을 1번 더 보내고 먼저 온 응답 사용 (비용 증가, 기본 꺼짐)
+LLM_HEDGING = os.getenv("LLM_HEDGING", "false").lower() == "true"
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_CALL_WORKERS = int(os.getenv("LLM_CALL_WORKERS", "16"))
+
+# Claude 텍스트 생성 실패/차단 시 Gemini로 대체 생성
+LLM_CROSS_PROVIDER_FALLBACK = os.getenv("LLM_CROSS_PROVIDER_FALLBACK", "true").lower() == "true"
+
+
+# ============================================
+# 데이터베이스 설정
+# ============================================
+
+# MongoDB 연결 URL
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+
+# 소싱 결과 보관 기간 (일). 0이면 TTL 인덱스를 만들지 않고 영구 보관
+SOURCING_RESULT_TTL_DAYS = int(os.getenv("SOURCING_RESULT_TTL_DAYS", "30"))
+
+# 이 크기(bytes)를 넘는 텍스트 필드(detail_html, raw_output)는 blobs 컬렉션에 압축 저장
+BLOB_INLINE_MAX_BYTES = int(os.getenv("BLOB_INLINE_MAX_BYTES", "4096"))
+
+# 프로세스별 압축 해제 blob 캐시 개수
+BLOB_CACHE_SIZE = int(os.getenv("BLOB_CACHE_SIZE", "256"))
+
+# 참조가 없어진 blob 정리 유예 시간 (시간, 마지막으로 저장/참조된 뒤 이 시간이 지나야 삭제)
+BLOB_GC_GRACE_HOURS = float(os.getenv("BLOB_GC_GRACE_HOURS", "24"))
+
+# HITL 재생성 이력: N번째 revision마다 전체 스냅샷(base) 저장 / 정리 시 남길 revision 수
+REVISION_KEYFRAME_INTERVAL = int(os.getenv("REVISION_KEYFRAME_INTERVAL", "10"))
+REVISION_KEEP_LAST = int(os.getenv("REVISION_KEEP_LAST", "20"))
+
+# AgentLog 보관 기간 (일, 0 = 영구 보관) / 일괄 저장 단위 (건수, 초)
+AGENT_LOG_TTL_DAYS = int(os.getenv("AGENT_LOG_TTL_DAYS", "30"))
+AGENT_LOG_FLUSH_SIZE = int(os.getenv("AGENT_LOG_FLUSH_SIZE", "50"))
+AGENT_LOG_FLUSH_INTERVAL = float(os.getenv("AGENT_LOG_FLUSH_INTERVAL", "5"))
+
+# AgentLog 시간별 롤업 시 다시 집계할 최근 시간 수
+AGENT_LOG_ROLLUP_LOOKBACK_HOURS = int(os.getenv("AGENT_LOG_ROLLUP_LOOKBACK_HOURS", "3"))
+
+
+# ============================================
+# Redis / 응답 캐시 설정
+# ============================================
+
+# Redis 연결 URL (Pub/Sub, 응답 캐시)
+REDIS_URL = os.getenv("REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
+
+# 읽기 API 응답 캐시 사용 여부 / 유지 시간 (초)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# 상품/콘텐츠 상태 변경 WebSocket 알림 (change stream, 미지원 시 폴링 간격 초)
+STATUS_EVENTS_ENABLED = os.getenv("STATUS_EVENTS_ENABLED", "true").lower() == "true"
+STATUS_POLL_INTERVAL = float(os.getenv("STATUS_POLL_INTERVAL", "2"))
+
+
+# ============================================
+# 작업 큐 (Celery) 설정
+# ============================================
+
+# 브로커 / 결과 백엔드 URL
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+
+# 브로커 발행용 스레드/프로듀서 풀 크기
+CELERY_DISPATCH_POOL_SIZE = int(os.getenv("CELERY_DISPATCH_POOL_SIZE", "4"))
+
+# 대기열 허용 한도 (이 이상 쌓이면 429 반환)
+SOURCING_MAX_QUEUE_DEPTH = int(os.getenv("SOURCING_MAX_QUEUE_DEPTH", "50"))
+
+# 예상 대기 시간 허용 한도 (초, 초과 시 429 반환)
+SOURCING_MAX_ESTIMATED_WAIT = int(os.getenv("SOURCING_MAX_ESTIMATED_WAIT", "1800"))
+
+# 소싱 작업 1건 평균 소요 시간 (초, 예상 대기 시간 계산용)
+SOURCING_AVG_TASK_SECONDS = float(os.getenv("SOURCING_AVG_TASK_SECONDS", "180"))
+
+# 워커 상태(inspect) 캐시 유지 시간 (초)
+CELERY_WORKER_STATS_TTL = int(os.getenv("CELERY_WORKER_STATS_TTL", "15"))
+
+
+# ============================================
+# 로컬 실행 백엔드 (부하 테스트 / 벤치마크)
+# ============================================
+
+# services: 실제 MongoDB/Redis 사용, memory: mongomock/fakeredis로 한 프로세스 안에서 실행
+BACKEND_MODE = os.getenv("BACKEND_MODE", "services").lower()
+
+# Celery 작업 실행 방식 (broker: 브로커 경유, threads: API 프로세스의 스레드 풀, eager: 발행 즉시 실행)
+CELERY_EXECUTION = os.getenv("CELERY_EXECUTION", "threads" if BACKEND_MODE == "memory" else "broker").lower()
+
+# threads 모드 워커 슬롯 수 (Celery 워커 concurrency 대용)
+IN_PROCESS_WORKER_CONCURRENCY = int(os.getenv("IN_PROCESS_WORKER_CONCURRENCY", "4"))
+
+# 녹화된 LLM/검색 응답 픽스처 (지정 시 워커가 실제 크루 대신 재생, utils/llm_fixtures.py)
+# 부하 테스트 전용: 크루 내부(CrewAI/LLM 클라이언트) 비용은 측정되지 않음
+LLM_FIXTURE_PATH = os.getenv("LLM_FIXTURE_PATH", "")
+
+# 재생 지연 시간 = 녹화 지연 시간 x SCALE (± JITTER 비율)
+LLM_FIXTURE_LATENCY_SCALE = float(os.getenv("LLM_FIXTURE_LATENCY_SCALE", "1.0"))
+LLM_FIXTURE_LATENCY_JITTER = float(os.getenv("LLM_FIXTURE_LATENCY_JITTER", "0.2"))
+
+
+# ============================================
+# 오픈마켓 업로드 설정
+# ============================================
+
+# 업로드 API 주소 (플랫폼별 경로: {URL}/{platform}/products, 로컬 테스트는 utils/fake_marketplace.py)
+MARKETPLACE_API_URL = os.getenv("MARKETPLACE_API_URL", "http://localhost:9100")
+
+# 승인된 콘텐츠를 올릴 플랫폼 (쉼표 구분: coupang, naver, auction, gmarket)
+UPLOAD_PLATFORMS = [name.strip() for name in os.getenv("UPLOAD_PLATFORMS", "coupang,naver").split(",") if name.strip()]
+
+# 재시도 횟수 / 지수 백오프 기준·최대 대기 시간 (초)
+UPLOAD_MAX_RETRIES = int(os.getenv("UPLOAD_MAX_RETRIES", "5"))
+UPLOAD_BACKOFF_BASE = float(os.getenv("UPLOAD_BACKOFF_BASE", "1.0"))
+UPLOAD_BACKOFF_MAX = float(os.getenv("UPLOAD_BACKOFF_MAX", "60.0"))
+
+# 업로드 API 요청 타임아웃 (초)
+UPLOAD_REQUEST_TIMEOUT = float(os.getenv("UPLOAD_REQUEST_TIMEOUT", "30"))
+
+# 업로드 선점 유효 시간 (초) - 이 시간이 지나도록 IN_PROGRESS인 레코드는 워커가 죽은 것으로 보고 다시 선점
+UPLOAD_CLAIM_LEASE_SECONDS = float(os.getenv("UPLOAD_CLAIM_LEASE_SECONDS", "900"))
+
+
+# ============================================
+# 웹 검색 (Serper) 설정
+# ============================================
+
+SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+SERPER_API_URL = os.getenv("SERPER_API_URL", "https://google.serper.dev/search")
+
+# 요청 타임아웃 (초) / 커넥션 풀 크기 (keep-alive 재사용)
+SERPER_TIMEOUT = float(os.getenv("SERPER_TIMEOUT", "10"))
+SERPER_POOL_SIZE = int(os.getenv("SERPER_POOL_SIZE", "10"))
+
+# 검색 결과 캐시 (redis / disk / memory / none) + 유지 시간 (초)
+SERPER_CACHE_BACKEND = os.getenv("SERPER_CACHE_BACKEND", "redis").lower()
+SERPER_CACHE_TTL = int(os.getenv("SERPER_CACHE_TTL", str(24 * 60 * 60)))
+SERPER_CACHE_PATH = os.getenv("SERPER_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".cache", "serper.sqlite3"))
+
+# 프로세스 내 캐시 항목 수 (반복 검색은 Redis/디스크 왕복 없이 반환)
+SERPER_MEMORY_CACHE_SIZE = int(os.getenv("SERPER_MEMORY_CACHE_SIZE", "1024"))
+
+# 에이전트에 넘길 검색 결과 수 (organic 상위 N개, 프롬프트 토큰 절약)
+SERPER_MAX_RESULTS = int(os.getenv("SERPER_MAX_RESULTS", "5"))
+
+# 다중 검색 Tool: 동시 요청 수 / 한 번에 받을 검색어 수 / 결과 요약 최대 글자 수
+SERPER_MULTI_CONCURRENCY = int(os.getenv("SERPER_MULTI_CONCURRENCY", "5"))
+SERPER_MULTI_MAX_QUERIES = int(os.getenv("SERPER_MULTI_MAX_QUERIES", "10"))
+SERPER_MULTI_MAX_CHARS = int(os.getenv("SERPER_MULTI_MAX_CHARS", "6000"))
+
+
 # ============================================
 # 검증 함수
 # ============================================
@@ -104,8 +364,10 @@ def print_model_info():
     print("="*50)
     print(f"📝 Gemini (분석):     {GEMINI_MODEL}")
     print(f"👁️  Gemini Vision:    {GEMINI_VISION_MODEL}")
+    print(f"⚡ Gemini (빠른 단계): {GEMINI_FAST_MODEL}")
     print(f"🎨 Imagen (이미지):   {IMAGEN_MODEL}")
     print(f"✍️  Claude (콘텐츠):   {CLAUDE_MODEL}")
+    print(f"⚡ Claude (빠른 단계): {CLAUDE_FAST_MODEL}")
     print("="*50 + "\n")
     print("💡 모델 변경 방법:")
     print("   1. .env 파일에 환경변수 추가")
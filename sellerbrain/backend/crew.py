@@ -1,33 +1,49 @@
 import os
-import json
+import time
+import threading
 import yaml
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Agent, Task, Crew, Process
 from langchain_google_genai import ChatGoogleGenerativeAI
 from crewai import Tool
+from utils.metrics import CREW_STAGE_SECONDS
+from utils.agent_log import record_agent_run
+from utils.llm_instrumentation import langchain_callbacks, set_current_stage
+from utils.crew_dag import extract_keywords, merge_reports, run_fanout
+from tools.serper_tool import build_digest, get_serper_client, parse_queries
+from utils.model_router import get_model_router
+from utils.resilience import provider_timeout
+from config import GEMINI_MODEL, CREW_EXECUTION_MODE, CREW_FANOUT_KEYWORDS, CREW_FANOUT_CONCURRENCY
 
-# 1. LLM 설정 (Gemini 1.5 Pro)
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.5-pro",
-    google_api_key=os.getenv("GOOGLE_API_KEY"),
-    temperature=0.7
-)
+# 1. LLM 설정 - 모델별로 프로세스당 1개 (단계별 모델은 모델 라우터가 선택)
+_llms = {}
+_llm_lock = threading.Lock()
+
+def get_llm(model=None):
+    model = model or GEMINI_MODEL
+    llm = _llms.get(model)
+    if llm is None:
+        with _llm_lock:
+            llm = _llms.get(model)
+            if llm is None:
+                llm = _llms[model] = ChatGoogleGenerativeAI(
+                    model=model,
+                    google_api_key=os.getenv("GOOGLE_API_KEY"),
+                    temperature=0.7,
+                    timeout=provider_timeout("google"),
+                    # 호출별 토큰/지연/재시도/비용 → AgentLog (에이전트 이름 대신 현재 크루 단계로 기록)
+                    callbacks=langchain_callbacks(model=model)
+                )
+    return llm
 
 # 2. Custom Search Tool Definition
 def search_func(query: str):
     """
     Searches the internet using Serper.dev API.
+    커넥션 풀 + 검색어 캐시 사용, 결과는 에이전트가 쓰는 필드만 압축한 JSON (tools/serper_tool.py)
     """
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    headers = {
-        'X-API-KEY': os.getenv("SERPER_API_KEY"),
-        'Content-Type': 'application/json'
-    }
     try:
-        response = requests.request("POST", url, headers=headers, data=payload)
-        response.raise_for_status()
-        return response.text
+        return get_serper_client().search_text(query)
     except Exception as e:
         return f"Error searching for {query}: {str(e)}"
 
@@ -37,68 +53,198 @@ search_tool = Tool(
     description="Useful for searching the internet for current events, trends, and market data. Input should be a search query string."
 )
 
-# 3. Load Config Helper
+def multi_search_func(queries: str):
+    """
+    Runs several Serper searches concurrently and returns one merged digest.
+    검색어 목록을 동시에 검색하고 링크 기준 중복 제거 + 크기 제한한 결과 반환 (tools/serper_tool.py)
+    """
+    try:
+        query_list = parse_queries(queries)
+        if not query_list:
+            return "Error: no search queries given"
+        return build_digest(get_serper_client().search_many(query_list))
+    except Exception as e:
+        return f"Error searching for {queries}: {str(e)}"
+
+multi_search_tool = Tool(
+    name="Serper Multi Search",
+    func=multi_search_func,
+    description="Searches several queries at once and returns merged, deduplicated results. Use this instead of repeated single searches when you need 2 or more searches. Input should be a JSON array of query strings (or one query per line)."
+)
+
+# 3. Load Config Helper (파싱 결과를 파일 mtime 기준으로 캐시)
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), 'config')
+AGENTS_CONFIG_PATH = os.path.join(CONFIG_DIR, 'agents.yaml')
+TASKS_CONFIG_PATH = os.path.join(CONFIG_DIR, 'tasks.yaml')
+
+_config_cache = {}  # 파일 경로 → (mtime_ns, 파싱 결과)
+_config_lock = threading.Lock()
+
 def load_config(file_path):
+    """
+    YAML 설정 로딩 (파일이 바뀌었을 때만 다시 파싱)
+    반환값은 프로세스 전체가 공유하므로 수정하지 말 것
+    """
+    mtime = os.stat(file_path).st_mtime_ns
+    with _config_lock:
+        cached = _config_cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
     with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+    with _config_lock:
+        _config_cache[file_path] = (mtime, config)
+    return config
+
+# 4. Define Agents (Manager is not used in the sequential flow explicitly but defined in config)
+# Agent는 실행 중 상태(step_callback, executor, crew 참조)를 가지므로 스레드마다 1세트만 만들어 재사용
+_agent_cache = threading.local()
+
+# 에이전트 → 모델 라우터 단계 (keyword_verifier는 fast 등급)
+AGENT_STAGES = {
+    'sourcing_agent': 'sourcing',
+    'competitor_analyst': 'competitor_analysis',
+    'keyword_verifier': 'keyword_verification',
+    'content_creator': 'content_creation',
+}
+
+def _build_agents(agents_config, models):
+    # Import Safety Tool (벡터 DB 로딩이 있어 처음 에이전트를 만들 때 1번만 import)
+    from tools.safety_tool import safety_tool
 
-def create_sourcing_crew(query: str, callback_function=None):
+    def build(name, tools):
+        return Agent(
+            role=agents_config[name]['role'],
+            goal=agents_config[name]['goal'],
+            backstory=agents_config[name]['backstory'],
+            verbose=True,
+            allow_delegation=False,
+            llm=get_llm(models[name]),
+            tools=tools
+        )
+
+    return {
+        'sourcing_agent': build('sourcing_agent', [search_tool, multi_search_tool]),
+        'competitor_analyst': build('competitor_analyst', [search_tool, multi_search_tool]),
+        'keyword_verifier': build('keyword_verifier', [search_tool, multi_search_tool, safety_tool]),  # Add safety_tool here
+        'content_creator': build('content_creator', [search_tool]),
+    }
+
+def get_agents():
     """
-    Creates and runs the Product Sourcing Crew (Multi-Agent)
+    현재 스레드의 에이전트 세트 (agents.yaml이 다시 파싱되면 새로 생성)
+    모델 라우터가 고른 에이전트별 모델 조합마다 1세트 (타임아웃 쿨다운 등으로 모델이 바뀌면 그 조합으로 생성)
     """
-    
-    # Load Configurations
-    config_dir = os.path.join(os.path.dirname(__file__), 'config')
-    agents_config = load_config(os.path.join(config_dir, 'agents.yaml'))
-    tasks_config = load_config(os.path.join(config_dir, 'tasks.yaml'))
-
-    # 4. Define Agents
-    # Manager is not used in the sequential flow explicitly but defined in config
-    
-    # Import Safety Tool
-    from tools.safety_tool import safety_tool
+    agents_config = load_config(AGENTS_CONFIG_PATH)
+    router = get_model_router()
+    models = {name: router.route("google", stage) for name, stage in AGENT_STAGES.items()}
+    key = tuple(sorted(models.items()))
+    cached = getattr(_agent_cache, 'agents', None)
+    if cached is None or cached[0] is not agents_config:
+        cached = (agents_config, {})
+        _agent_cache.agents = cached
+    agents = cached[1].get(key)
+    if agents is None:
+        agents = cached[1][key] = _build_agents(agents_config, models)
+    return agents
 
-    sourcing_agent = Agent(
-        role=agents_config['sourcing_agent']['role'],
-        goal=agents_config['sourcing_agent']['goal'],
-        backstory=agents_config['sourcing_agent']['backstory'],
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[search_tool]
-    )
+# 5. Crew 실행 보조 함수
 
-    competitor_analyst = Agent(
-        role=agents_config['competitor_analyst']['role'],
-        goal=agents_config['competitor_analyst']['goal'],
-        backstory=agents_config['competitor_analyst']['backstory'],
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[search_tool]
-    )
+def _step_callback(callback_function):
+    """CrewAI step 객체 → 진행 메시지 (callback_function이 없으면 None)"""
+    if not callback_function:
+        return None
 
-    keyword_verifier = Agent(
-        role=agents_config['keyword_verifier']['role'],
-        goal=agents_config['keyword_verifier']['goal'],
-        backstory=agents_config['keyword_verifier']['backstory'],
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[search_tool, safety_tool] # Add safety_tool here
-    )
+    # Callback wrapper to handle CrewAI's step object
+    def step_callback_wrapper(step_output):
+        try:
+            if hasattr(step_output, 'thought'):
+                callback_function(f"Thinking: {step_output.thought[:100]}...")
+            elif hasattr(step_output, 'result'):
+                 callback_function(f"Action: {str(step_output.result)[:100]}...")
+            else:
+                callback_function(f"Step: {str(step_output)[:100]}...")
+        except:
+            callback_function("Agent is working...")
+
+    return step_callback_wrapper
+
+def _stage_recorder(stage_names, query, stage_agents):
+    """
+    Task 완료 콜백: 단계별 소요 시간 측정 (sequential이므로 직전 Task 종료 시점부터 측정)
+    현재 단계를 contextvar에 두어 그 사이의 LLM 호출 기록이 단계에 연결되도록 함
+    """
+    stage_clock = {"index": 0, "started": time.perf_counter()}
+    set_current_stage(stage_names[0])
 
-    content_creator = Agent(
-        role=agents_config['content_creator']['role'],
-        goal=agents_config['content_creator']['goal'],
-        backstory=agents_config['content_creator']['backstory'],
+    def task_callback_wrapper(task_output):
+        now = time.perf_counter()
+        index = stage_clock["index"]
+        stage = stage_names[index] if index < len(stage_names) else "unknown"
+        agent = stage_agents[index] if index < len(stage_agents) else None
+        CREW_STAGE_SECONDS.observe(now - stage_clock["started"], stage=stage)
+        record_agent_run(
+            getattr(task_output, "agent", None) or stage,
+            now - stage_clock["started"],
+            model=getattr(getattr(agent, "llm", None), "model", None),
+            input_data={"stage": stage, "query": query}
+        )
+        stage_clock["index"] += 1
+        stage_clock["started"] = now
+        if stage_clock["index"] < len(stage_names):
+            set_current_stage(stage_names[stage_clock["index"]])
+
+    return task_callback_wrapper
+
+def _kickoff(crew_agents, tasks, step_callback, task_callback):
+    # 재사용하는 에이전트에 이전 요청의 콜백/도구 결과가 남지 않도록 이번 실행 기준으로 초기화
+    for agent in crew_agents:
+        agent.step_callback = step_callback
+        if hasattr(agent, 'tools_results'):
+            agent.tools_results = []
+
+    crew = Crew(
+        agents=crew_agents,
+        tasks=tasks,
         verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[search_tool]
+        process=Process.sequential,
+        step_callback=step_callback,
+        task_callback=task_callback
     )
+    return crew.kickoff()
 
-    # 5. Define Tasks
+# 경쟁사 분석 fan-out 스레드 풀 (프로세스 전체 동시 실행 한도 = CREW_FANOUT_CONCURRENCY)
+_fanout_pool = None
+_fanout_lock = threading.Lock()
+
+def _fanout_executor():
+    global _fanout_pool
+    with _fanout_lock:
+        if _fanout_pool is None:
+            _fanout_pool = ThreadPoolExecutor(max_workers=CREW_FANOUT_CONCURRENCY, thread_name_prefix="crew-fanout")
+        return _fanout_pool
+
+def create_sourcing_crew(query: str, callback_function=None, execution_mode=None):
+    """
+    Creates and runs the Product Sourcing Crew (Multi-Agent)
+    설정/LLM/에이전트는 캐시된 것을 쓰고, 요청마다 Task와 Crew만 새로 구성
+
+    execution_mode (기본값 CREW_EXECUTION_MODE):
+        sequential: 소싱 → 경쟁사 분석(상위 3개 키워드 순차) → 검증 → 콘텐츠
+        dag: 소싱 → 키워드별 경쟁사 분석 병렬 실행 → 병합 → 검증 → 콘텐츠
+    """
+    tasks_config = load_config(TASKS_CONFIG_PATH)
+    agents = get_agents()
+    step_callback = _step_callback(callback_function)
+    if (execution_mode or CREW_EXECUTION_MODE) == "dag":
+        return _run_dag(query, tasks_config, agents, step_callback, callback_function)
+
+    sourcing_agent = agents['sourcing_agent']
+    competitor_analyst = agents['competitor_analyst']
+    keyword_verifier = agents['keyword_verifier']
+    content_creator = agents['content_creator']
+
+    # 6. Define Tasks
     task_sourcing = Task(
         description=tasks_config['sourcing_task']['description'].format(query=query),
         expected_output=tasks_config['sourcing_task']['expected_output'],
@@ -126,29 +272,62 @@ def create_sourcing_crew(query: str, callback_function=None):
         context=[task_verification]
     )
 
-    # Callback wrapper to handle CrewAI's step object
-    def step_callback_wrapper(step_output):
-        if callback_function:
-            try:
-                if hasattr(step_output, 'thought'):
-                    callback_function(f"Thinking: {step_output.thought[:100]}...")
-                elif hasattr(step_output, 'result'):
-                     callback_function(f"Action: {str(step_output.result)[:100]}...")
-                else:
-                    callback_function(f"Step: {str(step_output)[:100]}...")
-            except:
-                callback_function("Agent is working...")
-
-    # 6. Create Crew
-    crew = Crew(
-        agents=[sourcing_agent, competitor_analyst, keyword_verifier, content_creator],
-        tasks=[task_sourcing, task_competitor, task_verification, task_content],
-        verbose=True,
-        process=Process.sequential,
-        step_callback=step_callback_wrapper if callback_function else None
+    # 7. Create Crew & Kickoff
+    crew_agents = [sourcing_agent, competitor_analyst, keyword_verifier, content_creator]
+    return _kickoff(
+        crew_agents,
+        [task_sourcing, task_competitor, task_verification, task_content],
+        step_callback,
+        _stage_recorder(['sourcing', 'competitor_analysis', 'keyword_verification', 'content_creation'], query, crew_agents)
     )
 
-    # 7. Kickoff
-    result = crew.kickoff()
-    
-    return result
+def _run_dag(query, tasks_config, agents, step_callback, callback_function):
+    # 1) 소싱
+    task_sourcing = Task(
+        description=tasks_config['sourcing_task']['description'].format(query=query),
+        expected_output=tasks_config['sourcing_task']['expected_output'],
+        agent=agents['sourcing_agent']
+    )
+    sourcing_output = str(_kickoff([agents['sourcing_agent']], [task_sourcing], step_callback,
+                                   _stage_recorder(['sourcing'], query, [agents['sourcing_agent']])))
+
+    # 2) 키워드별 경쟁사 분석 (병렬)
+    keywords = extract_keywords(sourcing_output, CREW_FANOUT_KEYWORDS) or [query]
+    if callback_function:
+        callback_function(f"경쟁사 분석 병렬 실행: {', '.join(keywords)}")
+    keyword_task = tasks_config['competitor_keyword_task']
+
+    def analyze(keyword):
+        # fan-out 스레드의 에이전트 세트 사용 (스레드 간 Agent 공유 없음)
+        analyst = get_agents()['competitor_analyst']
+        task = Task(
+            description=keyword_task['description'].format(query=query, keyword=keyword),
+            expected_output=keyword_task['expected_output'].format(keyword=keyword),
+            agent=analyst
+        )
+        return str(_kickoff([analyst], [task], step_callback, _stage_recorder(['competitor_keyword'], query, [analyst])))
+
+    started = time.perf_counter()
+    competitor_report = merge_reports(run_fanout(keywords, analyze, _fanout_executor()))
+    CREW_STAGE_SECONDS.observe(time.perf_counter() - started, stage='competitor_analysis')
+
+    # 3) 병합된 보고서로 검증 → 콘텐츠
+    verification = tasks_config['keyword_verification_task']
+    task_verification = Task(
+        description=f"{verification['description']}\n\n[키워드별 경쟁사 분석 결과]\n{competitor_report}",
+        expected_output=verification['expected_output'],
+        agent=agents['keyword_verifier']
+    )
+    task_content = Task(
+        description=tasks_config['content_creation_task']['description'],
+        expected_output=tasks_config['content_creation_task']['expected_output'],
+        agent=agents['content_creator'],
+        context=[task_verification]
+    )
+    crew_agents = [agents['keyword_verifier'], agents['content_creator']]
+    return _kickoff(
+        crew_agents,
+        [task_verification, task_content],
+        step_callback,
+        _stage_recorder(['keyword_verification', 'content_creation'], query, crew_agents)
+    )
@@ -1,21 +1,63 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import List
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Dict, List, Optional, Set
+from pymongo import ASCENDING, DESCENDING
 from bson import ObjectId
 from celery import Celery
-import os
-import json # JSONB 처리를 위해 유지
 import asyncio
-import redis.asyncio as redis
+import re
+import time
+from datetime import datetime, timedelta
 
-app = FastAPI(title="AI Marketing Hacker API (SaaS)", version="1.0.0")
+from config import REDIS_URL, CELERY_BROKER_URL, CELERY_RESULT_BACKEND, STATUS_EVENTS_ENABLED
+from models import UploadPlatform
+from utils.backends import MEMORY_MODE, async_mongo_client, async_redis, local_task_runner
+from utils.task_dispatch import TaskDispatcher, admission_headers
+from utils.serialization import MongoJSONResponse, dumps, from_mongo
+from utils.status_events import StatusWatcher
+from utils.repository import PRODUCTS, SOURCING_RESULTS, AGENT_LOG_ROLLUPS, ensure_indexes
+from utils.agent_log import hour_of, summarize_rollups
+from utils.blob_store import AsyncBlobStore, ref_field
+from utils.http_cache import ResponseCache
+from utils.metrics import (
+    REGISTRY,
+    HTTP_REQUEST_SECONDS,
+    SOURCING_QUEUE_DEPTH,
+    WEBSOCKET_CONNECTIONS,
+    WEBSOCKET_DROPS,
+    read_worker_samples,
+)
+
+app = FastAPI(
+    title="AI Marketing Hacker API (SaaS)",
+    version="1.0.0",
+    default_response_class=MongoJSONResponse
+)
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 파라미터로 라벨이 폭증하지 않도록 라우트 템플릿 사용
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status)
+        )
+
 # CORS Setup
 app.add_middleware(
     CORSMiddleware,
@@ -25,74 +67,205 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 데이터베이스 설정 (MongoDB)
-MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-client = AsyncIOMotorClient(MONGO_URL)
+# 데이터베이스 설정 (MongoDB, BACKEND_MODE=memory면 mongomock)
+client = async_mongo_client()
 db = client.ai_marketing
-products_collection = db.products
+products_collection = db[PRODUCTS.name]
+sourcing_results_collection = db[SOURCING_RESULTS.name]
+blob_store = AsyncBlobStore(db)
 
 # Celery 설정 (Redis)
 celery_app = Celery(
     "worker",
-    broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
-    backend=os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+    broker=CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND
 )
 
+# 브로커 Redis (대기열 길이 조회용) + 비동기 작업 발행기
+# (CELERY_EXECUTION=threads/eager면 브로커 없이 API 프로세스 안에서 워커 태스크 실행)
+broker_redis = async_redis(CELERY_BROKER_URL)
+dispatcher = TaskDispatcher(celery_app, broker_redis, local_runner=local_task_runner())
+
+# 응답 캐시 / 워커 메트릭 집계용 Redis
+app_redis = async_redis(REDIS_URL)
+
+# 읽기 API 응답 캐시 (ETag + Redis)
+response_cache = ResponseCache(app_redis)
+
 # WebSocket 연결 관리자 (Connection Manager)
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        # 사용자별 연결 (상태 변경 이벤트는 소유자에게만 전송)
+        self.user_connections: Dict[str, Set[WebSocket]] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, user_id: Optional[str] = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        if user_id:
+            self.user_connections.setdefault(user_id, set()).add(websocket)
+        WEBSOCKET_CONNECTIONS.set(len(self.active_connections))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        for user_id, connections in list(self.user_connections.items()):
+            connections.discard(websocket)
+            if not connections:
+                del self.user_connections[user_id]
+        WEBSOCKET_CONNECTIONS.set(len(self.active_connections))
+
+    async def _send(self, connections, message: bytes):
+        # 브라우저가 Blob이 아닌 문자열로 받도록 텍스트 프레임으로 전송 (연결 수와 무관하게 1번만 디코딩)
+        text = message.decode("utf-8")
+        for connection in list(connections):
+            try:
+                await connection.send_text(text)
+            except Exception:
+                # 끊긴 연결 하나 때문에 중계 루프가 멈추지 않도록 제거
+                WEBSOCKET_DROPS.inc()
+                self.disconnect(connection)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+    async def broadcast(self, message: bytes):
+        # 워커가 발행한 UTF-8 bytes를 다시 직렬화하지 않고 그대로 전달
+        await self._send(self.active_connections, message)
+
+    async def send_to_user(self, user_id: str, event: dict):
+        connections = self.user_connections.get(user_id)
+        if connections:
+            await self._send(connections, dumps(event))
 
 manager = ConnectionManager()
 
 # Redis 구독자 (Subscriber) - 워커 메시지를 웹소켓으로 중계
 async def redis_connector():
-    redis_conn = redis.from_url(os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
+    redis_conn = async_redis(REDIS_URL)
     pubsub = redis_conn.pubsub()
     await pubsub.subscribe("sourcing_updates")
     
     async for message in pubsub.listen():
         if message["type"] == "message":
-            decoded_message = message["data"].decode("utf-8")
-            await manager.broadcast(decoded_message)
+            await manager.broadcast(message["data"])
 
 @app.on_event("startup")
 async def startup_event():
+    # utils/repository.py에 선언된 컬렉션 인덱스 생성
+    await ensure_indexes(db)
     asyncio.create_task(redis_connector())
+    if STATUS_EVENTS_ENABLED:
+        # 상품/콘텐츠 상태 변경을 소유자 WebSocket으로 전송 (change stream, 미지원 시 폴링)
+        asyncio.create_task(StatusWatcher(db, manager.send_to_user, use_change_stream=not MEMORY_MODE).run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    dispatcher.shutdown()
 
 # API Endpoints
 class ProductCreate(BaseModel):
     name: str
     price: int
+    owner_id: Optional[str] = None
 
 class SourcingRequest(BaseModel):
     query: str
 
+class UploadRequest(BaseModel):
+    platforms: Optional[List[UploadPlatform]] = None
+
 @app.post("/sourcing/")
-def start_sourcing(request: SourcingRequest):
+async def start_sourcing(request: SourcingRequest):
     """
     상품 소싱 작업 시작 (황금 키워드 발굴)
+    대기열이 한도를 넘거나 워커가 없으면 429/503 + Retry-After로 즉시 거절
     """
+    decision = await dispatcher.check_admission()
+    SOURCING_QUEUE_DEPTH.set(decision.queue_depth)
+    if not decision.allowed:
+        return JSONResponse(
+            status_code=decision.status_code,
+            headers=admission_headers(decision),
+            content={
+                "detail": decision.reason,
+                "queue_depth": decision.queue_depth,
+                "estimated_wait_seconds": decision.estimated_wait_seconds,
+                "retry_after": decision.retry_after
+            }
+        )
+
     # Trigger Celery Task
-    task = celery_app.send_task("worker.run_sourcing_task", args=[request.query])
-    return {"task_id": task.id, "status": "started", "query": request.query}
+    task = await dispatcher.dispatch("worker.run_sourcing_task", [request.query])
+    return {
+        "task_id": task.id,
+        "status": "started",
+        "query": request.query,
+        "queue_position": decision.queue_depth + 1,
+        "estimated_wait_seconds": decision.estimated_wait_seconds
+    }
+
+@app.post("/uploads/")
+async def start_upload(request: UploadRequest):
+    """
+    승인된 콘텐츠 오픈마켓 업로드 시작 (플랫폼 미지정 시 UPLOAD_PLATFORMS 전체)
+    """
+    platforms = [platform.value for platform in request.platforms] if request.platforms else None
+    task = await dispatcher.dispatch("worker.upload_approved_content", [platforms])
+    return {"task_id": task.id, "status": "started", "platforms": platforms}
+
+@app.get("/sourcing/results")
+async def read_sourcing_results(request: Request, query: str, limit: int = Query(20, ge=1, le=100)):
+    """
+    특정 쿼리의 최신 소싱 결과 목록 (query, timestamp 인덱스 사용)
+    """
+    async def load():
+        cursor = sourcing_results_collection.find({"query": query}).sort("timestamp", DESCENDING).limit(limit)
+        return [from_mongo(result) async for result in cursor]
+
+    return await response_cache.respond(request, ["sourcing_results"], load)
+
+@app.get("/sourcing/results/search")
+async def search_sourcing_results(request: Request, prefix: str = Query(..., min_length=1), limit: int = Query(20, ge=1, le=100)):
+    """
+    쿼리 접두어 검색 (앵커드 정규식이라 query 인덱스 범위 스캔으로 처리됨)
+    결과 본문은 제외하고 요약 필드만 반환
+    """
+    async def load():
+        cursor = sourcing_results_collection.find(
+            {"query": {"$regex": f"^{re.escape(prefix)}"}},
+            {"result": 0}
+        ).sort([("query", ASCENDING), ("timestamp", DESCENDING)]).limit(limit)
+        return [from_mongo(result) async for result in cursor]
+
+    return await response_cache.respond(request, ["sourcing_results"], load)
+
+@app.get("/sourcing/{task_id}")
+async def read_sourcing_result(request: Request, task_id: str, include_raw: bool = False):
+    """
+    Celery task_id로 소싱 결과 조회
+    include_raw=true일 때만 blobs에 분리 저장된 원본 출력(raw_output)을 함께 로딩
+    """
+    # 미완료 작업의 404는 캐시하지 않도록 존재 여부부터 확인
+    result = await sourcing_results_collection.find_one({"task_id": task_id}, {"_id": 1})
+    if result is None:
+        raise HTTPException(status_code=404, detail="Sourcing result not found")
+
+    async def load():
+        document = from_mongo(await sourcing_results_collection.find_one({"task_id": task_id}))
+        result = document.get("result") or {}
+        for name in SOURCING_RESULTS.blob_fields:
+            ref = result.get(ref_field(name))
+            if include_raw and ref:
+                result[name] = await blob_store.get(ref)
+        return document
+
+    return await response_cache.respond(request, ["sourcing_results"], load)
 
 @app.post("/products/")
 async def create_product(product: ProductCreate):
     product_dict = product.dict()
     product_dict["status"] = "queued"
+    product_dict["updated_at"] = datetime.now()
     result = await products_collection.insert_one(product_dict)
+    await response_cache.bump_version("products")
     
     # Trigger Celery Task (Legacy)
     # celery_app.send_task("worker.run_ai_agent_task", args=[str(result.inserted_id), product.name])
@@ -100,17 +273,54 @@ async def create_product(product: ProductCreate):
     return {"id": str(result.inserted_id), "name": product.name, "status": "queued"}
 
 @app.get("/products/")
-async def read_products():
-    products = []
-    async for product in products_collection.find():
-        product["id"] = str(product["_id"])
-        del product["_id"]
-        products.append(product)
-    return products
+async def read_products(request: Request, owner_id: Optional[str] = None):
+    """
+    상품 목록 (상태 변경은 /ws?user_id= 로 푸시되므로 주기적 폴링 불필요)
+    """
+    async def load():
+        query = {"owner_id": owner_id} if owner_id else {}
+        return [from_mongo(product) async for product in products_collection.find(query)]
+
+    return await response_cache.respond(request, ["products"], load)
+
+@app.get("/stats/agents")
+async def read_agent_stats(request: Request, hours: int = Query(24, ge=1, le=24 * 30), hourly: bool = False):
+    """
+    에이전트/모델별 실행 시간·토큰·비용 통계 (Celery beat가 미리 만든 시간별 롤업만 읽음)
+    """
+    since = hour_of(datetime.now()) - timedelta(hours=hours - 1)
+
+    async def load():
+        cursor = db[AGENT_LOG_ROLLUPS.name].find({"hour": {"$gte": since}}).sort("hour", DESCENDING)
+        rollups = [from_mongo(rollup) async for rollup in cursor]
+        stats = {"since": since, "hours": hours, "agents": summarize_rollups(rollups)}
+        if hourly:
+            stats["hourly"] = rollups
+        return stats
+
+    return await response_cache.respond(request, ["agent_log_rollups"], load)
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus 텍스트 포맷 메트릭 (API 프로세스 + Celery 워커 집계)
+    """
+    try:
+        SOURCING_QUEUE_DEPTH.set(await dispatcher.queue_depth())
+    except Exception as e:
+        print(f"대기열 길이 조회 오류: {e}")
+    worker_samples = await read_worker_samples(app_redis)
+    return PlainTextResponse(
+        REGISTRY.render(worker_samples),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, user_id: Optional[str] = None):
+    """
+    소싱 진행 상황(전체 방송) + user_id 소유 상품/콘텐츠 상태 변경 이벤트
+    """
+    await manager.connect(websocket, user_id)
     try:
         while True:
             data = await websocket.receive_text()
@@ -1,6 +1,7 @@
 """
 MongoDB 데이터 모델 정의
 SellFlow-AI 프로젝트의 모든 데이터 스키마를 Pydantic으로 정의
+ID는 utils.ids.new_id (ObjectId 기반, 시간 정렬 가능) - 저장 시 ObjectId, API에서는 문자열
 """
 
 from pydantic import BaseModel, Field
@@ -8,6 +9,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from utils.ids import new_id
+
 
 class ProductStatus(str, Enum):
     """상품 처리 상태"""
@@ -29,9 +32,11 @@ class Product(BaseModel):
     Agent 1 (상품 소싱)의 결과물
     황금키워드 발굴 및 소싱 데이터
     """
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     keyword: str = Field(..., description="사용자가 입력한 소싱 키워드")
+    owner_id: Optional[str] = Field(None, description="상품을 소유한 사용자 ID (상태 변경 WebSocket 알림 대상)")
     sourced_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now, description="마지막 변경 시각 (상태 변경 폴링 기준)")
     status: ProductStatus = Field(default=ProductStatus.SOURCED)
 
     # 황금키워드
@@ -91,7 +96,7 @@ class CompetitorAnalysis(BaseModel):
     Agent 2 (경쟁사 페이지 분석)의 결과물
     베스트셀러 상품 페이지 전체 분석
     """
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     product_id: str = Field(..., description="연결된 Product ID")
     competitor_url: str
     analyzed_at: datetime = Field(default_factory=datetime.now)
@@ -158,7 +163,7 @@ class GeneratedContent(BaseModel):
     Agent 3 (상품 페이지 생성)의 결과물
     제목 + 이미지 + 상세페이지 HTML 전체
     """
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     product_id: str
     analysis_id: str = Field(..., description="사용된 CompetitorAnalysis ID")
     generated_at: datetime = Field(default_factory=datetime.now)
@@ -166,7 +171,8 @@ class GeneratedContent(BaseModel):
     # 생성된 콘텐츠
     titles: List[TitleOption] = Field(..., description="3가지 제목 옵션")
     images: List[ImageOption] = Field(..., description="2가지 이미지 옵션")
-    detail_html: str = Field(..., description="쿠팡/네이버 업로드용 HTML")
+    detail_html: Optional[str] = Field(None, description="쿠팡/네이버 업로드용 HTML (저장 시 큰 HTML은 blobs로 분리)")
+    detail_html_ref: Optional[str] = Field(None, description="blobs 컬렉션 참조 키 (sha256)")
     concept: Concept
 
     # 품질 검증
@@ -227,7 +233,7 @@ class FeedbackHistory(BaseModel):
     Agent 4 (피드백 처리)의 입력/출력
     사용자 피드백 및 재생성 이력
     """
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     content_id: str = Field(..., description="연결된 GeneratedContent ID")
     feedback_at: datetime = Field(default_factory=datetime.now)
 
@@ -240,6 +246,7 @@ class FeedbackHistory(BaseModel):
     # 재생성 결과
     regenerated: bool = Field(default=False)
     new_content_id: Optional[str] = Field(None, description="재생성된 새로운 GeneratedContent ID")
+    revision: Optional[int] = Field(None, description="재생성 결과 revision 번호 (content_revisions)")
 
     class Config:
         json_schema_extra = {
@@ -278,7 +285,7 @@ class UploadRecord(BaseModel):
     """
     쿠팡/네이버 업로드 기록
     """
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     content_id: str = Field(..., description="업로드된 GeneratedContent ID")
     platform: UploadPlatform
     uploaded_at: datetime = Field(default_factory=datetime.now)
@@ -311,8 +318,9 @@ class AgentLog(BaseModel):
     """
     각 에이전트의 실행 로그 (디버깅 및 모니터링용)
     """
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     agent_name: str = Field(..., description="에이전트 이름 (예: ProductSourcingAgent)")
+    model: Optional[str] = Field(None, description="사용한 LLM 모델명 (롤업 집계 기준)")
     task_id: str = Field(..., description="Celery Task ID")
     started_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
@@ -328,3 +336,5 @@ class AgentLog(BaseModel):
     llm_calls: int = Field(default=0)
     tokens_used: Optional[int] = None
     cost_usd: Optional[float] = None
+    retries: int = Field(default=0, description="LLM 호출 재시도 횟수")
+    kind: str = Field(default="stage", description="stage(크루 단계/에이전트 실행) / llm_call(툴의 LLM 호출 1건, 단계 시간에 포함됨)")
@@ -0,0 +1,4 @@
+import os
+
+# 테스트는 실제 MongoDB/Redis 없이 실행 (mongomock/fakeredis, utils/backends.py)
+os.environ.setdefault("BACKEND_MODE", "memory")
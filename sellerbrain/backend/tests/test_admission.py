@@ -0,0 +1,69 @@
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.task_dispatch import evaluate_admission, admission_headers
+
+def test_admits_when_under_budget():
+    decision = evaluate_admission(queue_depth=4, worker_slots=2, avg_task_seconds=60, max_queue_depth=10, max_estimated_wait=600)
+    assert decision.allowed
+    assert decision.estimated_wait_seconds == 120
+    assert admission_headers(decision) == {}
+
+def test_rejects_with_503_without_workers():
+    decision = evaluate_admission(queue_depth=0, worker_slots=0, no_worker_retry_after=15)
+    assert not decision.allowed
+    assert decision.status_code == 503
+    assert admission_headers(decision) == {"Retry-After": "15"}
+
+def test_rejects_with_429_when_queue_is_full():
+    decision = evaluate_admission(queue_depth=12, worker_slots=2, avg_task_seconds=60, max_queue_depth=10, max_estimated_wait=3600)
+    assert not decision.allowed
+    assert decision.status_code == 429
+    # 3개가 빠져야 한도 아래로 내려감 -> 2슬롯 기준 2라운드
+    assert decision.retry_after == 120
+
+def test_rejects_when_estimated_wait_exceeds_budget():
+    decision = evaluate_admission(queue_depth=5, worker_slots=1, avg_task_seconds=600, max_queue_depth=50, max_estimated_wait=1800)
+    assert not decision.allowed
+    assert decision.status_code == 429
+    assert decision.estimated_wait_seconds == 3000
+
+def test_local_runner_feeds_admission():
+    import asyncio
+    import threading
+    from celery import Celery
+    from utils.backends import LocalTaskRunner
+    from utils.task_dispatch import TaskDispatcher
+
+    app = Celery("test_local_runner")
+    release = threading.Event()
+
+    @app.task(name="test.block")
+    def block():
+        release.wait(5)
+        return "done"
+
+    runner = LocalTaskRunner(concurrency=1)
+    runner._task = lambda name: app.tasks[name]  # worker 모듈 대신 테스트 앱의 태스크 실행
+    dispatcher = TaskDispatcher(app, redis_conn=None, local_runner=runner)
+
+    async def scenario():
+        first = await dispatcher.dispatch("test.block", [])
+        await dispatcher.dispatch("test.block", [])
+        # 슬롯 1개가 첫 작업을 실행 중 → 두 번째 작업만 대기열에 남음
+        for _ in range(100):
+            if await dispatcher.queue_depth() == 1:
+                break
+            await asyncio.sleep(0.01)
+        decision = await dispatcher.check_admission()
+        release.set()
+        return first, decision
+
+    first, decision = asyncio.run(scenario())
+    assert decision.allowed
+    assert (decision.queue_depth, decision.worker_slots) == (1, 1)
+    assert first.future.result(timeout=5) == "done"
+    dispatcher.shutdown()
@@ -0,0 +1,78 @@
+import sys
+import os
+from datetime import datetime
+
+import mongomock
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.agent_log import percentile, build_rollups, summarize_rollups, rollup_agent_logs
+
+
+def _log(agent, seconds, minute=0, hour=10, model="gemini", status="completed", tokens=None, cost=None,
+         retries=0, kind="stage"):
+    return {
+        "agent_name": agent,
+        "model": model,
+        "started_at": datetime(2024, 5, 1, hour, minute),
+        "execution_time_seconds": seconds,
+        "status": status,
+        "llm_calls": 1,
+        "tokens_used": tokens,
+        "cost_usd": cost,
+        "retries": retries,
+        "kind": kind,
+    }
+
+def test_percentile_nearest_rank():
+    values = sorted(float(v) for v in range(1, 21))
+    assert percentile(values, 0.5) == 10
+    assert percentile(values, 0.95) == 19
+    assert percentile([3.0], 0.95) == 3.0
+    assert percentile([], 0.5) == 0.0
+
+def test_build_rollups_groups_by_agent_model_and_hour():
+    logs = [_log("Sourcing", s, minute=s, tokens=100, cost=0.01) for s in range(1, 11)]
+    logs.append(_log("Sourcing", 50, hour=11))
+    logs.append(_log("Writer", 2, model="claude", status="failed"))
+
+    rollups = {r["_id"]: r for r in build_rollups(logs)}
+    assert set(rollups) == {"Sourcing|gemini|2024-05-01T10", "Sourcing|gemini|2024-05-01T11", "Writer|claude|2024-05-01T10"}
+
+    sourcing = rollups["Sourcing|gemini|2024-05-01T10"]
+    assert sourcing["count"] == 10
+    assert sourcing["total_seconds"] == 55
+    assert sourcing["p50_seconds"] == 5
+    assert sourcing["p95_seconds"] == 10
+    assert sourcing["tokens"] == 1000
+    assert sourcing["cost_usd"] == 0.1
+    assert rollups["Writer|claude|2024-05-01T10"]["failed"] == 1
+
+def test_summarize_rollups_orders_by_wall_clock_share():
+    summary = summarize_rollups(build_rollups([_log("Writer", 10, model="claude"), _log("Sourcing", 30), _log("Sourcing", 60, hour=11)]))
+    assert [row["agent_name"] for row in summary] == ["Sourcing", "Writer"]
+    assert summary[0]["time_share"] == 0.9
+    assert summary[0]["p95_seconds_max"] == 60
+    assert summary[0]["avg_seconds"] == 45
+
+def test_llm_call_rows_are_excluded_from_time_share():
+    summary = summarize_rollups(build_rollups([
+        _log("Writer", 10, model="claude"),
+        _log("Writer", 8, model="claude", kind="llm_call"),  # Writer 단계 10초 안의 LLM 호출
+        _log("Sourcing", 30),
+    ]))
+    shares = {(row["agent_name"], row["kind"]): row["time_share"] for row in summary}
+    assert shares == {("Sourcing", "stage"): 0.75, ("Writer", "stage"): 0.25, ("Writer", "llm_call"): None}
+
+def test_rollup_agent_logs_keeps_retries():
+    db = mongomock.MongoClient().db
+    db.agent_logs.insert_many([
+        _log("Writer", 3, model="claude", retries=2, kind="llm_call"),
+        _log("Writer", 4, model="claude", retries=1, kind="llm_call"),
+    ])
+    assert rollup_agent_logs(db, lookback_hours=1, now=datetime(2024, 5, 1, 10, 30)) == 1
+    rollup = db.agent_log_rollups.find_one()
+    assert rollup["_id"] == "Writer|claude|2024-05-01T10|llm_call"
+    assert rollup["retries"] == 3 and rollup["kind"] == "llm_call"
+    assert summarize_rollups([rollup])[0]["retries"] == 3
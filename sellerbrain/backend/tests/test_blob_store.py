@@ -0,0 +1,49 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+import mongomock
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config import BLOB_INLINE_MAX_BYTES
+from utils.blob_store import BLOBS_COLLECTION, SyncBlobStore, build_blob, sweep_unreferenced
+from utils.repository import _blob_field_update, blob_ref_sources
+
+BIG_HTML = "<div>" + "경량 캠핑 의자 " * BLOB_INLINE_MAX_BYTES + "</div>"
+
+def test_put_get_roundtrip_and_dedup():
+    db = mongomock.MongoClient().db
+    store = SyncBlobStore(db)
+    key = store.put(BIG_HTML)
+    assert store.put(BIG_HTML) == key
+    assert db[BLOBS_COLLECTION].count_documents({}) == 1
+
+    document = db[BLOBS_COLLECTION].find_one({"_id": key})
+    assert document["size"] == len(BIG_HTML.encode("utf-8")) and len(document["data"]) < document["size"]
+    assert SyncBlobStore(db).get(key) == BIG_HTML
+    assert store.get("missing") is None
+
+def test_blob_field_update_swaps_inline_value_and_ref():
+    update = _blob_field_update({"detail_html": BIG_HTML}, ("detail_html",))
+    assert update["$set"] == {"detail_html_ref": build_blob(BIG_HTML)["_id"]}
+    assert update["$unset"] == {"detail_html": ""}
+    assert [blob["_id"] for blob in update["blobs"]] == [update["$set"]["detail_html_ref"]]
+
+    small = _blob_field_update({"detail_html": "<div>짧은 HTML</div>"}, ("detail_html",))
+    assert small["$set"] == {"detail_html": "<div>짧은 HTML</div>"}
+    assert small["$unset"] == {"detail_html_ref": ""} and small["blobs"] == []
+
+def test_sweep_removes_only_old_unreferenced_blobs():
+    db = mongomock.MongoClient().db
+    store = SyncBlobStore(db)
+    kept = store.put(BIG_HTML)
+    orphan = store.put(BIG_HTML + "삭제된 소싱 결과")
+    fresh = store.put(BIG_HTML + "방금 저장, 부모 문서 저장 전")
+    db.generated_contents.insert_one({"detail_html_ref": kept})
+    db[BLOBS_COLLECTION].update_many({"_id": {"$in": [kept, orphan]}},
+                                     {"$set": {"last_referenced_at": datetime.utcnow() - timedelta(days=2)}})
+
+    assert sweep_unreferenced(db, blob_ref_sources(), grace_hours=24) == 1
+    assert {document["_id"] for document in db[BLOBS_COLLECTION].find()} == {kept, fresh}
@@ -0,0 +1,81 @@
+import sys
+import os
+import asyncio
+import json
+
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.cassette import Cassette, CassetteMiss, use_cassette
+
+class _CountingAdapter(BaseAdapter):
+    """requests 요청 수를 세고 본문을 그대로 돌려주는 가짜 서버"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["content-type"] = "application/json"
+        response._content = json.dumps({"call": self.calls, "echo": json.loads(request.body)}).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+def test_requests_record_then_replay_in_order(tmp_path):
+    path = str(tmp_path / "serper.jsonl")
+    adapter = _CountingAdapter()
+    session = requests.Session()
+    session.mount("https://serper.test/", adapter)
+
+    with use_cassette(path, "record"):
+        for _ in range(2):
+            session.post("https://serper.test/search?api_key=secret", json={"q": "캠핑 의자"})
+    assert "secret" not in open(path, encoding="utf-8").read()
+
+    delays = []
+    cassette = Cassette(path, "replay", time_scale=0.5, sleep=delays.append)
+    restore = cassette.install()
+    try:
+        # 키 순서/API 키가 달라도 같은 요청, 녹화된 순서대로 응답 후 마지막 응답 반복
+        replies = [session.post("https://serper.test/search?api_key=other", data='{"q":"캠핑 의자"}').json()["call"]
+                   for _ in range(3)]
+        with pytest.raises(CassetteMiss):
+            session.post("https://serper.test/search", json={"q": "다른 검색어"})
+    finally:
+        restore()
+
+    assert replies == [1, 2, 2]
+    assert adapter.calls == 2
+    assert len(delays) == 3 and all(delay >= 0 for delay in delays)
+    assert cassette.stats == {"recorded": 0, "replayed": 3, "missed": 1}
+
+def test_httpx_sync_and_async_replay(tmp_path):
+    path = str(tmp_path / "claude.jsonl")
+    live = httpx.MockTransport(lambda request: httpx.Response(200, json={"content": [{"text": "제목"}]}))
+    offline = httpx.MockTransport(lambda request: pytest.fail("재생 중 외부 호출"))
+
+    with use_cassette(path, "record"):
+        with httpx.Client(transport=live) as client:
+            client.post("https://api.test/v1/messages", json={"model": "m"})
+
+    async def post_async():
+        async with httpx.AsyncClient(transport=offline) as client:
+            return await client.post("https://api.test/v1/messages", json={"model": "m"})
+
+    with use_cassette(path, "replay", time_scale=0) as cassette:
+        with httpx.Client(transport=offline) as client:
+            assert client.post("https://api.test/v1/messages", json={"model": "m"}).json()["content"][0]["text"] == "제목"
+        assert asyncio.run(post_async()).json()["content"][0]["text"] == "제목"
+    assert cassette.stats["replayed"] == 2
@@ -0,0 +1,95 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+claude_tool = pytest.importorskip("tools.claude_tool")
+
+from utils.agent_log import get_agent_log_writer, set_current_task, reset_current_task
+from utils.llm_cache import LLMCache
+from utils.llm_instrumentation import set_current_stage, reset_current_stage
+
+TITLES = '[{"text": "초경량 캠핑 의자 1.2kg", "length": 14, "keywords_used": ["캠핑 의자"], "score": 90}]'
+HTML = "<div>캠핑 의자 상세페이지</div>"
+
+PAGE_COPY_ARGS = (
+    "캠핑 의자", ["캠핑 의자", "경량 의자"], {"length": 40},
+    ["1.2kg 초경량", "알루미늄 프레임"], "가볍고 튼튼함", "백패킹 캠퍼", {"sections": []}
+)
+
+class FakeAsyncClaude:
+    """AsyncAnthropic 대역: 요청마다 delay초 대기 후 응답 (제목 max_tokens=1024, HTML=4096)"""
+
+    def __init__(self, delay=0.2, fail_html=False):
+        self.delay = delay
+        self.fail_html = fail_html
+        self.threads = []
+        self.messages = SimpleNamespace(with_raw_response=SimpleNamespace(create=self.create))
+
+    async def create(self, timeout=None, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        await asyncio.sleep(self.delay)
+        is_html = kwargs["max_tokens"] == 4096
+        if is_html and self.fail_html:
+            raise ValueError("overloaded")
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=HTML if is_html else TITLES)],
+                                  model=kwargs["model"], usage=SimpleNamespace(input_tokens=100, output_tokens=50))
+
+        async def parse():
+            return message
+
+        return SimpleNamespace(retries_taken=0, parse=parse)
+
+@pytest.fixture
+def fake_claude(monkeypatch):
+    def install(**options):
+        client = FakeAsyncClaude(**options)
+        monkeypatch.setattr(claude_tool, "CLAUDE_API_KEY", "test-key")
+        monkeypatch.setattr(claude_tool, "claude_client", object())
+        monkeypatch.setattr(claude_tool, "get_llm_cache", lambda: LLMCache(None))
+        monkeypatch.setattr(claude_tool, "_async_claude_client", lambda: client)
+        return client
+    return install
+
+@pytest.fixture
+def recorded(monkeypatch):
+    logs = []
+    monkeypatch.setattr(get_agent_log_writer(), "record", logs.append)
+    return logs
+
+def test_page_copy_runs_titles_and_html_concurrently(fake_claude, recorded):
+    fake_claude(delay=0.2)
+    started = time.perf_counter()
+    copy = claude_tool._run_on_claude_loop(claude_tool.generate_page_copy_async(*PAGE_COPY_ARGS))
+    elapsed = time.perf_counter() - started
+
+    assert copy["titles"][0]["text"] == "초경량 캠핑 의자 1.2kg" and copy["detail_html"] == HTML
+    assert elapsed < 0.35  # 순차 실행이면 0.4초 이상
+
+def test_page_copy_falls_back_to_mock_only_for_failed_half(fake_claude, recorded):
+    fake_claude(delay=0.01, fail_html=True)
+    copy = claude_tool._run_on_claude_loop(claude_tool.generate_page_copy_async(*PAGE_COPY_ARGS))
+
+    assert copy["titles"][0]["text"] == "초경량 캠핑 의자 1.2kg"
+    assert copy["detail_html"] == claude_tool._get_mock_html("캠핑 의자", ["1.2kg 초경량", "알루미늄 프레임"])
+
+def test_task_and_stage_reach_claude_loop_thread(fake_claude, recorded):
+    client = fake_claude(delay=0.01)
+    task_token = set_current_task("task-50")
+    stage_token = set_current_stage("content_creation")
+    try:
+        claude_tool._run_on_claude_loop(claude_tool.generate_page_copy_async(*PAGE_COPY_ARGS))
+    finally:
+        reset_current_stage(stage_token)
+        reset_current_task(task_token)
+
+    assert set(client.threads) == {"claude-async"}
+    assert sorted(log.agent_name for log in recorded) == ["ClaudeDetailHtmlGenerator", "ClaudeTitleGenerator"]
+    assert {(log.task_id, log.input_data["stage"]) for log in recorded} == {("task-50", "content_creation")}
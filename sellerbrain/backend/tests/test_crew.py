@@ -0,0 +1,64 @@
+import sys
+import os
+import threading
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+crew = pytest.importorskip("crew")
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    calls = []
+    safe_load = crew.yaml.safe_load
+
+    def counting_safe_load(stream):
+        calls.append(stream.name)
+        return safe_load(stream)
+
+    monkeypatch.setattr(crew.yaml, "safe_load", counting_safe_load)
+    return calls
+
+def test_load_config_reparses_only_when_mtime_changes(tmp_path, parse_count):
+    path = tmp_path / "agents.yaml"
+    path.write_text("sourcing_agent:\n  role: 소싱 담당\n", encoding="utf-8")
+
+    first = crew.load_config(str(path))
+    assert crew.load_config(str(path)) is first and len(parse_count) == 1
+
+    path.write_text("sourcing_agent:\n  role: 상품 소싱 담당\n", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = crew.load_config(str(path))
+    assert reloaded is not first and reloaded["sourcing_agent"]["role"] == "상품 소싱 담당"
+    assert len(parse_count) == 2
+
+class FakeRouter:
+    def __init__(self):
+        self.models = {stage: "gemini-1.5-pro" for stage in crew.AGENT_STAGES.values()}
+
+    def route(self, provider, stage):
+        return self.models[stage]
+
+def test_agents_are_reused_per_thread_and_model_combination(monkeypatch):
+    router = FakeRouter()
+    monkeypatch.setattr(crew, "_agent_cache", threading.local())
+    monkeypatch.setattr(crew, "get_model_router", lambda: router)
+    monkeypatch.setattr(crew, "_build_agents", lambda agents_config, models: {"models": dict(models)})
+
+    agents = crew.get_agents()
+    assert crew.get_agents() is agents
+
+    other_thread = []
+    thread = threading.Thread(target=lambda: other_thread.append(crew.get_agents()))
+    thread.start()
+    thread.join()
+    assert other_thread[0] is not agents and other_thread[0] == agents
+
+    router.models["keyword_verification"] = "gemini-1.5-flash"  # 쿨다운 등으로 라우팅 변경
+    rerouted = crew.get_agents()
+    assert rerouted is not agents and rerouted["models"]["keyword_verifier"] == "gemini-1.5-flash"
+    router.models["keyword_verification"] = "gemini-1.5-pro"
+    assert crew.get_agents() is agents
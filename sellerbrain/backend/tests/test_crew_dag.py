@@ -0,0 +1,55 @@
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.agent_log import set_current_task, reset_current_task, current_task_id
+from utils.crew_dag import extract_keywords, merge_reports, run_fanout
+
+def test_extract_keywords_from_inline_and_markdown_lists():
+    inline = "황금 키워드 후보: 1) 경량 캠핑 의자 2) 접이식 캠핑 의자 3) 캠핑용 의자 4) 휴대용 의자"
+    assert extract_keywords(inline, 3) == ["경량 캠핑 의자", "접이식 캠핑 의자", "캠핑용 의자"]
+
+    markdown = (
+        "## 황금 키워드 후보\n"
+        "1. **경량 캠핑 의자**: 검색량 12,000 / 경쟁 낮음\n"
+        "2. **접이식 캠핑 의자** (검색량 9,800)\n"
+        "3. \"백패킹 의자\" - 경쟁 중간\n"
+        "- 경량 캠핑 의자 | 중복\n"
+    )
+    assert extract_keywords(markdown, 5) == ["경량 캠핑 의자", "접이식 캠핑 의자", "백패킹 의자"]
+    assert extract_keywords("목록 없는 텍스트", 3) == []
+
+def test_extract_keywords_ignores_nested_details_and_bold_wrapping():
+    nested = "1. 경량 캠핑 의자\n   - 예상 검색량: 월 12,000\n   - 경쟁 강도: 낮음\n2. 접이식 캠핑 의자"
+    assert extract_keywords(nested, 5) == ["경량 캠핑 의자", "접이식 캠핑 의자"]
+    assert extract_keywords("**1. 경량 캠핑 의자** - 검색량 높음", 3) == ["경량 캠핑 의자"]
+
+    # 번호 목록 아래 들여쓰지 않은 설명 글머리표도 키워드로 취급하지 않음
+    mixed = "1. 경량 캠핑 의자\n- 예상 검색량: 월 12,000\n2. 백패킹 의자"
+    assert extract_keywords(mixed, 5) == ["경량 캠핑 의자", "백패킹 의자"]
+    assert extract_keywords("- **경량 캠핑 의자**: 검색량 높음\n  - 하위 설명", 3) == ["경량 캠핑 의자"]
+
+def test_fanout_runs_concurrently_and_keeps_order():
+    token = set_current_task("task-1")
+
+    def analyze(keyword):
+        time.sleep(0.2)
+        if keyword == "b":
+            raise RuntimeError("timeout")
+        return f"{keyword} report ({current_task_id()})"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = run_fanout(["a", "b", "c"], analyze, executor)
+    elapsed = time.perf_counter() - started
+    reset_current_task(token)
+
+    assert elapsed < 0.5
+    assert results == [("a", "a report (task-1)", None), ("b", None, "timeout"), ("c", "c report (task-1)", None)]
+    assert merge_reports(results) == (
+        "### 키워드: a\na report (task-1)\n\n### 키워드: b\n(분석 실패: timeout)\n\n### 키워드: c\nc report (task-1)"
+    )
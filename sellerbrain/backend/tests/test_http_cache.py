@@ -0,0 +1,44 @@
+import sys
+import os
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+import mongomock
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models import Product, ProductStatus
+from utils.http_cache import ResponseCache, bump_version_sync, version_key
+from utils.repository import SyncRepository
+
+def test_versions_never_repeat_after_counter_is_lost():
+    async def scenario():
+        redis_conn = fakeredis.aioredis.FakeRedis()
+        cache = ResponseCache(redis_conn)
+        first = (await cache.versions(["products"]))["products"]
+        await cache.bump_version("products")
+        bumped = (await cache.versions(["products"]))["products"]
+        await redis_conn.delete(version_key("products"))  # Redis 재시작/eviction
+        reseeded = (await cache.versions(["products"]))["products"]
+        return first, bumped, reseeded
+
+    first, bumped, reseeded = asyncio.run(scenario())
+    assert bumped == first + 1
+    assert reseeded > bumped
+
+def test_sourcing_results_etag_rotates_for_ttl_expiry():
+    versions = asyncio.run(ResponseCache(fakeredis.aioredis.FakeRedis()).versions(["sourcing_results"]))
+    assert "sourcing_results@ttl" in versions
+
+def test_repository_writes_bump_collection_version():
+    redis_conn = fakeredis.FakeRedis()
+    bump_version_sync(redis_conn, "products")
+    before = int(redis_conn.get(version_key("products")))
+
+    products = SyncRepository(mongomock.MongoClient().db, Product, redis_conn)
+    product = Product(keyword="캠핑 의자", owner_id="user-1")
+    products.insert_one(product)
+    products.update_fields(product.id, {"status": ProductStatus.UPLOADED.value})
+    assert int(redis_conn.get(version_key("products"))) == before + 2
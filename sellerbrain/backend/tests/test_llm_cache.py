@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.agent_log import set_current_task, reset_current_task
+from utils.llm_cache import LLMCache, RedisLLMCacheStore, SQLiteLLMCacheStore, parse_llm_string
+from utils.metrics import LLM_CACHE_REQUESTS
+
+def _sqlite_store(tmp_path):
+    return SQLiteLLMCacheStore(str(tmp_path / "llm.sqlite3"), max_entries=2)
+
+def _redis_store(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisLLMCacheStore(fakeredis.FakeRedis(), max_entries=2)
+
+@pytest.mark.parametrize("make_store", [_sqlite_store, _redis_store])
+def test_store_evicts_least_recently_used(tmp_path, make_store):
+    store = make_store(tmp_path)
+    store.set("a", "1", ttl=60)
+    time.sleep(0.01)
+    store.set("b", "2", ttl=60)
+    time.sleep(0.01)
+    assert store.get("a") == "1"  # a를 최근 사용으로 갱신
+    time.sleep(0.01)
+    store.set("c", "3", ttl=60)
+    assert (store.get("a"), store.get("b"), store.get("c")) == ("1", None, "3")
+
+def test_cache_hits_misses_and_bypasses_hot_temperatures(tmp_path):
+    cache = LLMCache(_sqlite_store(tmp_path), ttl=60, max_temperature=0.3)
+    calls = []
+
+    def call():
+        calls.append(1)
+        return {"text": "제목"}
+
+    def run(temperature, prompt="같은 프롬프트"):
+        return cache.cached_call("anthropic", "claude", temperature, prompt, call,
+                                 encode=lambda result: result["text"], decode=lambda value: {"text": value})
+
+    before = LLM_CACHE_REQUESTS.samples()
+    assert run(0.3) == ({"text": "제목"}, False)
+    assert run(0.3) == ({"text": "제목"}, True)
+    assert run(0.0) == ({"text": "제목"}, False)  # temperature가 다르면 다른 키
+    assert run(0.7)[1] is False and run(0.7)[1] is False
+    assert len(calls) == 4
+
+    after = LLM_CACHE_REQUESTS.samples()
+    delta = {key: after[key] - before.get(key, 0) for key in after}
+    assert delta['llm_cache_requests_total{provider="anthropic",result="hit"}'] == 1
+    assert delta['llm_cache_requests_total{provider="anthropic",result="miss"}'] == 2
+    assert delta['llm_cache_requests_total{provider="anthropic",result="bypass"}'] == 2
+
+def test_hot_temperatures_are_cached_per_task(tmp_path):
+    cache = LLMCache(_sqlite_store(tmp_path), ttl=60, max_temperature=0.3)
+    calls = []
+
+    def run():
+        def call():
+            calls.append(1)
+            return f"제목 {len(calls)}"
+        return cache.cached_call("anthropic", "claude", 0.7, "같은 프롬프트", call,
+                                 encode=lambda result: result, decode=lambda value: value)
+
+    token = set_current_task("task-1")
+    try:
+        assert run() == ("제목 1", False)
+        assert run() == ("제목 1", True)  # 같은 작업의 재시도는 재사용
+    finally:
+        reset_current_task(token)
+    token = set_current_task("task-2")
+    try:
+        assert run() == ("제목 2", False)  # 새 요청은 새로 생성
+    finally:
+        reset_current_task(token)
+
+def test_parse_llm_string():
+    llm_string = "[('_type', 'chat-google-generative-ai'), ('model', 'gemini-1.5-pro'), ('temperature', 0.7)]---[('stop', None)]"
+    assert parse_llm_string(llm_string) == ("gemini-1.5-pro", 0.7)
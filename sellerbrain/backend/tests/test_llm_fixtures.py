@@ -0,0 +1,31 @@
+import sys
+import os
+import json
+import random
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.llm_fixtures import replay_sourcing_crew, scaled_latency
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures', 'sourcing_crew.json')
+
+def test_replay_fills_query_and_scales_latency(monkeypatch):
+    monkeypatch.setattr("utils.agent_log._writer.record", lambda log: None)
+    messages, sleeps = [], []
+    query = '캠핑 "의자"'
+
+    output = replay_sourcing_crew(query, messages.append, fixture_path=FIXTURE, sleep=sleeps.append, rng=random.Random(0))
+
+    result = json.loads(output)
+    assert result["final_keyword"] == f"경량 {query}"
+    fixture = json.load(open(FIXTURE, encoding="utf-8"))
+    calls = [call for stage in fixture["stages"] for call in stage["calls"]]
+    assert len(messages) == len(sleeps) == len(calls)
+    for delay, call in zip(sleeps, calls):
+        # 기본 배율 1.0, jitter ±20%
+        assert call["latency"] * 0.8 <= delay <= call["latency"] * 1.2
+
+def test_scaled_latency_without_jitter():
+    assert scaled_latency(2.0, scale=0.5, jitter=0) == 1.0
+    assert scaled_latency(2.0, scale=0, jitter=0.2) == 0.0
@@ -0,0 +1,53 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.agent_log import get_agent_log_writer, set_current_task, reset_current_task
+from utils.llm_instrumentation import (
+    estimate_cost, instrument_llm_call, langchain_token_usage, model_price,
+    set_current_stage, reset_current_stage
+)
+
+@pytest.fixture
+def recorded(monkeypatch):
+    logs = []
+    monkeypatch.setattr(get_agent_log_writer(), "record", logs.append)
+    return logs
+
+def test_cost_uses_longest_model_prefix():
+    assert model_price("claude-3-5-sonnet-20241022") == (3.0, 15.0)
+    assert model_price("models/gemini-1.5-flash-8b") == (0.0375, 0.15)
+    assert estimate_cost("gemini-1.5-pro", 1_000_000, 200_000) == pytest.approx(2.25)
+    assert estimate_cost("unknown-model", 100, 100) is None
+
+def test_call_is_attributed_to_task_and_stage(recorded):
+    task_token = set_current_task("task-1")
+    stage_token = set_current_stage("sourcing")
+    try:
+        with instrument_llm_call("anthropic", "ClaudeTitleGenerator", "claude-3-5-sonnet-20241022") as call:
+            call.update(input_tokens=1000, output_tokens=500, retries=1)
+        with pytest.raises(RuntimeError):
+            with instrument_llm_call("anthropic", "ClaudeTitleGenerator", "claude-3-5-sonnet-20241022"):
+                raise RuntimeError("overloaded")
+    finally:
+        reset_current_stage(stage_token)
+        reset_current_task(task_token)
+
+    ok, failed = recorded
+    assert (ok.task_id, ok.input_data["stage"], ok.retries) == ("task-1", "sourcing", 1)
+    assert ok.tokens_used == 1500 and ok.cost_usd == pytest.approx(0.0105)
+    assert (failed.status, failed.error, failed.cost_usd) == ("failed", "overloaded", None)
+
+def test_langchain_usage_from_message_or_llm_output():
+    message = SimpleNamespace(usage_metadata={"input_tokens": 120, "output_tokens": 30})
+    result = SimpleNamespace(generations=[[SimpleNamespace(message=message)]], llm_output=None)
+    assert langchain_token_usage(result) == (120, 30)
+
+    legacy = SimpleNamespace(generations=[[SimpleNamespace(text="...")]],
+                             llm_output={"usage_metadata": {"prompt_token_count": 80, "candidates_token_count": 20}})
+    assert langchain_token_usage(legacy) == (80, 20)
@@ -0,0 +1,77 @@
+import sys
+import os
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.metrics import MetricsRegistry, Counter, Gauge, Histogram, WORKER_METRICS_KEY, process_instance, read_worker_samples
+
+class FakePipeline:
+    """hincrbyfloat만 지원하는 테스트용 Redis 파이프라인"""
+    def __init__(self, store):
+        self.store = store
+
+    def hincrbyfloat(self, key, field, amount):
+        bucket = self.store.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0.0) + amount
+
+    def execute(self):
+        pass
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self):
+        return FakePipeline(self.store)
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    calls = Counter("calls", "호출 수", ["provider"], registry=registry)
+    latency = Histogram("latency_seconds", "지연 시간", buckets=(0.1, 1.0), registry=registry)
+
+    calls.inc(provider="anthropic")
+    calls.inc(2, provider="anthropic")
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = registry.render()
+    assert "# TYPE calls counter" in text
+    assert 'calls_total{provider="anthropic"} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+def test_worker_flush_is_merged_into_render():
+    worker_registry = MetricsRegistry()
+    api_registry = MetricsRegistry()
+    Counter("tasks", "작업 수", registry=worker_registry).inc(4)
+    api_tasks = Counter("tasks", "작업 수", registry=api_registry)
+    api_tasks.inc(1)
+
+    redis_conn = FakeRedis()
+    worker_registry.flush_to_redis(redis_conn)
+    worker_registry.flush_to_redis(redis_conn)  # 이미 비워졌으므로 중복 합산 없음
+
+    remote = redis_conn.store[WORKER_METRICS_KEY]
+    assert "tasks_total 5" in api_registry.render(remote)
+
+def test_worker_gauges_are_exported_per_process():
+    worker_registry = MetricsRegistry()
+    api_registry = MetricsRegistry()
+    worker_open = Gauge("circuit_open", "차단 여부", ["provider"], registry=worker_registry)
+    Gauge("circuit_open", "차단 여부", ["provider"], registry=api_registry)
+
+    server = fakeredis.FakeServer()
+    worker_open.set(1, provider="anthropic")
+    worker_registry.flush_to_redis(fakeredis.FakeRedis(server=server))
+    worker_open.set(0, provider="anthropic")
+    worker_registry.flush_to_redis(fakeredis.FakeRedis(server=server))  # 합산하지 않고 마지막 값
+
+    remote = asyncio.run(read_worker_samples(fakeredis.aioredis.FakeRedis(server=server)))
+    text = api_registry.render(remote)
+    assert f'circuit_open{{provider="anthropic",instance="{process_instance()}"}} 0' in text
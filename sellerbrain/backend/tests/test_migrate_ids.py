@@ -0,0 +1,67 @@
+import sys
+import os
+from datetime import datetime
+
+import mongomock
+from bson import ObjectId
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.ids import legacy_id_to_object_id
+from utils.migrate_ids import migrate_collection, migrate_document
+
+def test_legacy_ids_map_deterministically_without_collisions():
+    legacy_ids = [f"1733812345.{micro:06d}" for micro in range(5000)]  # 같은 초에 생성된 ID
+    mapped = [legacy_id_to_object_id(value) for value in legacy_ids]
+    assert mapped == [legacy_id_to_object_id(value) for value in legacy_ids]
+    assert len(set(mapped)) == len(legacy_ids)
+    assert mapped[0].generation_time.timestamp() == 1733812345
+
+def test_references_follow_the_same_mapping():
+    product = migrate_document({"_id": ObjectId(), "id": "1733812300.1", "keyword": "캠핑 의자"})
+    analysis = migrate_document({"_id": ObjectId(), "id": "1733812345.5", "product_id": "1733812300.1"})
+    assert "id" not in product
+    assert analysis["product_id"] == product["_id"] == legacy_id_to_object_id("1733812300.1")
+    assert migrate_document({"_id": product["_id"], "keyword": "캠핑 의자"}) is None  # 이미 변환됨
+
+def test_unconvertible_documents_are_left_untouched():
+    collection = mongomock.MongoClient().db.products
+    original = {"_id": ObjectId(), "id": "prod-abc", "keyword": "캠핑 의자"}
+    collection.insert_many([dict(original), {"_id": ObjectId(), "id": "1733812300.1", "keyword": "텐트"}])
+
+    assert migrate_document(original) is None
+    assert migrate_collection(collection) == 1
+    assert collection.find_one({"_id": original["_id"]}) == original
+    assert collection.find_one({"_id": legacy_id_to_object_id("1733812300.1")})["keyword"] == "텐트"
+
+def test_colliding_legacy_ids_are_skipped_not_merged():
+    collection = mongomock.MongoClient().db.products
+    first = {"_id": ObjectId(), "id": "1733812345.123456", "keyword": "A"}
+    second = {"_id": ObjectId(), "id": "1733812345.123456", "keyword": "B"}
+    collection.insert_many([dict(first), dict(second), {"_id": ObjectId(), "id": "1733812300.1", "keyword": "텐트"}])
+
+    assert migrate_collection(collection) == 1
+    assert collection.find_one({"_id": first["_id"]}) == first
+    assert collection.find_one({"_id": second["_id"]}) == second
+    assert collection.find_one({"_id": legacy_id_to_object_id("1733812345.123456")}) is None
+
+def test_existing_target_from_another_document_is_not_overwritten():
+    collection = mongomock.MongoClient().db.products
+    target = legacy_id_to_object_id("1733812345.5")
+    occupant = {"_id": target, "keyword": "이미 변환된 다른 상품"}
+    original = {"_id": ObjectId(), "id": "1733812345.5", "keyword": "캠핑 의자"}
+    collection.insert_many([dict(occupant), dict(original)])
+
+    assert migrate_collection(collection) == 0
+    assert collection.find_one({"_id": target}) == occupant
+    assert collection.find_one({"_id": original["_id"]}) == original
+
+def test_rerun_after_interrupted_batch_finishes_delete():
+    collection = mongomock.MongoClient().db.products
+    original = {"_id": ObjectId(), "id": "1733812345.5", "keyword": "캠핑 의자",
+                "created_at": datetime(2024, 12, 10, 6, 25, 45, 123456)}
+    collection.insert_many([dict(original), migrate_document(original)])  # upsert 후 삭제 전에 중단
+
+    assert migrate_collection(collection) == 1
+    assert [document["_id"] for document in collection.find()] == [legacy_id_to_object_id("1733812345.5")]
@@ -0,0 +1,108 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.model_router import ModelRouter
+
+MODELS = {"anthropic": {"fast": "haiku", "quality": "sonnet"}}
+
+def _router(clock=lambda: 0.0):
+    return ModelRouter(
+        provider_models=MODELS,
+        stage_tiers={"feedback_parsing": "fast", "title_generation": "quality", "summary": "balanced"},
+        small_input_chars=100, fast_max_input_chars=1000, alpha=0.5, timeout_cooldown=60,
+        deadlines={"anthropic": 30}, clock=clock
+    )
+
+def test_route_by_tier_and_input_size():
+    router = _router()
+    assert router.route("anthropic", "feedback_parsing", input_chars=50) == "haiku"
+    assert router.route("anthropic", "feedback_parsing", input_chars=5000) == "sonnet"
+    assert router.route("anthropic", "summary", input_chars=50) == "haiku"
+    assert router.route("anthropic", "summary", input_chars=500) == "sonnet"
+    assert router.route("anthropic", "unknown_stage") == "sonnet"
+
+def test_deadline_uses_observed_latency():
+    router = _router()
+    router.observe("sonnet", 10.0)
+    router.observe("sonnet", 20.0)  # EWMA 15
+    router.observe("haiku", 2.0)
+    assert router.expected_latency("sonnet") == pytest.approx(15.0)
+    assert router.route("anthropic", "title_generation", deadline=20) == "sonnet"
+    assert router.route("anthropic", "title_generation", deadline=8) == "haiku"
+
+def test_observed_latency_routes_without_explicit_deadline():
+    router = _router()
+    router.observe("sonnet", 45.0)  # 요청 타임아웃(30초)보다 느림
+    assert router.route("anthropic", "title_generation") == "haiku"
+    router.observe("haiku", 60.0)  # 다른 쪽이 더 느리면 그대로
+    assert router.route("anthropic", "title_generation") == "sonnet"
+
+def test_claude_call_site_uses_observed_latency(monkeypatch):
+    claude_tool = pytest.importorskip("tools.claude_tool")
+    from utils.llm_cache import LLMCache
+
+    router = _router()
+    router.observe("sonnet", 45.0)
+    requested = []
+
+    def fake_call(agent_name, model, request):
+        requested.append(model)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text="제목")], model=model, usage=None)
+
+    monkeypatch.setattr(claude_tool, "get_model_router", lambda: router)
+    monkeypatch.setattr(claude_tool, "get_llm_cache", lambda: LLMCache(None))
+    monkeypatch.setattr(claude_tool, "_call_claude", fake_call)
+    message = claude_tool._create_message("ContentCreator", "title_generation",
+                                          messages=[{"role": "user", "content": "캠핑 의자 제목"}], max_tokens=100)
+    assert message.model == "haiku" and requested == ["haiku"]
+
+def test_timeout_falls_back_and_cools_down():
+    now = [0.0]
+    router = _router(clock=lambda: now[0])
+    calls = []
+
+    def call(model):
+        calls.append(model)
+        if model == "sonnet":
+            router.observe(model, 30.0, timed_out=True)
+            raise TimeoutError("read timeout")
+        return f"{model} 응답"
+
+    assert router.call("anthropic", "title_generation", call) == "haiku 응답"
+    assert router.route("anthropic", "title_generation") == "haiku"  # 쿨다운 중
+    now[0] = 61.0
+    assert router.route("anthropic", "title_generation") == "sonnet"
+    assert calls == ["sonnet", "haiku"]
+
+    def parse_error(model):
+        raise ValueError("bad json")
+
+    # 타임아웃이 아닌 오류는 다른 모델로 재시도하지 않음
+    with pytest.raises(ValueError):
+        router.call("anthropic", "feedback_parsing", parse_error)
+
+def test_timeout_retry_stays_within_call_deadline():
+    now = [0.0]
+    router = _router(clock=lambda: now[0])
+    calls = []
+
+    def slow_timeout(model):
+        calls.append(model)
+        now[0] += 30.0
+        raise TimeoutError("read timeout")
+
+    with pytest.raises(TimeoutError):
+        router.call("anthropic", "title_generation", slow_timeout, deadline=30.0)
+    assert calls == ["sonnet"]  # 마감 시간을 다 써서 다른 등급 재시도 없음
+
+    router.timeout_retry = False
+    calls.clear()
+    with pytest.raises(TimeoutError):
+        router.call("anthropic", "feedback_parsing", slow_timeout)
+    assert len(calls) == 1
@@ -0,0 +1,30 @@
+import sys
+import os
+
+import mongomock
+from pymongo import ASCENDING, IndexModel
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config import SOURCING_RESULT_TTL_DAYS
+from utils.repository import SOURCING_RESULTS, ttl_changes
+
+def test_sourcing_result_index_specs():
+    indexes = {index.document["name"]: index.document for index in SOURCING_RESULTS.indexes}
+    assert set(indexes) >= {"task_id_1", "query_1_timestamp_-1"}
+    if SOURCING_RESULT_TTL_DAYS > 0:
+        assert indexes["created_at_ttl"]["expireAfterSeconds"] == SOURCING_RESULT_TTL_DAYS * 24 * 60 * 60
+
+def test_changed_ttl_becomes_coll_mod():
+    db = mongomock.MongoClient().db
+    collection = db[SOURCING_RESULTS.name]
+    assert ttl_changes(SOURCING_RESULTS, collection.index_information()) == []  # 첫 배포: create_indexes가 생성
+
+    collection.create_indexes([IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=60)])
+    expected = [index.document["expireAfterSeconds"] for index in SOURCING_RESULTS.indexes
+                if "expireAfterSeconds" in index.document]
+    assert ttl_changes(SOURCING_RESULTS, collection.index_information()) == [
+        {"collMod": SOURCING_RESULTS.name, "index": {"name": "created_at_ttl", "expireAfterSeconds": ttl}}
+        for ttl in expected
+    ]
@@ -0,0 +1,110 @@
+import sys
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.resilience import (
+    CircuitBreaker, DeadlineExceededError, ahedged_call, awith_fallback, call_deadline, hedged_call,
+    provider_timeout, request_timeout, time_left, with_fallback
+)
+from utils.metrics import LLM_HEDGES
+
+def test_breaker_opens_on_error_rate_and_probes_after_cooldown():
+    now = [0.0]
+    breaker = CircuitBreaker("test", window_seconds=60, min_calls=4, error_rate=0.5, open_seconds=30,
+                             clock=lambda: now[0])
+    for ok in (True, False, True):
+        breaker.record(ok)
+    assert breaker.state == "closed"
+    breaker.record(False)  # 2/4 실패
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 31.0
+    assert breaker.allow() and not breaker.allow()  # half_open: 시험 호출 1건만
+    breaker.record(False)
+    assert breaker.state == "open"
+
+    now[0] = 62.0
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_hedge_returns_first_success_and_skips_when_fast():
+    release = threading.Event()
+    calls = []
+
+    def slow_then_fast():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)  # 첫 요청은 멈춰 있음
+            return "primary"
+        return "hedge"
+
+    key = 'llm_hedges_total{provider="test",winner="hedge"}'
+    before = LLM_HEDGES.samples().get(key, 0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call("test", slow_then_fast, hedge_after=0.05, executor=executor) == "hedge"
+        release.set()
+        assert hedged_call("test", lambda: "fast", hedge_after=1.0, executor=executor) == "fast"
+    assert len(calls) == 2
+    assert LLM_HEDGES.samples()[key] == before + 1
+
+def test_async_hedge_cancels_losing_request():
+    cancelled = []
+
+    async def scenario():
+        calls = []
+
+        async def slow_then_fast():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+                return "primary"
+            return "hedge"
+
+        return await ahedged_call("test", slow_then_fast, hedge_after=0.05)
+
+    assert asyncio.run(scenario()) == "hedge"
+    assert cancelled == [True]
+
+def test_fallback_runs_other_provider_on_failure():
+    def fail():
+        raise TimeoutError("claude stuck")
+
+    assert with_fallback("anthropic", fail, "google", lambda: "gemini") == "gemini"
+    assert with_fallback("anthropic", lambda: "claude", "google", lambda: pytest.fail("불필요한 대체")) == "claude"
+
+    async def afail():
+        raise TimeoutError("claude stuck")
+
+    async def gemini():
+        return "gemini"
+
+    assert asyncio.run(awith_fallback("anthropic", afail, "google", gemini)) == "gemini"
+
+def test_call_deadline_caps_request_timeout_and_blocks_fallback():
+    assert time_left() is None and request_timeout("anthropic") == provider_timeout("anthropic")
+    with call_deadline(5):
+        with call_deadline(600):  # 안쪽에서 늘려도 바깥 마감 유지
+            assert 0 < request_timeout("anthropic") <= 5
+    assert time_left() is None
+
+    def fail():
+        raise TimeoutError("claude stuck")
+
+    with call_deadline(0):
+        with pytest.raises(DeadlineExceededError):
+            request_timeout("google")
+        # 시간 예산을 다 썼으면 Gemini로 대체하지 않고 그대로 실패
+        with pytest.raises(TimeoutError):
+            with_fallback("anthropic", fail, "google", lambda: pytest.fail("마감 후 대체"))
@@ -0,0 +1,73 @@
+import sys
+import os
+
+import mongomock
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models import GeneratedContent, FeedbackHistory, ParsedFeedback
+from utils.content_feedback import apply_feedback
+from utils.repository import SyncRepository
+from utils.revisions import (
+    diff_text, apply_text_diff, diff_snapshots, apply_delta, delta_is_empty, RevisionStore, snapshot_of
+)
+
+OLD_HTML = '<div style="color: #333;"><h1>무선 이어폰</h1><p>30시간 재생</p><p>IPX7 방수</p></div>'
+NEW_HTML = '<div style="color: #333;"><h1>TWS 무선 이어폰</h1><p>30시간 재생</p><p>IPX7 방수</p></div>'
+
+def test_text_diff_roundtrip():
+    ops = diff_text(OLD_HTML, NEW_HTML)
+    assert apply_text_diff(OLD_HTML, ops) == NEW_HTML
+    # 바뀐 텍스트만 삽입 문자열로 저장됨
+    assert [op for op in ops if isinstance(op, str)] == ["TWS 무선 이어폰"]
+
+def test_snapshot_delta_only_keeps_changed_fields():
+    old = {"titles": [{"text": "A"}], "detail_html": OLD_HTML, "quality_score": 80, "risky_keywords": []}
+    new = {"titles": [{"text": "B"}], "detail_html": NEW_HTML, "quality_score": 80}
+
+    delta = diff_snapshots(old, new)
+    assert set(delta["set"]) == {"titles"}
+    assert set(delta["text"]) == {"detail_html"}
+    assert delta["unset"] == ["risky_keywords"]
+    assert apply_delta(old, delta) == new
+
+def test_identical_snapshots_produce_empty_delta():
+    snapshot = {"detail_html": OLD_HTML, "quality_score": 80}
+    assert delta_is_empty(diff_snapshots(snapshot, dict(snapshot)))
+
+def _content(**fields):
+    return GeneratedContent(
+        product_id="p1", analysis_id="a1",
+        titles=[{"text": "무선 이어폰", "length": 6, "keywords_used": []}],
+        images=[], detail_html=OLD_HTML,
+        concept={"value_proposition": "30시간 재생", "target_audience": "출퇴근족", "tone": "기술력"},
+        **fields
+    )
+
+def test_materialize_and_compact_keep_history():
+    store = RevisionStore(mongomock.MongoClient().db, keyframe_interval=100)
+    snapshots = [snapshot_of(_content(quality_score=score)) for score in range(5)]
+    for index, snapshot in enumerate(snapshots):
+        assert store.record("c1", snapshot, feedback_id=f"f{index}") == index
+
+    assert [store.materialize("c1", revision) for revision in range(5)] == snapshots
+    assert store.compact("c1", keep_last=2) == 2
+    assert [store.materialize("c1", revision) for revision in (2, 3, 4)] == snapshots[2:]
+    assert store.materialize("c1", 1) is None
+    assert store.revisions.find_one({"content_id": "c1", "revision": 2})["feedback_id"] == "f2"
+
+def test_feedback_records_original_and_regenerated_revisions():
+    db = mongomock.MongoClient().db
+    content = _content()
+    SyncRepository(db, GeneratedContent).insert_one(content)
+    parsed = ParsedFeedback(action="regenerate_html", target="html")
+
+    feedback = apply_feedback(db, content.id, "TWS 강조해줘", parsed, {"detail_html": NEW_HTML})
+    assert feedback.regenerated and feedback.revision == 1
+    store = RevisionStore(db)
+    assert store.materialize(content.id, 0)["detail_html"] == OLD_HTML
+    assert store.latest(content.id)["snapshot"]["detail_html"] == NEW_HTML
+    assert store.revisions.find_one({"revision": 1})["feedback_id"] == feedback.id
+    assert SyncRepository(db, FeedbackHistory).get(feedback.id).revision == 1
+    assert SyncRepository(db, GeneratedContent).get(content.id).detail_html == NEW_HTML
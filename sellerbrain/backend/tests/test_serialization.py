@@ -0,0 +1,45 @@
+import sys
+import os
+from datetime import datetime
+from enum import Enum
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.serialization import MongoJSONResponse, dumps, from_mongo, loads
+
+class Status(str, Enum):
+    DONE = "done"
+
+def test_dumps_converts_object_id_and_datetime():
+    object_id = ObjectId()
+    body = dumps({"_id": object_id, "created_at": datetime(2024, 12, 10, 6, 25, 45, 123456),
+                  "status": Status.DONE, "tags": {"캠핑"}})
+    assert loads(body) == {"_id": str(object_id), "created_at": "2024-12-10T06:25:45.123456",
+                           "status": "done", "tags": ["캠핑"]}
+
+def test_korean_round_trips_without_escaping():
+    body = dumps({"keyword": "경량 캠핑 의자"})
+    assert "경량 캠핑 의자".encode("utf-8") in body and b"\\u" not in body
+    assert loads(body) == {"keyword": "경량 캠핑 의자"}
+
+def test_from_mongo_renames_only_top_level_id():
+    product_id, option_id = ObjectId(), ObjectId()
+    document = from_mongo({"_id": product_id, "options": [{"_id": option_id, "name": "블랙"}]})
+    assert document["id"] == product_id and "_id" not in document
+    assert document["options"] == [{"_id": option_id, "name": "블랙"}]  # 하위 문서는 그대로
+    assert loads(dumps(document))["options"][0]["_id"] == str(option_id)
+    assert from_mongo(None) is None
+
+def test_response_matches_plain_json_response():
+    object_id = ObjectId()
+    document = {"_id": object_id, "keyword": "캠핑 의자", "price": 39000, "rating": 4.5,
+                "created_at": datetime(2024, 12, 10, 6, 25, 45), "options": [None, True]}
+    response = MongoJSONResponse(document)
+    expected = JSONResponse(jsonable_encoder({**document, "_id": str(object_id)}))
+    assert response.body == expected.body
+    assert response.headers["content-type"] == expected.headers["content-type"]
@@ -0,0 +1,113 @@
+import sys
+import os
+import json
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+
+from tools.serper_tool import SerperClient, DiskCache, MemoryCache, build_digest, cache_key, compact_response, parse_queries
+
+SERPER_RESPONSE = {
+    "searchParameters": {"q": "캠핑 의자", "type": "search", "engine": "google"},
+    "answerBox": {"title": "캠핑 의자 추천", "snippet": "경량 의자가 인기", "link": "https://a.example"},
+    "organic": [
+        {"title": f"결과 {i}", "link": f"https://example.com/{i}", "snippet": f"요약 {i}",
+         "position": i, "date": "2024-05-01", "sitelinks": [{"title": "x", "link": "y"}]}
+        for i in range(10)
+    ],
+    "peopleAlsoAsk": [{"question": "캠핑 의자 무게는?", "snippet": "...", "link": "..."}],
+    "relatedSearches": [{"query": "경량 캠핑 의자"}],
+}
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return SERPER_RESPONSE
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.calls.append((json, timeout))
+        return FakeResponse()
+
+def test_compact_response_keeps_agent_fields():
+    compact = compact_response(SERPER_RESPONSE, max_results=3)
+    assert compact["answer"] == {"title": "캠핑 의자 추천", "snippet": "경량 의자가 인기"}
+    assert compact["results"][0] == {"title": "결과 0", "link": "https://example.com/0", "snippet": "요약 0"}
+    assert len(compact["results"]) == 3
+    assert compact["questions"] == ["캠핑 의자 무게는?"]
+    assert len(json.dumps(compact, ensure_ascii=False)) < len(json.dumps(SERPER_RESPONSE, ensure_ascii=False)) / 2
+
+def test_near_identical_queries_share_cache(tmp_path):
+    assert cache_key("캠핑  의자 ") == cache_key("캠핑 의자?")
+
+    session = FakeSession()
+    disk = DiskCache(str(tmp_path / "serper.sqlite3"))
+    client = SerperClient(api_key="key", session=session, timeout=3, shared_cache=disk, memory_cache=MemoryCache())
+    first = client.search_text("캠핑 의자")
+    assert client.search_text("  캠핑   의자 ") == first
+    assert len(session.calls) == 1
+    assert session.calls[0][1] == 3
+
+    # 새 프로세스(메모리 캐시 없음)도 디스크 캐시에서 읽음
+    other = SerperClient(api_key="key", session=FakeSession(), shared_cache=DiskCache(str(tmp_path / "serper.sqlite3")),
+                         memory_cache_enabled=False)
+    assert other.search("캠핑 의자") == json.loads(first)
+    assert other.session.calls == []
+
+def test_disk_cache_purges_expired_rows_on_write(tmp_path):
+    disk = DiskCache(str(tmp_path / "serper.sqlite3"))
+    disk.set("old", "{}", ttl=-1)
+    disk.set("new", "{}", ttl=60)
+    assert [row[0] for row in disk._conn.execute("SELECT key FROM search_cache")] == ["new"]
+
+def test_search_many_dedupes_queries_and_links():
+    requested = []
+
+    def handler(request):
+        query = json.loads(request.content)["q"]
+        requested.append(query)
+        if query == "실패":
+            return httpx.Response(500)
+        # 두 검색어가 같은 페이지를 찾음 (www/끝 슬래시 차이)
+        return httpx.Response(200, json={
+            "organic": [
+                {"title": "공통 결과", "link": "https://www.shared.example/"},
+                {"title": f"{query} 전용", "link": f"https://example.com/{query}"},
+            ],
+            "relatedSearches": [{"query": "경량 캠핑 의자"}],
+        })
+
+    client = SerperClient(api_key="key", session=FakeSession(), memory_cache=MemoryCache(),
+                          transport=httpx.MockTransport(handler))
+    client.search_text("캐시됨")  # FakeSession 응답이 메모리 캐시에 들어감
+    results = client.search_many(["캠핑 의자", "캠핑  의자", "백패킹 의자", "실패", "캐시됨"])
+
+    assert sorted(requested) == sorted(["캠핑 의자", "백패킹 의자", "실패"])
+    # 두 번째 호출도 같은 비동기 클라이언트(연결 풀) 재사용
+    async_client = client._async_client
+    client.search_many(["텐트"])
+    assert client._async_client is async_client and requested[-1] == "텐트"
+    assert [query for query, _, _ in results] == ["캠핑 의자", "백패킹 의자", "실패", "캐시됨"]
+    assert results[2][1] is None and results[2][2]
+
+    digest = json.loads(build_digest(results[:3]))
+    links = [item["link"] for item in digest["results"]]
+    assert links[0] == "https://www.shared.example/"
+    assert digest["results"][0]["queries"] == ["캠핑 의자", "백패킹 의자"]
+    assert len(links) == 3
+    assert digest["related"] == ["경량 캠핑 의자"]
+    assert "error" in digest["queries"]["실패"]
+
+    capped = build_digest(results[:3], max_chars=200)
+    assert len(capped) <= 200 and json.loads(capped)["truncated"]
+
+def test_parse_queries():
+    assert parse_queries('["a", "b"]') == ["a", "b"]
+    assert parse_queries("a\nb; c | d", limit=3) == ["a", "b", "c"]
@@ -0,0 +1,55 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.backends import MEMORY_MODE, mongo_client
+from utils.repository import SOURCING_RESULTS
+
+if not MEMORY_MODE:
+    pytest.skip("BACKEND_MODE=memory에서만 실행", allow_module_level=True)
+
+import main
+
+client = TestClient(main.app)
+collection = mongo_client().ai_marketing[SOURCING_RESULTS.name]
+
+def _insert(query, count, task_prefix):
+    base = datetime(2024, 12, 10, 6, 0, 0)
+    collection.insert_many([
+        {"task_id": f"{task_prefix}-{i}", "query": query, "timestamp": base + timedelta(minutes=i),
+         "result": {"report": f"{query} 보고서 {i}"}}
+        for i in range(count)
+    ])
+
+def test_results_are_newest_first_within_limit_bounds():
+    _insert("경량 캠핑 의자", 5, "latest")
+
+    response = client.get("/sourcing/results", params={"query": "경량 캠핑 의자", "limit": 3})
+    assert response.status_code == 200
+    assert [result["task_id"] for result in response.json()] == ["latest-4", "latest-3", "latest-2"]
+    assert all(isinstance(result["id"], str) and "_id" not in result for result in response.json())
+
+    for limit in (0, 101):
+        assert client.get("/sourcing/results", params={"query": "경량 캠핑 의자", "limit": limit}).status_code == 422
+
+def test_results_path_is_not_captured_by_task_route():
+    # /sourcing/{task_id}로 잡혔다면 404 "Sourcing result not found"
+    assert client.get("/sourcing/results", params={"query": "없는 쿼리"}).json() == []
+    assert client.get("/sourcing/results").status_code == 422
+    assert client.get("/sourcing/results/search").status_code == 422
+
+def test_search_escapes_prefix_and_omits_result_body():
+    _insert("a.b 의자", 1, "dot")
+    _insert("axb 의자", 1, "literal")
+
+    response = client.get("/sourcing/results/search", params={"prefix": "a.b"})
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["task_id"] for result in results] == ["dot-0"]
+    assert "result" not in results[0] and results[0]["query"] == "a.b 의자"
@@ -0,0 +1,56 @@
+import sys
+import os
+import asyncio
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bson import ObjectId
+from utils.status_events import StatusWatcher
+
+
+class FakeProducts:
+    def __init__(self, documents):
+        self.documents = {document["_id"]: document for document in documents}
+        self.lookups = 0
+
+    async def find_one(self, query, projection=None):
+        self.lookups += 1
+        return self.documents.get(query["_id"])
+
+
+def _watcher(products):
+    sent = []
+
+    async def publish(owner_id, event):
+        sent.append((owner_id, event))
+
+    db = {"products": FakeProducts(products), "generated_contents": None}
+    return StatusWatcher(db, publish), db["products"], sent
+
+def test_product_events_go_to_owner_only_on_status_change():
+    product_id = ObjectId()
+    watcher, _, sent = _watcher([])
+
+    async def scenario():
+        await watcher._emit_product({"_id": product_id, "owner_id": "u1", "status": "generated", "keyword": "이어폰"})
+        await watcher._emit_product({"_id": product_id, "owner_id": "u1", "status": "generated", "keyword": "무선 이어폰"})
+        await watcher._emit_product({"_id": product_id, "owner_id": "u1", "status": "approved", "keyword": "무선 이어폰"})
+        await watcher._emit_product({"_id": ObjectId(), "owner_id": None, "status": "sourced"})
+
+    asyncio.run(scenario())
+    assert [(owner, event["status"]) for owner, event in sent] == [("u1", "generated"), ("u1", "approved")]
+    assert sent[0][1]["product_id"] == str(product_id)
+
+def test_content_events_resolve_owner_through_cached_product():
+    product_id = ObjectId()
+    watcher, products, sent = _watcher([{"_id": product_id, "owner_id": "u2", "status": "generated"}])
+
+    async def scenario():
+        for _ in range(3):
+            await watcher._emit_content({"_id": ObjectId(), "product_id": product_id})
+
+    asyncio.run(scenario())
+    assert [owner for owner, _ in sent] == ["u2", "u2", "u2"]
+    assert sent[0][1]["type"] == "content_generated"
+    assert products.lookups == 1
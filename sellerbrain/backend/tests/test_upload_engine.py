@@ -0,0 +1,124 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+import mongomock
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models import GeneratedContent, Product, ProductStatus, UploadRecord, UploadStatus
+from utils.fake_marketplace import create_app
+from utils.repository import SyncRepository
+from utils.upload_engine import MarketplaceClient, TokenBucket, UploadEngine, backoff_delay, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == 0.5
+
+    # 초당 2회를 넘지 않도록 대기 (10건 → 버스트 3건 이후 3.5초)
+    for _ in range(7):
+        bucket.acquire()
+    assert clock.now == 3.5
+
+def test_token_bucket_penalize_blocks_for_retry_after():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=5, clock=clock, sleep=clock.sleep)
+    bucket.penalize(4)
+    assert bucket.try_acquire() == 5.0
+    clock.now = 5.0
+    assert bucket.try_acquire() == 0.0
+
+def test_backoff_delay_is_jittered_and_capped():
+    assert backoff_delay(0, base=1, cap=60, rng=lambda: 0.999) < 1
+    assert backoff_delay(3, base=1, cap=60, rng=lambda: 0.5) == 4
+    assert backoff_delay(10, base=1, cap=60, rng=lambda: 1.0) == 60
+    assert backoff_delay(2, base=1, cap=60, rng=lambda: 0.0) == 0
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class FlakySession:
+    """fake_marketplace TestClient 앞단: 지정한 플랫폼의 첫 요청에서 예외 발생"""
+
+    def __init__(self, app, broken_platform):
+        self.client = TestClient(app)
+        self.broken_platform = broken_platform
+
+    def post(self, url, **kwargs):
+        if self.broken_platform and f"/{self.broken_platform}/" in url:
+            self.broken_platform = None
+            raise ValueError("응답 파싱 실패")
+        return self.client.post(url, **kwargs)
+
+
+def _approved_content(db):
+    product = Product(keyword="캠핑 의자", status=ProductStatus.APPROVED)
+    content = GeneratedContent(
+        product_id=product.id, analysis_id="a1",
+        titles=[{"text": "경량 캠핑 의자", "length": 8, "keywords_used": []}],
+        images=[], detail_html="<div>경량 캠핑 의자</div>",
+        concept={"value_proposition": "1kg", "target_audience": "백패커", "tone": "실용"}
+    )
+    SyncRepository(db, Product).insert_one(product)
+    SyncRepository(db, GeneratedContent).insert_one(content)
+    return product, content
+
+
+def _engine(db, session):
+    return UploadEngine(db, client=MarketplaceClient("http://testserver", session=session),
+                        sleep=lambda seconds: None, rng=lambda: 0.0, target_platforms=["coupang", "naver"])
+
+
+def test_claim_partial_failure_retry_then_uploaded():
+    db = mongomock.MongoClient().db
+    product, content = _approved_content(db)
+    # 첫 쿠팡 요청은 500 → 같은 실행 안에서 재시도, 네이버 배치는 예외 → PENDING으로 반납
+    rolls = iter([0.0])
+    session = FlakySession(create_app(failure_rate=0.5, rng=lambda: next(rolls, 1.0)), broken_platform="naver")
+
+    summary = _engine(db, session).run(["coupang", "naver"])
+    assert summary == {"coupang": {"success": 1, "failed": 0}, "naver": {"success": 0, "failed": 0}}
+    records = {record.platform.value: record for record in SyncRepository(db, UploadRecord).find()}
+    assert records["coupang"].status == UploadStatus.SUCCESS and records["coupang"].retry_count == 1
+    assert records["naver"].status == UploadStatus.PENDING and records["naver"].retry_count == 1
+    assert db.upload_records.count_documents({"claim": {"$exists": True}}) == 0
+    assert SyncRepository(db, Product).get(product.id).status == ProductStatus.APPROVED
+
+    summary = _engine(db, session).run(["naver"])
+    assert summary == {"naver": {"success": 1, "failed": 0}}
+    assert SyncRepository(db, Product).get(product.id).status == ProductStatus.UPLOADED
+
+
+def test_expired_claim_is_reclaimed():
+    db = mongomock.MongoClient().db
+    product, content = _approved_content(db)
+    stale = UploadRecord(content_id=content.id, platform="coupang", status=UploadStatus.IN_PROGRESS)
+    fresh = UploadRecord(content_id=content.id, platform="naver", status=UploadStatus.IN_PROGRESS)
+    SyncRepository(db, UploadRecord).insert_many([stale, fresh])
+    db.upload_records.update_one({"platform": "coupang"}, {"$set": {"claim": "dead-worker",
+                                                                    "claimed_at": datetime.now() - timedelta(hours=1)}})
+    db.upload_records.update_one({"platform": "naver"}, {"$set": {"claim": "live-worker", "claimed_at": datetime.now()}})
+
+    summary = _engine(db, FlakySession(create_app(), broken_platform=None)).run(["coupang", "naver"])
+    assert summary["coupang"]["success"] == 1 and summary["naver"]["success"] == 0
+    assert db.upload_records.find_one({"platform": "naver"})["claim"] == "live-worker"
+    assert SyncRepository(db, Product).get(product.id).status == ProductStatus.APPROVED
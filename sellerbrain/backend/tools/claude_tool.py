@@ -2,71 +2,228 @@
 Claude API Tool
 상품 페이지 콘텐츠(제목, 상세설명 HTML)를 생성하는 도구
 Claude는 한국어 콘텐츠 생성에 특화되어 있음
+- 비동기 버전(*_async)은 AsyncAnthropic 사용, generate_page_copy는 제목과 HTML을 동시에 생성
 """
 
 from crewai_tools import tool
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import asyncio
 import os
 import sys
 import json
+import threading
+import weakref
+from types import SimpleNamespace
 
 # Config import
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import CLAUDE_MODEL, CLAUDE_API_KEY, CLAUDE_TEMPERATURE
+from config import (
+    CLAUDE_API_KEY, CLAUDE_TEMPERATURE, CLAUDE_MAX_RETRIES, CLAUDE_MAX_CONNECTIONS, CLAUDE_MAX_KEEPALIVE,
+    GEMINI_API_KEY
+)
+from utils.llm_instrumentation import instrument_llm_call
+from utils.llm_cache import get_llm_cache
+from utils.model_router import get_model_router
+from utils.resilience import (
+    provider_timeout, request_timeout, sdk_max_retries, call_deadline, time_left,
+    resilient_call, with_fallback, aresilient_call, awith_fallback
+)
+from utils.metrics import LLM_FALLBACKS
 
 # Anthropic Claude 초기화
 try:
     import anthropic
+    import httpx
 
     if CLAUDE_API_KEY:
-        claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+        claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY, max_retries=sdk_max_retries(CLAUDE_MAX_RETRIES),
+                                            timeout=provider_timeout("anthropic"))
 except ImportError:
     print("⚠️  anthropic 패키지가 설치되지 않았습니다.")
     print("   pip install anthropic")
     claude_client = None
 
+# Claude 장애 시 대체 생성용 Gemini
+try:
+    import google.generativeai as genai
 
-@tool("Claude Title Generator")
-def generate_product_titles(
-    product_name: str,
-    golden_keywords: List[str],
-    competitor_patterns: Dict[str, Any],
-    max_length: int = 50
-) -> List[Dict[str, Any]]:
+    if GEMINI_API_KEY:
+        genai.configure(api_key=GEMINI_API_KEY)
+except ImportError:
+    genai = None
+
+# 비동기 Claude 클라이언트 (이벤트 루프마다 1개, 같은 루프의 호출끼리 연결 풀 공유)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+# 동기 호출부(CrewAI 툴, Celery 워커)가 비동기 버전을 쓸 때 사용하는 전용 이벤트 루프
+_claude_loop: Optional[asyncio.AbstractEventLoop] = None
+_claude_loop_lock = threading.Lock()
+
+
+def _async_claude_client():
+    """현재 이벤트 루프의 AsyncAnthropic 클라이언트"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = anthropic.AsyncAnthropic(
+            api_key=CLAUDE_API_KEY,
+            max_retries=sdk_max_retries(CLAUDE_MAX_RETRIES),
+            timeout=provider_timeout("anthropic"),
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=CLAUDE_MAX_CONNECTIONS,
+                                    max_keepalive_connections=CLAUDE_MAX_KEEPALIVE)
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _run_on_claude_loop(coro):
     """
-    Claude를 사용하여 상품 제목 3가지 옵션을 생성합니다.
+    동기 코드에서 코루틴 실행 (전용 이벤트 루프 스레드 1개를 공유 → 호출 간 연결 풀 재사용)
+    task_id/크루 단계 contextvar는 호출 스레드의 값이 그대로 전달됨
+    """
+    global _claude_loop
+    with _claude_loop_lock:
+        if _claude_loop is None:
+            _claude_loop = asyncio.new_event_loop()
+            threading.Thread(target=_claude_loop.run_forever, name="claude-async", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _claude_loop).result()
 
-    Args:
-        product_name: 상품명 (예: "무선 블루투스 이어폰")
-        golden_keywords: 황금키워드 리스트 (예: ["TWS", "노이즈캔슬링", "30시간"])
-        competitor_patterns: 경쟁사 제목 패턴 분석 결과
-            {
-                'length': 45,
-                'pattern': '기능 + 제품명 + 특징',
-                'keywords': ['TWS', '블루투스'],
-                'has_numbers': True,
-                'has_emoji': False
-            }
-        max_length: 최대 길자 수 (기본 50자)
 
-    Returns:
-        [
-            {
-                'text': '노이즈캔슬링 TWS 블루투스 이어폰 30시간 재생',
-                'length': 25,
-                'keywords_used': ['TWS', '노이즈캔슬링', '30시간'],
-                'score': 95
-            },
-            ...
-        ]
+class _CachedMessage:
+    """캐시에서 꺼낸 응답 (호출부가 쓰는 message.content[i].text만 제공)"""
+
+    def __init__(self, texts: List[str], model: str):
+        self.content = [SimpleNamespace(type="text", text=text) for text in texts]
+        self.model = model
+        self.usage = None
+
+
+def _encode_message(message) -> str:
+    texts = [block.text for block in message.content if getattr(block, "type", "text") == "text"]
+    return json.dumps({"texts": texts, "model": getattr(message, "model", None)}, ensure_ascii=False)
+
+
+def _decode_message(value: str) -> _CachedMessage:
+    data = json.loads(value)
+    return _CachedMessage(data["texts"], data.get("model"))
+
+
+def _call_claude(agent_name: str, model: str, kwargs: Dict[str, Any]):
+    timeout = request_timeout("anthropic")  # 남은 시간 예산만큼만 대기
+    with instrument_llm_call("anthropic", agent_name, model) as call:
+        # raw 응답으로 호출해야 SDK 자동 재시도 횟수(retries_taken)를 알 수 있음
+        raw = claude_client.messages.with_raw_response.create(**kwargs, timeout=timeout)
+        call["retries"] = getattr(raw, "retries_taken", 0)
+        message = raw.parse()
+        usage = getattr(message, "usage", None)
+        call["input_tokens"] = getattr(usage, "input_tokens", None)
+        call["output_tokens"] = getattr(usage, "output_tokens", None)
+    return message
+
+
+async def _acall_claude(agent_name: str, model: str, kwargs: Dict[str, Any]):
+    timeout = request_timeout("anthropic")
+    with instrument_llm_call("anthropic", agent_name, model) as call:
+        raw = await _async_claude_client().messages.with_raw_response.create(**kwargs, timeout=timeout)
+        call["retries"] = getattr(raw, "retries_taken", 0)
+        message = await raw.parse()
+        usage = getattr(message, "usage", None)
+        call["input_tokens"] = getattr(usage, "input_tokens", None)
+        call["output_tokens"] = getattr(usage, "output_tokens", None)
+    return message
+
+
+def _input_chars(messages: List[Dict[str, Any]]) -> int:
+    """프롬프트 길이 (모델 라우터의 입력 크기 기준)"""
+    return sum(len(str(message.get("content", ""))) for message in messages)
+
+
+def _create_message(agent_name: str, stage: str, **kwargs):
+    """
+    Claude messages.create 호출 + 지연 시간/토큰/재시도/비용 메트릭, AgentLog 기록
+    모델은 단계 등급에 따라 모델 라우터가 선택 (타임아웃이면 다른 등급 모델로 재시도)
+    같은 요청(model, temperature, messages 등)은 LLM 캐시에서 반환 (temperature가 높으면 캐시 안 함)
+    Claude가 실패하거나 서킷이 열려 있으면 같은 프롬프트를 Gemini로 생성
+    재시도/헤지/Gemini 대체를 모두 합쳐 LLM_CALL_DEADLINE 안에서 끝남 (call_deadline)
     """
+    input_chars = _input_chars(kwargs["messages"])
+
+    def call(model: str):
+        request = {**kwargs, "model": model}
+        message, _ = get_llm_cache().cached_call(
+            "anthropic", model, request.get("temperature"), request,
+            call=lambda: resilient_call("anthropic", model, lambda: _call_claude(agent_name, model, request)),
+            encode=_encode_message,
+            decode=_decode_message
+        )
+        return message
 
-    if not CLAUDE_API_KEY or not claude_client:
-        return _get_mock_titles(product_name, golden_keywords)
+    with call_deadline():
+        return with_fallback(
+            "anthropic", lambda: get_model_router().call("anthropic", stage, call, input_chars=input_chars,
+                                                         deadline=time_left()),
+            "google", lambda: _generate_with_gemini(agent_name, stage, kwargs, input_chars)
+        )
 
-    try:
-        # 프롬프트 생성
-        prompt = f"""
+
+async def _acreate_message(agent_name: str, stage: str, **kwargs):
+    """_create_message()의 비동기 버전 (캐시 저장소 조회/저장, Gemini 대체 생성은 스레드에서 실행)"""
+    input_chars = _input_chars(kwargs["messages"])
+    cache = get_llm_cache()
+
+    async def call(model: str):
+        request = {**kwargs, "model": model}
+        temperature = request.get("temperature")
+        value = await asyncio.to_thread(cache.lookup, "anthropic", model, temperature, request)
+        if value is not None:
+            return _decode_message(value)
+        message = await aresilient_call("anthropic", model, lambda: _acall_claude(agent_name, model, request))
+        await asyncio.to_thread(cache.update, "anthropic", model, temperature, request, _encode_message(message))
+        return message
+
+    with call_deadline():
+        return await awith_fallback(
+            "anthropic", lambda: get_model_router().acall("anthropic", stage, call, input_chars=input_chars,
+                                                          deadline=time_left()),
+            "google", lambda: asyncio.to_thread(_generate_with_gemini, agent_name, stage, kwargs, input_chars)
+        )
+
+
+def _generate_with_gemini(agent_name: str, stage: str, kwargs: Dict[str, Any], input_chars: int) -> _CachedMessage:
+    """Claude 대신 Gemini로 생성 (호출부가 그대로 쓸 수 있게 Claude 메시지 형태로 반환)"""
+    if genai is None or not GEMINI_API_KEY:
+        raise RuntimeError("Gemini 대체 생성 불가 (google-generativeai 또는 GEMINI_API_KEY 없음)")
+    prompt = "\n\n".join(str(message["content"]) for message in kwargs["messages"])
+    generation_config = {"temperature": kwargs.get("temperature"), "max_output_tokens": kwargs.get("max_tokens")}
+
+    def call(model: str):
+        def generate():
+            timeout = request_timeout("google")
+            with instrument_llm_call("google", agent_name, model) as usage:
+                response = genai.GenerativeModel(model).generate_content(
+                    prompt, generation_config=generation_config,
+                    request_options={"timeout": timeout}
+                )
+                metadata = getattr(response, "usage_metadata", None)
+                usage["input_tokens"] = getattr(metadata, "prompt_token_count", None)
+                usage["output_tokens"] = getattr(metadata, "candidates_token_count", None)
+            return _CachedMessage([response.text], model)
+
+        return resilient_call("google", model, generate)
+
+    return get_model_router().call("google", stage, call, input_chars=input_chars, deadline=time_left())
+
+
+def _titles_request(
+    product_name: str,
+    golden_keywords: List[str],
+    competitor_patterns: Dict[str, Any],
+    max_length: int
+) -> Dict[str, Any]:
+    """제목 생성 요청 (동기/비동기 공용)"""
+    prompt = f"""
 당신은 전자상거래 마케팅 전문가입니다. 다음 정보를 바탕으로 매력적인 상품 제목 3가지를 생성해주세요.
 
 **상품 정보:**
@@ -102,71 +259,94 @@ JSON 배열로 3가지 제목 반환:
 반드시 JSON 형식으로만 응답하세요. 추가 설명 없이 JSON만 반환하세요.
 """
 
-        # Claude API 호출
-        message = claude_client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=1024,
-            temperature=CLAUDE_TEMPERATURE,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+    return {
+        "max_tokens": 1024,
+        "temperature": CLAUDE_TEMPERATURE,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
 
-        # 응답 파싱
-        response_text = message.content[0].text
 
-        # JSON 추출 (```json ... ``` 형식 처리)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0]
+def _parse_titles(message) -> List[Dict[str, Any]]:
+    response_text = message.content[0].text
 
-        titles = json.loads(response_text.strip())
+    # JSON 추출 (```json ... ``` 형식 처리)
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0]
 
-        print(f"✍️  Claude 제목 생성 완료: {CLAUDE_MODEL}")
-        print(f"   생성된 제목 수: {len(titles)}개")
+    titles = json.loads(response_text.strip())
 
-        return titles
+    print(f"✍️  Claude 제목 생성 완료: {message.model}")
+    print(f"   생성된 제목 수: {len(titles)}개")
 
-    except Exception as e:
-        print(f"Claude 제목 생성 오류: {e}")
-        return _get_mock_titles(product_name, golden_keywords)
+    return titles
 
 
-@tool("Claude Detail HTML Generator")
-def generate_detail_html(
+@tool("Claude Title Generator")
+def generate_product_titles(
     product_name: str,
-    features: List[str],
-    value_proposition: str,
-    target_audience: str,
-    competitor_structure: Dict[str, Any]
-) -> str:
+    golden_keywords: List[str],
+    competitor_patterns: Dict[str, Any],
+    max_length: int = 50
+) -> List[Dict[str, Any]]:
     """
-    Claude를 사용하여 상세페이지 HTML을 생성합니다.
+    Claude를 사용하여 상품 제목 3가지 옵션을 생성합니다.
 
     Args:
-        product_name: 상품명
-        features: 주요 특징 리스트 (예: ["30시간 재생", "노이즈캔슬링"])
-        value_proposition: 핵심 가치 제안 (예: "출퇴근 걱정 끝")
-        target_audience: 타겟 고객 (예: "20-30대 출퇴근족")
-        competitor_structure: 경쟁사 상세페이지 구조
+        product_name: 상품명 (예: "무선 블루투스 이어폰")
+        golden_keywords: 황금키워드 리스트 (예: ["TWS", "노이즈캔슬링", "30시간"])
+        competitor_patterns: 경쟁사 제목 패턴 분석 결과
             {
-                'sections': ['제품 소개', '주요 특징', 'FAQ', '스펙'],
-                'emphasis_points': ['30시간 재생', '노이즈캔슬링'],
-                'has_comparison_table': True,
-                'has_faq': True
+                'length': 45,
+                'pattern': '기능 + 제품명 + 특징',
+                'keywords': ['TWS', '블루투스'],
+                'has_numbers': True,
+                'has_emoji': False
             }
+        max_length: 최대 길자 수 (기본 50자)
 
     Returns:
-        쿠팡/네이버 업로드용 HTML 문자열
+        [
+            {
+                'text': '노이즈캔슬링 TWS 블루투스 이어폰 30시간 재생',
+                'length': 25,
+                'keywords_used': ['TWS', '노이즈캔슬링', '30시간'],
+                'score': 95
+            },
+            ...
+        ]
     """
 
     if not CLAUDE_API_KEY or not claude_client:
-        return _get_mock_html(product_name, features)
+        return _get_mock_titles(product_name, golden_keywords)
 
     try:
-        sections = competitor_structure.get('sections', ['제품 소개', '주요 특징', 'FAQ'])
-        emphasis = competitor_structure.get('emphasis_points', [])
+        message = _create_message(
+            "ClaudeTitleGenerator",
+            "title_generation",
+            **_titles_request(product_name, golden_keywords, competitor_patterns, max_length)
+        )
+        return _parse_titles(message)
 
-        prompt = f"""
+    except Exception as e:
+        print(f"Claude 제목 생성 오류: {e}")
+        LLM_FALLBACKS.inc(provider="anthropic", target="mock")
+        return _get_mock_titles(product_name, golden_keywords)
+
+
+def _detail_html_request(
+    product_name: str,
+    features: List[str],
+    value_proposition: str,
+    target_audience: str,
+    competitor_structure: Dict[str, Any]
+) -> Dict[str, Any]:
+    """상세페이지 HTML 생성 요청 (동기/비동기 공용)"""
+    sections = competitor_structure.get('sections', ['제품 소개', '주요 특징', 'FAQ'])
+    emphasis = competitor_structure.get('emphasis_points', [])
+
+    prompt = f"""
 당신은 전자상거래 상세페이지 제작 전문가입니다. 다음 정보로 매력적인 상세페이지 HTML을 생성해주세요.
 
 **상품 정보:**
@@ -198,34 +378,183 @@ def generate_detail_html(
 HTML만 반환하세요. 추가 설명 없이 <div>...</div> 형식으로만 응답하세요.
 """
 
-        # Claude API 호출
-        message = claude_client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=4096,
-            temperature=CLAUDE_TEMPERATURE,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
+    return {
+        "max_tokens": 4096,
+        "temperature": CLAUDE_TEMPERATURE,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+
+def _parse_detail_html(message) -> str:
+    html = message.content[0].text.strip()
+
+    # HTML 코드 블록 제거 (```html ... ``` 형식 처리)
+    if "```html" in html:
+        html = html.split("```html")[1].split("```")[0].strip()
+    elif "```" in html:
+        html = html.split("```")[1].split("```")[0].strip()
+
+    print(f"✍️  Claude HTML 생성 완료: {message.model}")
+    print(f"   HTML 길이: {len(html)} 문자")
+
+    return html
+
+
+@tool("Claude Detail HTML Generator")
+def generate_detail_html(
+    product_name: str,
+    features: List[str],
+    value_proposition: str,
+    target_audience: str,
+    competitor_structure: Dict[str, Any]
+) -> str:
+    """
+    Claude를 사용하여 상세페이지 HTML을 생성합니다.
+
+    Args:
+        product_name: 상품명
+        features: 주요 특징 리스트 (예: ["30시간 재생", "노이즈캔슬링"])
+        value_proposition: 핵심 가치 제안 (예: "출퇴근 걱정 끝")
+        target_audience: 타겟 고객 (예: "20-30대 출퇴근족")
+        competitor_structure: 경쟁사 상세페이지 구조
+            {
+                'sections': ['제품 소개', '주요 특징', 'FAQ', '스펙'],
+                'emphasis_points': ['30시간 재생', '노이즈캔슬링'],
+                'has_comparison_table': True,
+                'has_faq': True
+            }
+
+    Returns:
+        쿠팡/네이버 업로드용 HTML 문자열
+    """
+
+    if not CLAUDE_API_KEY or not claude_client:
+        return _get_mock_html(product_name, features)
+
+    try:
+        message = _create_message(
+            "ClaudeDetailHtmlGenerator",
+            "detail_html",
+            **_detail_html_request(product_name, features, value_proposition, target_audience, competitor_structure)
         )
+        return _parse_detail_html(message)
+
+    except Exception as e:
+        print(f"Claude HTML 생성 오류: {e}")
+        LLM_FALLBACKS.inc(provider="anthropic", target="mock")
+        return _get_mock_html(product_name, features)
 
-        html = message.content[0].text.strip()
 
-        # HTML 코드 블록 제거 (```html ... ``` 형식 처리)
-        if "```html" in html:
-            html = html.split("```html")[1].split("```")[0].strip()
-        elif "```" in html:
-            html = html.split("```")[1].split("```")[0].strip()
+# ============================================
+# 비동기 버전 (AsyncAnthropic) + 제목/HTML 동시 생성
+# ============================================
 
-        print(f"✍️  Claude HTML 생성 완료: {CLAUDE_MODEL}")
-        print(f"   HTML 길이: {len(html)} 문자")
+async def generate_product_titles_async(
+    product_name: str,
+    golden_keywords: List[str],
+    competitor_patterns: Dict[str, Any],
+    max_length: int = 50
+) -> List[Dict[str, Any]]:
+    """generate_product_titles()의 비동기 버전"""
+    if not CLAUDE_API_KEY or not claude_client:
+        return _get_mock_titles(product_name, golden_keywords)
 
-        return html
+    try:
+        message = await _acreate_message(
+            "ClaudeTitleGenerator",
+            "title_generation",
+            **_titles_request(product_name, golden_keywords, competitor_patterns, max_length)
+        )
+        return _parse_titles(message)
+
+    except Exception as e:
+        print(f"Claude 제목 생성 오류: {e}")
+        LLM_FALLBACKS.inc(provider="anthropic", target="mock")
+        return _get_mock_titles(product_name, golden_keywords)
+
+
+async def generate_detail_html_async(
+    product_name: str,
+    features: List[str],
+    value_proposition: str,
+    target_audience: str,
+    competitor_structure: Dict[str, Any]
+) -> str:
+    """generate_detail_html()의 비동기 버전"""
+    if not CLAUDE_API_KEY or not claude_client:
+        return _get_mock_html(product_name, features)
+
+    try:
+        message = await _acreate_message(
+            "ClaudeDetailHtmlGenerator",
+            "detail_html",
+            **_detail_html_request(product_name, features, value_proposition, target_audience, competitor_structure)
+        )
+        return _parse_detail_html(message)
 
     except Exception as e:
         print(f"Claude HTML 생성 오류: {e}")
+        LLM_FALLBACKS.inc(provider="anthropic", target="mock")
         return _get_mock_html(product_name, features)
 
 
+async def generate_page_copy_async(
+    product_name: str,
+    golden_keywords: List[str],
+    competitor_patterns: Dict[str, Any],
+    features: List[str],
+    value_proposition: str,
+    target_audience: str,
+    competitor_structure: Dict[str, Any],
+    max_length: int = 50
+) -> Dict[str, Any]:
+    """제목 + 상세페이지 HTML 동시 생성 (소요 시간 = 두 호출 중 긴 쪽, 실패한 쪽만 mock 데이터)"""
+    titles, html = await asyncio.gather(
+        generate_product_titles_async(product_name, golden_keywords, competitor_patterns, max_length),
+        generate_detail_html_async(product_name, features, value_proposition, target_audience, competitor_structure)
+    )
+    return {"titles": titles, "detail_html": html}
+
+
+@tool("Claude Page Copy Generator")
+def generate_page_copy(
+    product_name: str,
+    golden_keywords: List[str],
+    competitor_patterns: Dict[str, Any],
+    features: List[str],
+    value_proposition: str,
+    target_audience: str,
+    competitor_structure: Dict[str, Any],
+    max_length: int = 50
+) -> Dict[str, Any]:
+    """
+    Claude를 사용하여 상품 제목 3가지와 상세페이지 HTML을 동시에 생성합니다.
+    (Claude Title Generator + Claude Detail HTML Generator를 차례로 호출하는 것보다 빠름)
+
+    Args:
+        product_name: 상품명
+        golden_keywords: 황금키워드 리스트
+        competitor_patterns: 경쟁사 제목 패턴 분석 결과 (Claude Title Generator와 같은 형식)
+        features: 주요 특징 리스트
+        value_proposition: 핵심 가치 제안
+        target_audience: 타겟 고객
+        competitor_structure: 경쟁사 상세페이지 구조 (Claude Detail HTML Generator와 같은 형식)
+        max_length: 제목 최대 글자 수 (기본 50자)
+
+    Returns:
+        {
+            'titles': [{'text': ..., 'length': ..., 'keywords_used': [...], 'score': ...}, ...],
+            'detail_html': '<div>...</div>'
+        }
+    """
+    return _run_on_claude_loop(generate_page_copy_async(
+        product_name, golden_keywords, competitor_patterns,
+        features, value_proposition, target_audience, competitor_structure, max_length
+    ))
+
+
 @tool("Claude Feedback Parser")
 def parse_user_feedback(feedback_text: str) -> Dict[str, Any]:
     """
@@ -276,8 +605,9 @@ JSON 형식으로 반환:
 반드시 JSON 형식으로만 응답하세요.
 """
 
-        message = claude_client.messages.create(
-            model=CLAUDE_MODEL,
+        message = _create_message(
+            "ClaudeFeedbackParser",
+            "feedback_parsing",
             max_tokens=512,
             temperature=0.3,
             messages=[
@@ -300,6 +630,7 @@ JSON 형식으로 반환:
 
     except Exception as e:
         print(f"Claude 피드백 파싱 오류: {e}")
+        LLM_FALLBACKS.inc(provider="anthropic", target="mock")
         return _get_mock_feedback_parse(feedback_text)
 
 
@@ -1,12 +1,14 @@
 from crewai import Tool
 from utils.vector_db import safety_db
+from utils.metrics import SAFETY_CHECK_SECONDS
 
 def check_keyword_safety(keyword: str):
     """
     Checks if a keyword is safe to use by comparing it against a database of banned trademarks and keywords.
     Returns a JSON string with safety status and reason.
     """
-    result = safety_db.check_safety(keyword)
+    with SAFETY_CHECK_SECONDS.time():
+        result = safety_db.check_safety(keyword)
     if result["is_safe"]:
         return f"✅ Safe: '{keyword}' seems safe to use. (Similarity: {result.get('score', 0):.2f})"
     else:
@@ -0,0 +1,438 @@
+"""
+Serper.dev 웹 검색 클라이언트
+- requests.Session + 커넥션 풀 (keep-alive 재사용), 요청 타임아웃
+- 정규화한 검색어 기준 캐시: 프로세스 내 LRU → Redis 또는 SQLite(디스크) → Serper API
+  같은/거의 같은 검색어("캠핑  의자", "캠핑 의자 ")는 같은 캐시 항목 사용
+- 응답은 에이전트가 쓰는 필드만 남겨 압축 (organic 상위 N개의 제목/링크/요약, answerBox, knowledgeGraph, 연관 검색어)
+- search_many: 검색어 여러 개를 httpx 비동기 클라이언트로 동시 검색 (동시 요청 수 제한)
+  비동기 클라이언트는 전용 이벤트 루프 스레드에서 계속 재사용 (호출마다 루프/연결을 새로 만들지 않음)
+  → 링크 기준 중복 제거 + 크기 제한한 요약 1개 반환 (에이전트의 think → tool → observe 반복 횟수 절감)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    REDIS_URL,
+    SERPER_API_KEY,
+    SERPER_API_URL,
+    SERPER_TIMEOUT,
+    SERPER_POOL_SIZE,
+    SERPER_CACHE_BACKEND,
+    SERPER_CACHE_TTL,
+    SERPER_CACHE_PATH,
+    SERPER_MEMORY_CACHE_SIZE,
+    SERPER_MAX_RESULTS,
+    SERPER_MULTI_CONCURRENCY,
+    SERPER_MULTI_MAX_QUERIES,
+    SERPER_MULTI_MAX_CHARS,
+)
+from utils.metrics import SEARCH_REQUESTS
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+    print("⚠️  httpx 패키지가 설치되지 않았습니다. 다중 검색을 순차 실행합니다.")
+    print("   pip install httpx")
+
+CACHE_KEY_PREFIX = "serper:"
+
+# 동기 호출부(CrewAI 툴)가 다중 검색을 실행하는 전용 이벤트 루프 (프로세스당 1개)
+_serper_loop: Optional[asyncio.AbstractEventLoop] = None
+_serper_loop_lock = threading.Lock()
+
+
+def _run_on_serper_loop(coro):
+    """
+    동기 코드에서 코루틴 실행 (전용 이벤트 루프 스레드 1개를 공유 → 호출 간 httpx 연결 풀 재사용)
+    task_id/크루 단계 contextvar는 호출 스레드의 값이 그대로 전달됨
+    """
+    global _serper_loop
+    with _serper_loop_lock:
+        if _serper_loop is None:
+            _serper_loop = asyncio.new_event_loop()
+            threading.Thread(target=_serper_loop.run_forever, name="serper-async", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _serper_loop).result()
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (유니코드 NFKC, 소문자, 공백 정리, 양끝 구두점 제거)"""
+    text = unicodedata.normalize("NFKC", query).lower()
+    return " ".join(text.split()).strip(" .,!?\"'")
+
+
+def cache_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    stamp = json.dumps({"q": normalize_query(query), **(params or {})}, sort_keys=True, ensure_ascii=False)
+    return CACHE_KEY_PREFIX + hashlib.sha1(stamp.encode("utf-8")).hexdigest()
+
+
+def compact_response(data: Dict[str, Any], max_results: int = SERPER_MAX_RESULTS) -> Dict[str, Any]:
+    """Serper 응답 → 에이전트가 실제로 쓰는 필드만 (sitelinks, 이미지, 날짜 등 제외)"""
+    compact: Dict[str, Any] = {}
+    if data.get("answerBox"):
+        box = data["answerBox"]
+        compact["answer"] = {name: box[name] for name in ("title", "answer", "snippet") if box.get(name)}
+    if data.get("knowledgeGraph"):
+        graph = data["knowledgeGraph"]
+        compact["knowledge"] = {name: graph[name] for name in ("title", "type", "description") if graph.get(name)}
+    compact["results"] = [
+        {name: item[name] for name in ("title", "link", "snippet") if item.get(name)}
+        for item in (data.get("organic") or [])[:max_results]
+    ]
+    questions = [item.get("question") for item in data.get("peopleAlsoAsk") or [] if item.get("question")]
+    if questions:
+        compact["questions"] = questions[:3]
+    related = [item.get("query") for item in data.get("relatedSearches") or [] if item.get("query")]
+    if related:
+        compact["related"] = related[:5]
+    return compact
+
+
+# ============================================
+# 캐시
+# ============================================
+
+class MemoryCache:
+    """프로세스 내 LRU + TTL (스레드 안전)"""
+
+    def __init__(self, max_size: int = SERPER_MEMORY_CACHE_SIZE, clock=time.monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self._items: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] <= self.clock():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._items[key] = (self.clock() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class RedisCache:
+    def __init__(self, redis_conn):
+        self.redis_conn = redis_conn
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.redis_conn.get(key)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: int):
+        self.redis_conn.set(key, value, ex=ttl)
+
+
+class DiskCache:
+    """SQLite 파일 캐시 (Redis 없는 로컬 개발/배치용, 프로세스 간 공유)"""
+
+    def __init__(self, path: str = SERPER_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS search_cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS search_cache_expires ON search_cache (expires_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM search_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+            # 만료된 검색 결과 정리 (파일이 계속 커지지 않도록)
+            self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+
+
+def build_cache(backend: str = SERPER_CACHE_BACKEND):
+    """SERPER_CACHE_BACKEND → 공유 캐시 (memory/none이면 None)"""
+    if backend == "redis":
+        from utils.backends import sync_redis
+        return RedisCache(sync_redis(REDIS_URL))
+    if backend == "disk":
+        return DiskCache()
+    return None
+
+
+# ============================================
+# 검색 클라이언트
+# ============================================
+
+class SerperClient:
+    """
+    캐시 + 커넥션 풀을 쓰는 Serper 검색 (프로세스당 1개 공유, get_serper_client)
+    공유 캐시(Redis/디스크) 오류는 캐시 미스로 처리하고 검색은 계속 진행
+    """
+
+    def __init__(self, api_key: Optional[str] = SERPER_API_KEY, url: str = SERPER_API_URL,
+                 session: Optional[requests.Session] = None, timeout: float = SERPER_TIMEOUT,
+                 shared_cache=None, memory_cache: Optional[MemoryCache] = None,
+                 ttl: int = SERPER_CACHE_TTL, max_results: int = SERPER_MAX_RESULTS,
+                 memory_cache_enabled: bool = SERPER_CACHE_BACKEND != "none",
+                 transport=None):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_results = max_results
+        self.shared_cache = shared_cache
+        self.memory_cache = memory_cache or (MemoryCache() if memory_cache_enabled else None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SERPER_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        # search_many용 httpx.AsyncClient (전용 루프에서 처음 쓸 때 생성, transport는 테스트용 MockTransport)
+        self.transport = transport
+        self._async_client = None
+
+    def _shared_get(self, key: str) -> Optional[str]:
+        try:
+            return self.shared_cache.get(key)
+        except Exception as e:
+            print(f"⚠️  검색 캐시 조회 오류: {e}")
+            return None
+
+    def _shared_set(self, key: str, value: str):
+        try:
+            self.shared_cache.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"⚠️  검색 캐시 저장 오류: {e}")
+
+    def _headers(self) -> Dict[str, str]:
+        return {"X-API-KEY": self.api_key or "", "Content-Type": "application/json"}
+
+    def _cached(self, key: str) -> Optional[str]:
+        if self.memory_cache is not None:
+            value = self.memory_cache.get(key)
+            if value is not None:
+                SEARCH_REQUESTS.inc(source="memory")
+                return value
+        if self.shared_cache is not None:
+            value = self._shared_get(key)
+            if value is not None:
+                SEARCH_REQUESTS.inc(source="cache")
+                if self.memory_cache is not None:
+                    self.memory_cache.set(key, value, self.ttl)
+                return value
+        return None
+
+    def _store(self, key: str, data: Dict[str, Any]) -> str:
+        SEARCH_REQUESTS.inc(source="api")
+        value = json.dumps(compact_response(data, self.max_results), ensure_ascii=False, separators=(",", ":"))
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, value, self.ttl)
+        if self.shared_cache is not None:
+            self._shared_set(key, value)
+        return value
+
+    def search_text(self, query: str, **params) -> str:
+        """
+        검색 결과를 압축 JSON 문자열로 반환 (에이전트 Tool 출력용)
+
+        Raises:
+            requests.RequestException: API 호출 실패 (캐시 미스일 때만)
+        """
+        key = cache_key(query, params)
+        value = self._cached(key)
+        if value is not None:
+            return value
+
+        try:
+            response = self.session.post(self.url, headers=self._headers(), json={"q": query, **params}, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            SEARCH_REQUESTS.inc(source="error")
+            raise
+        return self._store(key, response.json())
+
+    def search(self, query: str, **params) -> Dict[str, Any]:
+        return json.loads(self.search_text(query, **params))
+
+    def _client(self):
+        """전용 루프에서만 호출 (루프 스레드 1개라 동시 생성 경합 없음)"""
+        if self._async_client is None:
+            limits = httpx.Limits(max_connections=SERPER_POOL_SIZE, max_keepalive_connections=SERPER_POOL_SIZE)
+            self._async_client = httpx.AsyncClient(timeout=self.timeout, limits=limits, headers=self._headers(),
+                                                   transport=self.transport)
+        return self._async_client
+
+    async def _fetch_many(self, queries: List[str], concurrency: int) -> List[Any]:
+        """캐시 미스 검색어를 동시에 호출 (결과 또는 예외, 입력 순서)"""
+        semaphore = asyncio.Semaphore(concurrency)
+        client = self._client()
+
+        async def fetch(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                response = await client.post(self.url, json={"q": query})
+                response.raise_for_status()
+                return response.json()
+
+        return await asyncio.gather(*(fetch(query) for query in queries), return_exceptions=True)
+
+    def search_many(self, queries: List[str],
+                    concurrency: int = SERPER_MULTI_CONCURRENCY) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        여러 검색어 동시 검색 (정규화 기준 중복 검색어는 1번만 호출)
+
+        Returns:
+            [(검색어, 압축 결과 또는 None, 오류 메시지), ...] (중복 제거 후 입력 순서)
+        """
+        unique: "OrderedDict[str, str]" = OrderedDict()
+        for query in queries:
+            unique.setdefault(cache_key(query), query)
+
+        values: Dict[str, str] = {}
+        misses = []
+        for key in unique:
+            value = self._cached(key)
+            if value is None:
+                misses.append(key)
+            else:
+                values[key] = value
+
+        errors: Dict[str, str] = {}
+        if misses:
+            miss_queries = [unique[key] for key in misses]
+            if httpx is not None:
+                fetched = _run_on_serper_loop(self._fetch_many(miss_queries, max(concurrency, 1)))
+                for key, result in zip(misses, fetched):
+                    if isinstance(result, Exception):
+                        SEARCH_REQUESTS.inc(source="error")
+                        errors[key] = _error_message(result)
+                    else:
+                        values[key] = self._store(key, result)
+            else:
+                for key, query in zip(misses, miss_queries):
+                    try:
+                        values[key] = self.search_text(query)
+                    except requests.RequestException as e:
+                        errors[key] = str(e)
+
+        return [
+            (query, json.loads(values[key]) if key in values else None, errors.get(key))
+            for key, query in unique.items()
+        ]
+
+
+def _error_message(error: Exception) -> str:
+    """요약에 넣을 짧은 오류 메시지 (httpx 기본 메시지는 안내 URL까지 포함해 김)"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        return f"HTTP {response.status_code}"
+    return f"{type(error).__name__}: {error}"[:200]
+
+
+def _link_key(link: str) -> str:
+    """중복 판정용 링크 (scheme, www, 끝 슬래시, fragment 무시)"""
+    link = link.split("#", 1)[0].rstrip("/")
+    for prefix in ("https://", "http://"):
+        if link.startswith(prefix):
+            link = link[len(prefix):]
+    return link[4:] if link.startswith("www.") else link
+
+
+def build_digest(results: List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]],
+                 max_chars: int = SERPER_MULTI_MAX_CHARS) -> str:
+    """
+    다중 검색 결과 → 하나의 요약 JSON
+    - 검색 결과는 검색어별 순위를 번갈아 가며 모아서(1위들 → 2위들 → ...) 링크 기준 중복 제거
+    - 크기 제한을 넘으면 뒤쪽(낮은 순위) 결과부터 제외
+    """
+    digest: Dict[str, Any] = {"queries": {}, "results": [], "related": []}
+    rankings = []
+    for query, compact, error in results:
+        summary: Dict[str, Any] = {}
+        if error:
+            summary["error"] = error
+        elif compact:
+            summary.update({name: compact[name] for name in ("answer", "knowledge", "questions") if compact.get(name)})
+            rankings.append((query, compact.get("results") or []))
+            for related in compact.get("related") or []:
+                if related not in digest["related"]:
+                    digest["related"].append(related)
+        digest["queries"][query] = summary
+
+    merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    for rank in range(max((len(items) for _, items in rankings), default=0)):
+        for query, items in rankings:
+            if rank >= len(items):
+                continue
+            item = items[rank]
+            key = _link_key(item.get("link") or item.get("title") or "")
+            if key in merged:
+                merged[key]["queries"].append(query)
+            else:
+                merged[key] = {**item, "queries": [query]}
+    digest["results"] = list(merged.values())
+
+    text = json.dumps(digest, ensure_ascii=False, separators=(",", ":"))
+    while len(text) > max_chars and (digest["results"] or digest["related"]):
+        if digest["results"]:
+            digest["results"].pop()
+        else:
+            digest["related"].pop()
+        digest["truncated"] = True
+        text = json.dumps(digest, ensure_ascii=False, separators=(",", ":"))
+    return text
+
+
+def parse_queries(text: str, limit: int = SERPER_MULTI_MAX_QUERIES) -> List[str]:
+    """Tool 입력 → 검색어 목록 (JSON 배열, 또는 줄바꿈/세미콜론/| 구분)"""
+    text = text.strip()
+    queries: List[str] = []
+    if text.startswith("["):
+        try:
+            queries = [str(query) for query in json.loads(text)]
+        except ValueError:
+            queries = []
+    if not queries:
+        for separator in ("\n", ";", "|"):
+            text = text.replace(separator, "\n")
+        queries = text.split("\n")
+    return [query.strip() for query in queries if query.strip()][:limit]
+
+
+_client: Optional[SerperClient] = None
+_client_lock = threading.Lock()
+
+
+def get_serper_client() -> SerperClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SerperClient(shared_cache=build_cache())
+    return _client
@@ -11,6 +11,14 @@ from PIL import Image
 import requests
 from io import BytesIO
 
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.llm_instrumentation import instrument_llm_call
+from utils.model_router import get_model_router
+from utils.resilience import request_timeout, call_deadline, time_left, resilient_call
+from utils.metrics import LLM_FALLBACKS
+from config import IMAGE_DOWNLOAD_TIMEOUT
+
 
 # Gemini API 초기화
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -42,12 +50,9 @@ def analyze_product_image(image_url: str) -> Dict[str, Any]:
 
     try:
         # 이미지 다운로드
-        response = requests.get(image_url)
+        response = requests.get(image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
         image = Image.open(BytesIO(response.content))
 
-        # Gemini Vision 모델 호출
-        model = genai.GenerativeModel('gemini-1.5-flash')
-
         prompt = """
         이 상품 이미지를 분석하여 다음 정보를 JSON 형식으로 추출해주세요:
 
@@ -61,7 +66,24 @@ def analyze_product_image(image_url: str) -> Dict[str, Any]:
         반드시 JSON 형식으로만 응답하세요.
         """
 
-        response = model.generate_content([prompt, image])
+        # Gemini Vision 모델 호출 (모델 라우터 fast 등급, 타임아웃이면 quality 모델로 재시도)
+        # 요청 타임아웃 + 서킷 브레이커 (+ LLM_HEDGING이면 p95 지연 후 헤지 요청)
+        def generate(model_name: str):
+            def call_model():
+                timeout = request_timeout("google")
+                with instrument_llm_call("google", "GeminiVisionAnalyzer", model_name) as call:
+                    result = genai.GenerativeModel(model_name).generate_content(
+                        [prompt, image], request_options={"timeout": timeout}
+                    )
+                    usage = getattr(result, "usage_metadata", None)
+                    call["input_tokens"] = getattr(usage, "prompt_token_count", None)
+                    call["output_tokens"] = getattr(usage, "candidates_token_count", None)
+                return result
+
+            return resilient_call("google", model_name, call_model)
+
+        with call_deadline():
+            response = get_model_router().call("google", "vision_analysis", generate, deadline=time_left())
         result_text = response.text
 
         # JSON 파싱
@@ -80,6 +102,7 @@ def analyze_product_image(image_url: str) -> Dict[str, Any]:
 
     except Exception as e:
         print(f"Gemini Vision 오류: {e}")
+        LLM_FALLBACKS.inc(provider="google", target="mock")
         return _get_mock_vision_data(image_url)
 
 
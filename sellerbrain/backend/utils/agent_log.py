@@ -0,0 +1,286 @@
+"""
+에이전트 실행 로그(AgentLog) 저장 + 시간별 롤업
+- 워커/툴은 AgentLog를 버퍼에 쌓기만 하고, AGENT_LOG_FLUSH_SIZE건 / AGENT_LOG_FLUSH_INTERVAL초마다 insert_many로 일괄 저장
+- agent_logs는 MongoDB time-series 컬렉션 (timeField=started_at, metaField=agent_name, 미지원 서버면 일반 컬렉션)
+- rollup_agent_logs(): 최근 N시간 로그를 (에이전트, 모델, 시간) 단위로 집계해 agent_log_rollups에 upsert (Celery beat)
+  → 대시보드(/stats/agents)는 원본 로그를 집계하지 않고 롤업 문서만 읽음
+"""
+
+import atexit
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pymongo import ReplaceOne
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import AGENT_LOG_FLUSH_SIZE, AGENT_LOG_FLUSH_INTERVAL, AGENT_LOG_ROLLUP_LOOKBACK_HOURS
+from models import AgentLog
+from utils.repository import AGENT_LOGS, AGENT_LOG_ROLLUPS, SyncRepository
+
+# 현재 실행 중인 Celery task ID (툴에서 task_id를 넘기지 않아도 로그에 연결되도록)
+_current_task_id: ContextVar[Optional[str]] = ContextVar("agent_log_task_id", default=None)
+
+# 저장 실패 시 버퍼에 보관할 최대 로그 수 (초과분은 오래된 것부터 버림)
+MAX_BUFFERED_LOGS = 10000
+
+
+def set_current_task(task_id: Optional[str]):
+    return _current_task_id.set(task_id)
+
+
+def reset_current_task(token):
+    _current_task_id.reset(token)
+
+
+def current_task_id() -> Optional[str]:
+    return _current_task_id.get()
+
+
+def _default_db():
+    from utils.backends import mongo_client
+    return mongo_client().ai_marketing
+
+
+# ============================================
+# 버퍼 기반 로그 저장
+# ============================================
+
+class AgentLogWriter:
+    """AgentLog 일괄 저장기 (프로세스당 1개, 스레드 안전)"""
+
+    def __init__(self, db_factory: Callable[[], Any] = _default_db,
+                 flush_size: int = AGENT_LOG_FLUSH_SIZE,
+                 flush_interval: float = AGENT_LOG_FLUSH_INTERVAL):
+        self.db_factory = db_factory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._repository: Optional[SyncRepository] = None
+        self._buffer: List[AgentLog] = []
+        self._last_flush = time.monotonic()
+        self._lock = Lock()
+
+    def configure(self, db_factory: Callable[[], Any]):
+        """워커의 MongoClient를 공유하도록 DB 생성 함수 교체"""
+        with self._lock:
+            self.db_factory = db_factory
+            self._repository = None
+
+    def record(self, log: AgentLog):
+        with self._lock:
+            self._buffer.append(log)
+            due = (len(self._buffer) >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """버퍼의 로그를 저장하고 저장한 건수 반환 (실패 시 다음 flush에서 재시도)"""
+        with self._lock:
+            logs, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not logs:
+            return 0
+        # DB 왕복 중에도 다른 스레드의 record()가 막히지 않도록 락 밖에서 저장
+        try:
+            if self._repository is None:
+                self._repository = SyncRepository(self.db_factory(), AgentLog)
+            return self._repository.insert_many(logs)
+        except Exception as e:
+            print(f"⚠️  AgentLog 저장 실패 ({len(logs)}건 보관): {e}")
+            with self._lock:
+                self._buffer = (logs + self._buffer)[-MAX_BUFFERED_LOGS:]
+            return 0
+
+
+_writer = AgentLogWriter()
+atexit.register(_writer.flush)
+
+
+def get_agent_log_writer() -> AgentLogWriter:
+    return _writer
+
+
+def record_agent_run(agent_name: str, seconds: float, model: Optional[str] = None,
+                     status: str = "completed", error: Optional[str] = None,
+                     llm_calls: int = 0, tokens_used: Optional[int] = None, cost_usd: Optional[float] = None,
+                     task_id: Optional[str] = None, input_data: Optional[Dict[str, Any]] = None,
+                     output_data: Optional[Dict[str, Any]] = None, retries: int = 0,
+                     kind: str = "stage") -> AgentLog:
+    """끝난 실행 1건 기록 (completed_at = 지금, started_at = 지금 - seconds)"""
+    completed_at = datetime.now()
+    log = AgentLog(
+        agent_name=agent_name,
+        model=model,
+        task_id=task_id or current_task_id() or "local",
+        started_at=completed_at - timedelta(seconds=seconds),
+        completed_at=completed_at,
+        input_data=input_data or {},
+        output_data=output_data,
+        status=status,
+        error=error,
+        execution_time_seconds=seconds,
+        llm_calls=llm_calls,
+        tokens_used=tokens_used,
+        cost_usd=cost_usd,
+        retries=retries,
+        kind=kind
+    )
+    _writer.record(log)
+    return log
+
+
+def log_llm_call(agent_name: str, model: str, seconds: float,
+                 input_tokens: Optional[int] = None, output_tokens: Optional[int] = None,
+                 error: Optional[str] = None, cost_usd: Optional[float] = None,
+                 retries: int = 0, input_data: Optional[Dict[str, Any]] = None) -> AgentLog:
+    """툴에서 LLM 호출 1건 기록 (kind=llm_call: 감싸는 단계 기록과 시간이 겹치므로 시간 비중 계산에서 제외)"""
+    tokens = (input_tokens or 0) + (output_tokens or 0)
+    return record_agent_run(
+        agent_name, seconds, model=model,
+        status="failed" if error else "completed", error=error,
+        llm_calls=1, tokens_used=tokens or None, cost_usd=cost_usd,
+        input_data=input_data, retries=retries, kind="llm_call"
+    )
+
+
+@contextmanager
+def track_agent(agent_name: str, model: Optional[str] = None, input_data: Optional[Dict[str, Any]] = None):
+    """
+    with 블록 실행 시간을 AgentLog로 기록 (예외 발생 시 failed)
+
+    사용 예:
+        with track_agent("ContentCreator", model=CLAUDE_MODEL) as run:
+            ...
+            run["tokens_used"] = 1200
+    """
+    run: Dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        yield run
+    except Exception as e:
+        record_agent_run(agent_name, time.perf_counter() - started, model=model, status="failed",
+                         error=str(e), input_data=input_data, **run)
+        raise
+    record_agent_run(agent_name, time.perf_counter() - started, model=model, input_data=input_data, **run)
+
+
+# ============================================
+# 시간별 롤업
+# ============================================
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank 백분위수 (sorted_values는 오름차순)"""
+    if not sorted_values:
+        return 0.0
+    rank = min(max(math.ceil(q * len(sorted_values)), 1), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+def hour_of(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_id(agent_name: str, model: str, hour: datetime, kind: str = "stage") -> str:
+    suffix = "" if kind == "stage" else f"|{kind}"
+    return f"{agent_name}|{model}|{hour:%Y-%m-%dT%H}{suffix}"
+
+
+def build_rollups(logs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    로그 문서 → (에이전트, 모델, 시간, 종류)별 롤업 문서
+
+    Returns:
+        [{_id, agent_name, model, hour, kind, count, failed, total_seconds, p50_seconds, p95_seconds,
+          llm_calls, tokens, cost_usd, retries}, ...]
+    """
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for log in logs:
+        key = (log["agent_name"], log.get("model") or "unknown", hour_of(log["started_at"]), log.get("kind") or "stage")
+        group = groups.setdefault(key, {"durations": [], "count": 0, "failed": 0, "llm_calls": 0, "tokens": 0, "cost_usd": 0.0, "retries": 0})
+        if log.get("execution_time_seconds") is not None:
+            group["durations"].append(log["execution_time_seconds"])
+        if log.get("status") == "failed":
+            group["failed"] += 1
+        group["llm_calls"] += log.get("llm_calls") or 0
+        group["tokens"] += log.get("tokens_used") or 0
+        group["cost_usd"] += log.get("cost_usd") or 0.0
+        group["retries"] += log.get("retries") or 0
+        group["count"] += 1
+
+    rollups = []
+    for (agent_name, model, hour, kind), group in groups.items():
+        durations = sorted(group["durations"])
+        rollups.append({
+            "_id": rollup_id(agent_name, model, hour, kind),
+            "agent_name": agent_name,
+            "model": model,
+            "hour": hour,
+            "kind": kind,
+            "count": group["count"],
+            "failed": group["failed"],
+            "total_seconds": sum(durations),
+            "p50_seconds": percentile(durations, 0.50),
+            "p95_seconds": percentile(durations, 0.95),
+            "llm_calls": group["llm_calls"],
+            "tokens": group["tokens"],
+            "cost_usd": round(group["cost_usd"], 6),
+            "retries": group["retries"],
+        })
+    return rollups
+
+
+def rollup_agent_logs(db, lookback_hours: int = AGENT_LOG_ROLLUP_LOOKBACK_HOURS, now: Optional[datetime] = None) -> int:
+    """
+    최근 lookback_hours 시간 구간을 다시 집계해서 롤업 upsert (같은 구간을 여러 번 돌려도 결과 동일)
+
+    Returns:
+        upsert한 롤업 문서 수
+    """
+    since = hour_of(now or datetime.now()) - timedelta(hours=max(lookback_hours, 1) - 1)
+    logs = db[AGENT_LOGS.name].find(
+        {"started_at": {"$gte": since}},
+        {"agent_name": 1, "model": 1, "started_at": 1, "execution_time_seconds": 1,
+         "status": 1, "llm_calls": 1, "tokens_used": 1, "cost_usd": 1, "retries": 1, "kind": 1}
+    )
+    rollups = build_rollups(logs)
+    if rollups:
+        db[AGENT_LOG_ROLLUPS.name].bulk_write(
+            [ReplaceOne({"_id": rollup["_id"]}, rollup, upsert=True) for rollup in rollups],
+            ordered=False
+        )
+    return len(rollups)
+
+
+def summarize_rollups(rollups: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    시간별 롤업 → (에이전트, 모델, 종류)별 합계 (전체 소요 시간 비중 포함, 소요 시간 내림차순)
+    p95는 시간대별 p95 중 최댓값 (백분위수는 합칠 수 없으므로 보수적으로 표시)
+    시간 비중은 stage 행끼리만 계산 (llm_call 행의 시간은 이미 감싸는 단계 시간에 포함되어 있어 time_share=None)
+    """
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    for rollup in rollups:
+        kind = rollup.get("kind") or "stage"
+        key = (rollup["agent_name"], rollup["model"], kind)
+        total = totals.setdefault(key, {
+            "agent_name": rollup["agent_name"], "model": rollup["model"], "kind": kind,
+            "count": 0, "failed": 0, "total_seconds": 0.0, "p95_seconds_max": 0.0,
+            "llm_calls": 0, "tokens": 0, "cost_usd": 0.0, "retries": 0
+        })
+        for name in ("count", "failed", "total_seconds", "llm_calls", "tokens", "cost_usd", "retries"):
+            total[name] += rollup.get(name) or 0
+        total["p95_seconds_max"] = max(total["p95_seconds_max"], rollup.get("p95_seconds") or 0.0)
+
+    grand_total = sum(total["total_seconds"] for total in totals.values() if total["kind"] == "stage") or 1.0
+    summary = sorted(totals.values(), key=lambda total: total["total_seconds"], reverse=True)
+    for total in summary:
+        total["avg_seconds"] = total["total_seconds"] / total["count"] if total["count"] else 0.0
+        total["time_share"] = round(total["total_seconds"] / grand_total, 4) if total["kind"] == "stage" else None
+        total["cost_usd"] = round(total["cost_usd"], 6)
+    return summary
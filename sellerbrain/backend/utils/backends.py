@@ -0,0 +1,166 @@
+"""
+외부 서비스 백엔드 선택 (MongoDB / Redis / Celery)
+- BACKEND_MODE=services (기본): 실제 MongoDB, Redis, Celery 브로커 사용
+- BACKEND_MODE=memory: 한 프로세스 안에서 전체 파이프라인 실행 (부하 테스트/벤치마크용)
+    MongoDB → mongomock (API의 Motor 인터페이스와 워커의 PyMongo 인터페이스가 같은 저장소 공유)
+    Redis   → fakeredis (동기/비동기 클라이언트가 같은 FakeServer 공유, Pub/Sub 포함)
+    Celery  → CELERY_EXECUTION=threads: 워커 스레드 풀 / eager: 발행한 스레드에서 바로 실행
+- memory 모드 패키지: pip install mongomock mongomock-motor fakeredis
+"""
+
+import os
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BACKEND_MODE, CELERY_EXECUTION, IN_PROCESS_WORKER_CONCURRENCY, MONGO_URL, REDIS_URL
+
+MEMORY_MODE = BACKEND_MODE == "memory"
+
+_lock = Lock()
+_memory_mongo = None
+_memory_redis_server = None
+
+
+def _require_memory_packages():
+    try:
+        import mongomock  # noqa: F401
+        import mongomock_motor  # noqa: F401
+        import fakeredis  # noqa: F401
+    except ImportError:
+        print("⚠️  BACKEND_MODE=memory에 필요한 패키지가 설치되지 않았습니다.")
+        print("   pip install mongomock mongomock-motor fakeredis")
+        raise
+
+
+def _shared_mongo():
+    global _memory_mongo
+    with _lock:
+        if _memory_mongo is None:
+            _require_memory_packages()
+            import mongomock
+            _memory_mongo = mongomock.MongoClient()
+        return _memory_mongo
+
+
+def _shared_redis_server():
+    global _memory_redis_server
+    with _lock:
+        if _memory_redis_server is None:
+            _require_memory_packages()
+            import fakeredis
+            _memory_redis_server = fakeredis.FakeServer()
+        return _memory_redis_server
+
+
+# ============================================
+# MongoDB
+# ============================================
+
+def mongo_client(url: str = MONGO_URL):
+    """PyMongo 클라이언트 (Celery 워커/스크립트용)"""
+    if MEMORY_MODE:
+        return _shared_mongo()
+    from pymongo import MongoClient
+    return MongoClient(url)
+
+
+def async_mongo_client(url: str = MONGO_URL):
+    """Motor 클라이언트 (FastAPI용)"""
+    if MEMORY_MODE:
+        import mongomock_motor
+        return mongomock_motor.AsyncMongoMockClient(mock_mongo_client=_shared_mongo())
+    from motor.motor_asyncio import AsyncIOMotorClient
+    return AsyncIOMotorClient(url)
+
+
+# ============================================
+# Redis
+# ============================================
+
+def sync_redis(url: str = REDIS_URL):
+    if MEMORY_MODE:
+        import fakeredis
+        return fakeredis.FakeRedis(server=_shared_redis_server())
+    import redis
+    return redis.Redis.from_url(url)
+
+
+def async_redis(url: str = REDIS_URL):
+    if MEMORY_MODE:
+        import fakeredis.aioredis
+        return fakeredis.aioredis.FakeRedis(server=_shared_redis_server())
+    import redis.asyncio
+    return redis.asyncio.from_url(url)
+
+
+# ============================================
+# Celery (브로커 없이 실행)
+# ============================================
+
+class LocalTaskResult:
+    """send_task 반환값 대용 (id만 사용)"""
+
+    def __init__(self, task_id: str, future=None):
+        self.id = task_id
+        self.future = future
+
+
+class LocalTaskRunner:
+    """
+    워커 모듈의 Celery 태스크를 같은 프로세스에서 실행
+    - threads: concurrency개 스레드가 워커 슬롯 역할 (대기열 길이 = 아직 시작 안 한 작업 수)
+    - eager: send_task 호출 스레드에서 바로 실행
+    """
+
+    def __init__(self, concurrency: int = IN_PROCESS_WORKER_CONCURRENCY, eager: bool = False):
+        self.concurrency = concurrency
+        self.eager = eager
+        self.executor = None if eager else ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="local-worker"
+        )
+        self._pending = 0
+        self._lock = Lock()
+
+    def _task(self, name: str):
+        # 워커 모듈은 처음 실행할 때 import (API 프로세스 시작 비용/순환 import 방지)
+        import worker
+        return worker.celery_app.tasks[name]
+
+    def _run(self, name: str, args: List[Any], task_id: str):
+        with self._lock:
+            self._pending -= 1
+        return self._task(name).apply(args=args, task_id=task_id).get(propagate=False)
+
+    def send_task(self, name: str, args: Optional[List[Any]] = None, **kwargs) -> LocalTaskResult:
+        task_id = str(uuid.uuid4())
+        args = list(args or [])
+        with self._lock:
+            self._pending += 1
+        if self.eager:
+            self._run(name, args, task_id)
+            return LocalTaskResult(task_id)
+        return LocalTaskResult(task_id, self.executor.submit(self._run, name, args, task_id))
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def worker_slots(self) -> int:
+        return self.concurrency
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+
+def local_task_runner() -> Optional[LocalTaskRunner]:
+    """CELERY_EXECUTION 설정에 따른 로컬 실행기 (broker면 None → 실제 Celery 사용)"""
+    if CELERY_EXECUTION == "threads":
+        return LocalTaskRunner()
+    if CELERY_EXECUTION == "eager":
+        return LocalTaskRunner(concurrency=1, eager=True)
+    return None
@@ -0,0 +1,262 @@
+"""
+대용량 필드 별도 저장소 (Content-Addressed Blob Store)
+- GeneratedContent.detail_html, 크루 원본 출력(raw_output)처럼 큰 텍스트를 blobs 컬렉션에 분리 저장
+- 원본 bytes의 sha256을 _id로 사용 → 같은 내용은 한 번만 저장 (중복 제거)
+- zstd 압축 (zstandard 미설치 시 zlib으로 대체), 압축 방식은 문서에 함께 기록
+- 본 문서에는 "<필드>_ref" 참조만 남기고, 필요할 때 load()로 지연 로딩
+- 저장할 때마다 last_referenced_at 갱신, sweep_unreferenced()가 어떤 문서도 참조하지 않는 오래된 blob 삭제
+    (부모 문서가 TTL/정리로 지워져도 blob이 남지 않도록 Celery beat에서 주기 실행)
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from bson import Binary
+from pymongo import UpdateOne
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BLOB_INLINE_MAX_BYTES, BLOB_CACHE_SIZE, BLOB_GC_GRACE_HOURS
+
+try:
+    import zstandard
+except ImportError:
+    print("⚠️  zstandard 패키지가 설치되지 않았습니다. zlib 압축을 사용합니다.")
+    print("   pip install zstandard")
+    zstandard = None
+
+BLOBS_COLLECTION = "blobs"
+REF_SUFFIX = "_ref"
+
+# 정리 시 한 번에 삭제할 blob 수
+SWEEP_BATCH_SIZE = 1000
+
+# zstd 압축/해제 객체는 스레드 안전하지 않으므로 스레드마다 따로 생성
+_zstd = threading.local()
+
+
+def _zstd_compressor():
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstandard.ZstdCompressor(level=10)
+    return _zstd.compressor
+
+
+def _zstd_decompressor():
+    if not hasattr(_zstd, "decompressor"):
+        _zstd.decompressor = zstandard.ZstdDecompressor()
+    return _zstd.decompressor
+
+
+def ref_field(name: str) -> str:
+    return f"{name}{REF_SUFFIX}"
+
+
+def compress(data: bytes) -> Dict[str, Any]:
+    if zstandard is not None:
+        return {"codec": "zstd", "data": _zstd_compressor().compress(data)}
+    return {"codec": "zlib", "data": zlib.compress(data, 6)}
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd blob을 읽으려면 zstandard 패키지가 필요합니다")
+        return _zstd_decompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+def build_blob(text: str) -> Dict[str, Any]:
+    """blobs 컬렉션에 저장할 문서 생성"""
+    raw = text.encode("utf-8")
+    packed = compress(raw)
+    return {
+        "_id": hashlib.sha256(raw).hexdigest(),
+        "codec": packed["codec"],
+        "size": len(raw),
+        "data": Binary(packed["data"]),
+        "created_at": datetime.utcnow(),
+    }
+
+
+def should_externalize(value: Any, threshold: int = BLOB_INLINE_MAX_BYTES) -> bool:
+    return isinstance(value, str) and len(value.encode("utf-8")) > threshold
+
+
+def _upsert(blob: Dict[str, Any]) -> UpdateOne:
+    # 같은 키가 이미 있으면 내용은 다시 쓰지 않고 참조 시각만 갱신 (중복 제거, 정리 대상에서 제외)
+    return UpdateOne(
+        {"_id": blob["_id"]},
+        {"$setOnInsert": blob, "$set": {"last_referenced_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+class _LRUCache:
+    """압축 해제된 blob 캐시 (내용 기반 키라 값이 바뀌지 않으므로 무효화 불필요)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: str, value: str):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+_cache = _LRUCache(BLOB_CACHE_SIZE)
+
+
+def _decode(document: Dict[str, Any]) -> str:
+    return decompress(document["codec"], bytes(document["data"])).decode("utf-8")
+
+
+def externalize_fields(documents: Iterable[Dict[str, Any]], fields: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    문서들에서 큰 필드를 떼어내 "<필드>_ref"로 바꾸고, 저장할 blob 목록 반환 (문서는 제자리 수정)
+    """
+    blobs: Dict[str, Dict[str, Any]] = {}
+    for document in documents:
+        for name in fields:
+            value = document.get(name)
+            if not should_externalize(value):
+                continue
+            blob = build_blob(value)
+            blobs[blob["_id"]] = blob
+            document[ref_field(name)] = blob["_id"]
+            del document[name]
+            _cache.put(blob["_id"], value)
+    return list(blobs.values())
+
+
+class SyncBlobStore:
+    """PyMongo 기반 blob 저장소 (Celery 워커용)"""
+
+    def __init__(self, db):
+        self.collection = db[BLOBS_COLLECTION]
+
+    def put_many(self, blobs: List[Dict[str, Any]]):
+        if blobs:
+            self.collection.bulk_write([_upsert(blob) for blob in blobs], ordered=False)
+
+    def put(self, text: str) -> str:
+        blob = build_blob(text)
+        self.put_many([blob])
+        _cache.put(blob["_id"], text)
+        return blob["_id"]
+
+    def get(self, key: str) -> Optional[str]:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+        document = self.collection.find_one({"_id": key})
+        if document is None:
+            return None
+        text = _decode(document)
+        _cache.put(key, text)
+        return text
+
+
+class AsyncBlobStore:
+    """Motor 기반 blob 저장소 (FastAPI용)"""
+
+    def __init__(self, db):
+        self.collection = db[BLOBS_COLLECTION]
+
+    async def put_many(self, blobs: List[Dict[str, Any]]):
+        if blobs:
+            await self.collection.bulk_write([_upsert(blob) for blob in blobs], ordered=False)
+
+    async def put(self, text: str) -> str:
+        blob = build_blob(text)
+        await self.put_many([blob])
+        _cache.put(blob["_id"], text)
+        return blob["_id"]
+
+    async def get(self, key: str) -> Optional[str]:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+        document = await self.collection.find_one({"_id": key})
+        if document is None:
+            return None
+        text = _decode(document)
+        _cache.put(key, text)
+        return text
+
+
+# ============================================
+# 정리 (mark & sweep, PyMongo)
+# ============================================
+
+def _field_value(document: Dict[str, Any], path: str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def referenced_blob_ids(db, sources: Dict[str, List[str]]) -> Set[str]:
+    """sources({컬렉션: [참조 필드 경로]})의 문서들이 참조하는 blob ID 전체"""
+    referenced: Set[str] = set()
+    for collection_name, paths in sources.items():
+        for path in paths:
+            for document in db[collection_name].find({path: {"$exists": True}}, {path: 1}):
+                value = _field_value(document, path)
+                if value:
+                    referenced.add(value)
+    return referenced
+
+
+def sweep_unreferenced(db, sources: Dict[str, List[str]], grace_hours: float = BLOB_GC_GRACE_HOURS,
+                       now: Optional[datetime] = None) -> int:
+    """
+    어떤 문서도 참조하지 않고 grace_hours 동안 다시 저장/참조되지 않은 blob 삭제
+
+    - 유예 시간은 blob 저장 → 부모 문서 저장 사이에 지워지는 것을 막음
+    - 삭제 조건에 시각을 다시 넣어서, 정리 중에 다시 저장(중복 제거)된 blob은 지우지 않음
+
+    Returns:
+        삭제된 blob 수
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(hours=grace_hours)
+    stale = {"$or": [
+        {"last_referenced_at": {"$lt": cutoff}},
+        {"last_referenced_at": {"$exists": False}, "created_at": {"$lt": cutoff}},
+    ]}
+    referenced = referenced_blob_ids(db, sources)
+    collection = db[BLOBS_COLLECTION]
+
+    deleted = 0
+    batch: List[str] = []
+    for document in collection.find(stale, {"_id": 1}):
+        if document["_id"] in referenced:
+            continue
+        batch.append(document["_id"])
+        if len(batch) >= SWEEP_BATCH_SIZE:
+            deleted += collection.delete_many({"_id": {"$in": batch}, **stale}).deleted_count
+            batch = []
+    if batch:
+        deleted += collection.delete_many({"_id": {"$in": batch}, **stale}).deleted_count
+    return deleted
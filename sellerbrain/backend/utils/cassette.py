@@ -0,0 +1,425 @@
+"""
+외부 API 녹화/재생 (cassette) - 오프라인에서 같은 결과/타이밍으로 파이프라인을 돌리기 위한 도구
+- record: 나가는 요청과 응답, 소요 시간을 JSONL 파일에 1줄씩 추가
+    · HTTP: requests(Serper, Apify), httpx(Claude SDK, Serper 다중 검색)
+    · LLM: LangChain 모델(ChatGoogleGenerativeAI, 전역 캐시 자리에 연결), Gemini GenerativeModel.generate_content
+- replay: 같은 요청에 녹화된 응답을 반환 (외부 호출 없음), 녹화된 소요 시간 x time_scale 만큼 대기 (0이면 대기 없음)
+- 요청 키: 종류 + 메서드 + URL(API 키 파라미터 제거) + 본문 해시 → 같은 키가 여러 번 녹화되면 녹화 순서대로 반환 (다 쓰면 마지막 응답 반복)
+- 재생 중 녹화에 없는 요청은 CassetteMiss (CI에서 실제 API를 부르지 않도록)
+
+사용 예:
+    with use_cassette("benchmarks/cassettes/sourcing.jsonl", "replay", time_scale=0):
+        create_sourcing_crew("캠핑 의자")
+워커는 CASSETTE_MODE=record/replay 설정 시 install_cassette()로 프로세스 전체에 적용
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CASSETTE_MODE, CASSETTE_PATH, CASSETTE_TIME_SCALE
+
+MODES = ("record", "replay")
+
+# 녹화 파일/키에 남기지 않을 쿼리 파라미터 (Gemini REST는 ?key=로 API 키 전달)
+SECRET_PARAMS = {"key", "api_key", "apikey", "token", "access_token"}
+
+# 녹화할 응답 헤더 (인증/쿠키/압축 헤더는 제외)
+RECORDED_HEADERS = ("content-type",)
+
+
+class CassetteMiss(RuntimeError):
+    """재생 모드에서 녹화에 없는 요청"""
+
+
+def normalize_url(url: str) -> str:
+    """비밀 파라미터 제거 + 쿼리 정렬"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def body_digest(body: Any) -> str:
+    """요청 본문 해시 (JSON이면 키 정렬 후 해시해서 직렬화 순서 차이 무시)"""
+    if body is None or body == b"" or body == "":
+        return ""
+    if isinstance(body, (bytes, bytearray)):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return hashlib.sha256(body).hexdigest()
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return hashlib.sha256(body.encode("utf-8")).hexdigest()
+    encoded = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def request_key(kind: str, method: str, target: str, body: Any = None) -> str:
+    raw = f"{kind} {method.upper()} {normalize_url(target)} {body_digest(body)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(data: Dict[str, Any]) -> bytes:
+    if "base64" in data:
+        return base64.b64decode(data["base64"])
+    return data.get("text", "").encode("utf-8")
+
+
+def _recorded_headers(headers) -> Dict[str, str]:
+    return {name: headers[name] for name in RECORDED_HEADERS if headers.get(name)}
+
+
+# ============================================
+# 카세트
+# ============================================
+
+class Cassette:
+    """녹화 파일 1개 (JSONL, 스레드 안전)"""
+
+    def __init__(self, path: str, mode: str = "replay", time_scale: float = 1.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode는 {MODES} 중 하나: {mode}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+        if mode == "replay":
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._interactions.setdefault(entry["key"], []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._interactions.values())
+
+    def record(self, kind: str, key: str, request: str, response: Any, elapsed: float):
+        """녹화 1건 추가 (바로 파일 뒤에 붙여 써서 프로세스가 죽어도 그때까지의 녹화는 남음, 새로 녹화하려면 파일 삭제)"""
+        entry = {"kind": kind, "key": key, "request": request, "response": response,
+                 "elapsed": round(elapsed, 6), "recorded_at": datetime.now().isoformat()}
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._interactions.setdefault(key, []).append(entry)
+            self.stats["recorded"] += 1
+
+    def lookup(self, kind: str, key: str, request: str) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                self.stats["missed"] += 1
+                raise CassetteMiss(f"녹화에 없는 요청 ({kind}): {request}")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.stats["replayed"] += 1
+            return entries[min(index, len(entries) - 1)]
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        return max(entry.get("elapsed", 0.0) * self.time_scale, 0.0)
+
+    def wait(self, entry: Dict[str, Any]):
+        """녹화된 소요 시간 x time_scale 만큼 대기"""
+        if self.delay(entry):
+            self._sleep(self.delay(entry))
+
+    def call(self, kind: str, key: str, request: str, perform: Callable[[], Any],
+             encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+        """record: perform() 결과를 encode해서 녹화 / replay: 녹화된 응답을 decode (녹화 지연 재현)"""
+        if self.mode == "replay":
+            entry = self.lookup(kind, key, request)
+            self.wait(entry)
+            return decode(entry["response"])
+        started = time.perf_counter()
+        result = perform()
+        self.record(kind, key, request, encode(result), time.perf_counter() - started)
+        return result
+
+    async def acall(self, kind: str, key: str, request: str, perform: Callable[[], Any],
+                    encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+        """call()의 async 버전 (perform은 코루틴 함수, 대기는 asyncio.sleep)"""
+        if self.mode == "replay":
+            entry = self.lookup(kind, key, request)
+            if self.delay(entry):
+                await asyncio.sleep(self.delay(entry))
+            return decode(entry["response"])
+        started = time.perf_counter()
+        result = await perform()
+        self.record(kind, key, request, encode(result), time.perf_counter() - started)
+        return result
+
+    def install(self) -> Callable[[], None]:
+        """
+        requests/httpx/LangChain/Gemini 호출 가로채기 (설치되지 않은 라이브러리는 건너뜀)
+
+        Returns:
+            원래대로 되돌리는 함수
+        """
+        restores = []
+        for patch in (_patch_requests, _patch_httpx, _patch_langchain, _patch_genai):
+            try:
+                restores.append(patch(self))
+            except ImportError:
+                continue
+
+        def restore():
+            for undo in reversed(restores):
+                undo()
+
+        return restore
+
+
+# ============================================
+# requests
+# ============================================
+
+def _patch_requests(cassette: Cassette):
+    import requests
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    original_send = requests.Session.send
+
+    def encode(response):
+        return {"status": response.status_code, "reason": response.reason,
+                "headers": _recorded_headers(response.headers), **_encode_body(response.content)}
+
+    def send(session, request, **kwargs):
+        def decode(data):
+            response = requests.Response()
+            response.status_code = data["status"]
+            response.reason = data.get("reason")
+            response.headers = CaseInsensitiveDict(data.get("headers", {}))
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = _decode_body(data)
+            response.url = request.url
+            response.request = request
+            return response
+
+        return cassette.call(
+            "http", request_key("http", request.method, request.url, request.body),
+            f"{request.method} {normalize_url(request.url)}",
+            perform=lambda: original_send(session, request, **kwargs),
+            encode=encode, decode=decode
+        )
+
+    requests.Session.send = send
+    return lambda: setattr(requests.Session, "send", original_send)
+
+
+# ============================================
+# httpx
+# ============================================
+
+def _patch_httpx(cassette: Cassette):
+    import httpx
+
+    original_send = httpx.Client.send
+    original_async_send = httpx.AsyncClient.send
+
+    def describe(request):
+        try:
+            body = request.content
+        except httpx.RequestNotRead:
+            body = request.read()
+        url = str(request.url)
+        return request_key("http", request.method, url, body), f"{request.method} {normalize_url(url)}"
+
+    def encode(response):
+        return {"status": response.status_code, "headers": _recorded_headers(response.headers),
+                **_encode_body(response.content)}
+
+    def decoder(request):
+        return lambda data: httpx.Response(data["status"], headers=data.get("headers", {}),
+                                           content=_decode_body(data), request=request)
+
+    def send(client, request, **kwargs):
+        key, label = describe(request)
+
+        def perform():
+            response = original_send(client, request, **kwargs)
+            response.read()
+            return response
+
+        return cassette.call("http", key, label, perform, encode, decoder(request))
+
+    async def async_send(client, request, **kwargs):
+        key, label = describe(request)
+
+        async def perform():
+            response = await original_async_send(client, request, **kwargs)
+            await response.aread()
+            return response
+
+        return await cassette.acall("http", key, label, perform, encode, decoder(request))
+
+    httpx.Client.send = send
+    httpx.AsyncClient.send = async_send
+
+    def restore():
+        httpx.Client.send = original_send
+        httpx.AsyncClient.send = original_async_send
+
+    return restore
+
+
+# ============================================
+# LangChain (ChatGoogleGenerativeAI 등, gRPC라 HTTP 단계에서는 못 잡음)
+# ============================================
+
+def _patch_langchain(cassette: Cassette):
+    from langchain_core.caches import BaseCache
+    from langchain_core.globals import get_llm_cache, set_llm_cache
+    from langchain_core.load import dumps as lc_dumps, loads as lc_loads
+    from utils.llm_cache import parse_llm_string
+
+    class CassetteLLMCache(BaseCache):
+        """
+        LangChain 전역 캐시 자리에 연결
+        record: lookup(호출 직전) ~ update(호출 직후) 사이 시간을 소요 시간으로 녹화
+        replay: lookup에서 녹화된 generations 반환 → 모델 호출 없음
+        """
+
+        def __init__(self):
+            self._started: Dict[tuple, float] = {}
+
+        @staticmethod
+        def _key(prompt, llm_string):
+            model, _ = parse_llm_string(llm_string)
+            return request_key("langchain", "GENERATE", model, [prompt, llm_string]), model
+
+        def lookup(self, prompt, llm_string):
+            key, model = self._key(prompt, llm_string)
+            if cassette.mode == "record":
+                self._started[(threading.get_ident(), key)] = time.perf_counter()
+                return None
+            entry = cassette.lookup("langchain", key, model)
+            cassette.wait(entry)
+            return lc_loads(entry["response"])
+
+        def update(self, prompt, llm_string, return_val):
+            key, model = self._key(prompt, llm_string)
+            started = self._started.pop((threading.get_ident(), key), time.perf_counter())
+            cassette.record("langchain", key, model, lc_dumps(return_val), time.perf_counter() - started)
+
+        def clear(self, **kwargs):
+            self._started.clear()
+
+    previous = get_llm_cache()
+    set_llm_cache(CassetteLLMCache())
+    return lambda: set_llm_cache(previous)
+
+
+# ============================================
+# Gemini SDK (Vision 툴)
+# ============================================
+
+def _genai_parts(contents) -> List[str]:
+    """generate_content 입력 → 키 계산용 목록 (이미지는 픽셀 해시)"""
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    described = []
+    for part in parts:
+        if hasattr(part, "tobytes"):
+            described.append(hashlib.sha256(part.tobytes()).hexdigest())
+        else:
+            described.append(str(part))
+    return described
+
+
+def _encode_genai_response(response) -> Dict[str, Any]:
+    try:
+        text = response.text
+    except ValueError:  # 안전 필터로 후보가 없으면 .text가 ValueError
+        text = None
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "text": text,
+        "usage": {name: getattr(usage, name, None)
+                  for name in ("prompt_token_count", "candidates_token_count", "total_token_count")},
+    }
+
+
+def _decode_genai_response(data: Dict[str, Any]):
+    """툴이 쓰는 .text / .usage_metadata만 제공"""
+    return SimpleNamespace(text=data["text"], usage_metadata=SimpleNamespace(**data["usage"]))
+
+
+def _patch_genai(cassette: Cassette):
+    import google.generativeai as genai
+
+    original_generate = genai.GenerativeModel.generate_content
+
+    def generate_content(model, contents, *args, **kwargs):
+        model_name = getattr(model, "model_name", "gemini")
+        return cassette.call(
+            "genai", request_key("genai", "GENERATE", model_name, _genai_parts(contents)), model_name,
+            perform=lambda: original_generate(model, contents, *args, **kwargs),
+            encode=_encode_genai_response, decode=_decode_genai_response
+        )
+
+    genai.GenerativeModel.generate_content = generate_content
+    return lambda: setattr(genai.GenerativeModel, "generate_content", original_generate)
+
+
+# ============================================
+# 진입점
+# ============================================
+
+@contextmanager
+def use_cassette(path: str, mode: str = "replay", time_scale: float = 1.0):
+    """with 블록 안의 외부 호출을 녹화/재생"""
+    cassette = Cassette(path, mode, time_scale)
+    restore = cassette.install()
+    try:
+        yield cassette
+    finally:
+        restore()
+
+
+_active: Optional[Cassette] = None
+_active_lock = threading.Lock()
+
+
+def install_cassette(mode: str = CASSETTE_MODE, path: str = CASSETTE_PATH,
+                     time_scale: float = CASSETTE_TIME_SCALE) -> Optional[Cassette]:
+    """CASSETTE_MODE가 record/replay면 프로세스 전체에 적용 (워커 시작 시 1번, off면 None)"""
+    global _active
+    if mode not in MODES:
+        return None
+    with _active_lock:
+        if _active is None:
+            _active = Cassette(path, mode, time_scale)
+            _active.install()
+            print(f"📼 외부 API {mode} 모드: {path} (time_scale={time_scale})")
+    return _active
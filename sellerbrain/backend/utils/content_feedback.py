@@ -0,0 +1,58 @@
+"""
+HITL 피드백 반영
+- 피드백으로 재생성된 필드를 GeneratedContent에 저장하고 revision을 기록
+- 첫 피드백 전에 원본을 revision 0으로 남겨서 언제든 생성 직후 상태로 되돌릴 수 있음
+- FeedbackHistory.revision ↔ content_revisions.feedback_id 로 양방향 추적
+"""
+
+import os
+import sys
+from typing import Any, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models import GeneratedContent, FeedbackHistory, ParsedFeedback
+from utils.repository import SyncRepository
+from utils.revisions import RevisionStore, snapshot_of
+
+
+def apply_feedback(
+    db,
+    content_id: str,
+    user_feedback: str,
+    parsed: ParsedFeedback,
+    changes: Dict[str, Any],
+    redis_conn=None
+) -> Optional[FeedbackHistory]:
+    """
+    재생성 결과 저장 + revision 기록
+
+    Args:
+        db: PyMongo Database
+        content_id: GeneratedContent ID
+        user_feedback: 자연어 피드백 원문
+        parsed: 파싱된 피드백
+        changes: 재생성된 필드 (예: {"titles": [...]}), 승인/거부처럼 바뀐 게 없으면 빈 dict
+        redis_conn: HTTP 캐시 버전 갱신용 Redis (선택)
+
+    Returns:
+        저장된 FeedbackHistory (콘텐츠가 없으면 None)
+    """
+    contents = SyncRepository(db, GeneratedContent, redis_conn)
+    content = contents.get(content_id)
+    if content is None:
+        return None
+    contents.load_blob(content, "detail_html")
+
+    store = RevisionStore(db)
+    if store.latest(content_id) is None:
+        store.record(content_id, snapshot_of(content))
+
+    feedback = FeedbackHistory(content_id=content_id, user_feedback=user_feedback, parsed_action=parsed)
+    if changes:
+        updated = GeneratedContent.model_validate({**content.model_dump(), **changes})
+        contents.update_fields(content_id, changes)
+        feedback.revision = store.record(content_id, snapshot_of(updated), feedback_id=feedback.id)
+        feedback.regenerated = True
+
+    SyncRepository(db, FeedbackHistory, redis_conn).insert_one(feedback)
+    return feedback
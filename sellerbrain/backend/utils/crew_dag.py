@@ -0,0 +1,101 @@
+"""
+CrewAI DAG 실행 보조 함수 (CREW_EXECUTION_MODE=dag)
+- 소싱 단계 결과에서 상위 키워드 추출 → 키워드별 경쟁사 분석을 스레드 풀에서 병렬 실행 → 보고서 병합
+- 경쟁사 분석 단계 소요 시간이 (키워드 수 x 1회 분석) → (가장 느린 1회 분석)으로 줄어듦
+"""
+
+import contextvars
+import re
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+
+# 번호 목록 항목 ("1. 키워드", "2) 키워드", 한 줄에 "1) A 2) B" 나열도 허용)
+_NUMBERED_ITEM = re.compile(r"(?:^|(?<=\s))\d{1,2}[.)]\s+(.+?)(?=\s+\d{1,2}[.)]\s|$)")
+
+# 글머리표 항목 ("- 키워드", "* 키워드", "• 키워드") - 번호 목록이 없을 때만 사용
+_BULLET_ITEM = re.compile(r"^[-*•]\s+(.+)$")
+
+# 마크다운 강조 ("**1. 키워드** - 설명" → "1. 키워드 - 설명")
+_EMPHASIS = re.compile(r"\*\*|__")
+
+# 항목에서 키워드 뒤에 붙는 설명 구분자
+_DETAIL_SEPARATOR = re.compile(r"\s*(?:[:：(（|]|\s[-–—]\s).*$")
+
+_DECORATION = "*\"'`「」『』[]"
+
+MAX_KEYWORD_LENGTH = 40
+
+
+def _list_items(text: str) -> List[str]:
+    """
+    최상위 목록 항목만 추출 (들여쓴 하위 항목 "   - 예상 검색량: ..."은 키워드가 아니므로 제외)
+    번호 목록이 있으면 번호 항목만, 없으면 글머리표 항목 사용
+    """
+    numbered: List[str] = []
+    bullets: List[str] = []
+    for line in text.splitlines():
+        if not line.strip() or line[0].isspace():
+            continue
+        line = _EMPHASIS.sub("", line).strip()
+        items = _NUMBERED_ITEM.findall(line)
+        if items:
+            numbered.extend(items)
+            continue
+        bullet = _BULLET_ITEM.match(line)
+        if bullet:
+            bullets.append(bullet.group(1))
+    return numbered or bullets
+
+
+def extract_keywords(text: str, limit: int) -> List[str]:
+    """
+    소싱 에이전트 출력에서 키워드 후보를 등장 순서대로 추출 (중복 제거, 최대 limit개)
+
+    >>> extract_keywords("1) 경량 캠핑 의자 2) 접이식 캠핑 의자", 3)
+    ['경량 캠핑 의자', '접이식 캠핑 의자']
+    """
+    keywords: List[str] = []
+    seen = set()
+    for item in _list_items(text):
+        keyword = _DETAIL_SEPARATOR.sub("", item.strip(_DECORATION + " ")).strip(_DECORATION + " ")
+        if not keyword or len(keyword) > MAX_KEYWORD_LENGTH or keyword.lower() in seen:
+            continue
+        seen.add(keyword.lower())
+        keywords.append(keyword)
+        if len(keywords) >= limit:
+            break
+    return keywords
+
+
+def run_fanout(items: List[str], work: Callable[[str], str], executor: Executor) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    items를 executor에서 병렬 실행 (입력 순서 유지, 일부 실패는 보고서에 표시하고 계속)
+
+    Returns:
+        [(item, 결과, 오류 메시지), ...]
+
+    Raises:
+        전부 실패하면 첫 번째 예외
+    """
+    # 작업마다 현재 컨텍스트를 복사해서 실행 (AgentLog task_id 등 contextvar 유지)
+    futures = [executor.submit(contextvars.copy_context().run, work, item) for item in items]
+    results = []
+    errors = []
+    for item, future in zip(items, futures):
+        try:
+            results.append((item, future.result(), None))
+        except Exception as e:
+            errors.append(e)
+            results.append((item, None, str(e)))
+    if items and len(errors) == len(items):
+        raise errors[0]
+    return results
+
+
+def merge_reports(results: List[Tuple[str, Optional[str], Optional[str]]]) -> str:
+    """키워드별 보고서 → 검증 단계에 넘길 하나의 보고서"""
+    sections = []
+    for keyword, report, error in results:
+        body = report if error is None else f"(분석 실패: {error})"
+        sections.append(f"### 키워드: {keyword}\n{body}")
+    return "\n\n".join(sections)
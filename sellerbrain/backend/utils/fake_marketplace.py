@@ -0,0 +1,87 @@
+"""
+로컬 테스트용 가짜 오픈마켓 API (utils/upload_engine.py의 MarketplaceClient와 같은 형식)
+- POST /{platform}/products, POST /{platform}/products/batch
+- 플랫폼별 서버측 토큰 버킷: 한도 초과 시 429 + Retry-After
+- failure_rate 확률로 500 응답 (재시도 동작 확인용), 제목이 없는 상품은 400 / 일괄 등록 시 항목별 실패
+- GET /{platform}/products 로 등록된 상품 확인
+
+실행:
+    python utils/fake_marketplace.py [포트]   (기본 9100, FAKE_MARKETPLACE_FAILURE_RATE 환경변수로 실패율 지정)
+"""
+
+import os
+import random
+import sys
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models import UploadPlatform
+from utils.upload_engine import PLATFORM_LIMITS, PlatformLimits, TokenBucket
+
+
+def create_app(limits: Optional[Dict[UploadPlatform, PlatformLimits]] = None,
+               failure_rate: float = 0.0,
+               rng: Callable[[], float] = random.random) -> FastAPI:
+    limits = limits or PLATFORM_LIMITS
+    app = FastAPI(title="Fake Marketplace")
+    # 서버측 한도는 클라이언트 기본 한도와 같게 (클라이언트가 한도를 지키면 429가 나지 않아야 함)
+    buckets = {platform.value: TokenBucket(limit.rate_per_second, limit.burst) for platform, limit in limits.items()}
+    listings: Dict[str, List[Dict[str, Any]]] = {platform.value: [] for platform in limits}
+    product_ids = count(100000)
+    app.state.listings = listings
+
+    def admit(platform: str) -> Optional[JSONResponse]:
+        if platform not in buckets:
+            raise HTTPException(status_code=404, detail=f"지원하지 않는 플랫폼: {platform}")
+        wait = buckets[platform].try_acquire()
+        if wait > 0:
+            return JSONResponse(status_code=429, content={"detail": "rate limited"},
+                                headers={"Retry-After": f"{wait:.3f}"})
+        if rng() < failure_rate:
+            return JSONResponse(status_code=500, content={"detail": "temporary failure"})
+        return None
+
+    def register(platform: str, listing: Dict[str, Any]) -> Dict[str, Any]:
+        product_id = str(next(product_ids))
+        listings[platform].append({**listing, "product_id": product_id})
+        return {"product_id": product_id, "url": f"https://{platform}.example.com/products/{product_id}"}
+
+    @app.post("/{platform}/products")
+    def create_listing(platform: str, listing: Dict[str, Any] = Body(...)):
+        rejected = admit(platform)
+        if rejected is not None:
+            return rejected
+        if not listing.get("title"):
+            raise HTTPException(status_code=400, detail="title is required")
+        return register(platform, listing)
+
+    @app.post("/{platform}/products/batch")
+    def create_listings(platform: str, body: Dict[str, Any] = Body(...)):
+        rejected = admit(platform)
+        if rejected is not None:
+            return rejected
+        results = []
+        for listing in body.get("items", []):
+            if not listing.get("title"):
+                results.append({"ref": listing.get("ref"), "ok": False, "error": "title is required", "retryable": False})
+            else:
+                results.append({"ref": listing.get("ref"), "ok": True, **register(platform, listing)})
+        return {"results": results}
+
+    @app.get("/{platform}/products")
+    def read_listings(platform: str):
+        return listings.get(platform, [])
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 9100
+    failure_rate = float(os.getenv("FAKE_MARKETPLACE_FAILURE_RATE", "0.05"))
+    uvicorn.run(create_app(failure_rate=failure_rate), host="0.0.0.0", port=port)
@@ -0,0 +1,171 @@
+"""
+읽기 API HTTP 캐시
+- 컬렉션별 버전 카운터(Redis)로 강한 ETag 생성 → If-None-Match 일치 시 304
+- 직렬화된 응답 본문을 Redis에 캐시 (버전이 키에 포함되므로 쓰기 시 버전만 올리면 무효화)
+- 쓰기 경로(create_product, 저장소 쓰기, 업로드 엔진, 워커)는 bump_version / bump_version_sync 호출
+- 버전 카운터는 없을 때 현재 시각(ns)으로 시작 → Redis 재시작/eviction 후에도 예전 ETag 값이 다시 나오지 않음
+- TTL 인덱스로 문서가 삭제되는 컬렉션은 삭제 시점에 버전을 올릴 수 없으므로 ETag에 시간 구간을 포함
+"""
+
+import hashlib
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from fastapi import Request, Response
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_TTL
+from utils.serialization import dumps
+
+VERSION_KEY_PREFIX = "cache:version:"
+BODY_KEY_PREFIX = "cache:body:"
+
+# TTL 인덱스로 문서가 삭제되는 컬렉션 → ETag 시간 구간 (초, MongoDB TTL 모니터 주기)
+EXPIRING_COLLECTIONS: Dict[str, int] = {
+    "sourcing_results": 60,
+}
+
+
+def version_key(collection: str) -> str:
+    return f"{VERSION_KEY_PREFIX}{collection}"
+
+
+def version_seed() -> int:
+    """새 버전 카운터의 시작값 (이전 카운터 값 + 증가 횟수보다 항상 큼)"""
+    return time.time_ns()
+
+
+def _queue_bump(pipe, collections: Iterable[str]):
+    for collection in collections:
+        pipe.set(version_key(collection), version_seed(), nx=True)
+        pipe.incr(version_key(collection))
+
+
+def bump_version_sync(redis_conn, *collections: str):
+    """동기 Redis 클라이언트용 버전 증가 (Celery 워커, SyncRepository에서 사용)"""
+    try:
+        pipe = redis_conn.pipeline()
+        _queue_bump(pipe, collections)
+        pipe.execute()
+    except Exception as e:
+        print(f"캐시 버전 갱신 오류: {e}")
+
+
+async def bump_version(redis_conn, *collections: str):
+    """비동기 Redis 클라이언트용 버전 증가 (FastAPI, AsyncRepository에서 사용)"""
+    try:
+        pipe = redis_conn.pipeline()
+        _queue_bump(pipe, collections)
+        await pipe.execute()
+    except Exception as e:
+        print(f"캐시 버전 갱신 오류: {e}")
+
+
+def compute_etag(cache_key: str, versions: Dict[str, int]) -> str:
+    """캐시 키 + 컬렉션 버전으로 강한 ETag 생성"""
+    stamp = ",".join(f"{name}={versions[name]}" for name in sorted(versions))
+    digest = hashlib.sha1(f"{cache_key}|{stamp}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더(쉼표 구분 목록 또는 *)와 ETag 비교"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """
+    컬렉션 버전 기반 응답 캐시
+    Redis 장애 시에도 응답은 정상 반환하고, ETag는 본문 해시로 대체
+    """
+
+    def __init__(self, redis_conn, enabled: bool = RESPONSE_CACHE_ENABLED, ttl: int = RESPONSE_CACHE_TTL):
+        self.redis_conn = redis_conn
+        self.enabled = enabled
+        self.ttl = ttl
+
+    async def versions(self, collections: Iterable[str]) -> Dict[str, int]:
+        names = list(collections)
+        values = await self.redis_conn.mget([version_key(name) for name in names])
+        missing = [name for name, value in zip(names, values) if value is None]
+        if missing:
+            # 카운터가 없으면(첫 조회, Redis 재시작, eviction) 새 시작값으로 생성 → 예전 ETag와 겹치지 않음
+            pipe = self.redis_conn.pipeline()
+            for name in missing:
+                pipe.set(version_key(name), version_seed(), nx=True)
+            await pipe.execute()
+            values = await self.redis_conn.mget([version_key(name) for name in names])
+        versions = {name: int(value) for name, value in zip(names, values)}
+        now = time.time()
+        for name in names:
+            if name in EXPIRING_COLLECTIONS:
+                versions[f"{name}@ttl"] = int(now // EXPIRING_COLLECTIONS[name])
+        return versions
+
+    async def bump_version(self, *collections: str):
+        """쓰기 후 호출 → 해당 컬렉션을 읽는 모든 캐시/ETag 무효화"""
+        await bump_version(self.redis_conn, *collections)
+
+    def _response(self, body: bytes, etag: str) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+
+    async def respond(
+        self,
+        request: Request,
+        collections: List[str],
+        build: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """
+        캐시를 거쳐 응답 생성
+
+        Args:
+            request: 요청 (경로 + 쿼리스트링이 캐시 키, If-None-Match 확인)
+            collections: 응답이 의존하는 컬렉션 이름 목록
+            build: 캐시 미스 시 페이로드를 만드는 코루틴 함수
+        """
+        cache_key = f"{request.url.path}?{request.url.query}"
+        if_none_match = request.headers.get("if-none-match", "")
+
+        try:
+            versions = await self.versions(collections)
+        except Exception as e:
+            print(f"캐시 버전 조회 오류: {e}")
+            versions = None
+
+        if versions is None:
+            # Redis 없이도 ETag/304는 동작하도록 본문 해시 사용
+            body = dumps(await build())
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return self._response(body, etag)
+
+        etag = compute_etag(cache_key, versions)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        body_key = f"{BODY_KEY_PREFIX}{etag.strip(chr(34))}"
+        if self.enabled:
+            try:
+                cached = await self.redis_conn.get(body_key)
+                if cached is not None:
+                    return self._response(cached, etag)
+            except Exception as e:
+                print(f"응답 캐시 조회 오류: {e}")
+
+        body = dumps(await build())
+        if self.enabled:
+            try:
+                await self.redis_conn.set(body_key, body, ex=self.ttl)
+            except Exception as e:
+                print(f"응답 캐시 저장 오류: {e}")
+        return self._response(body, etag)
@@ -0,0 +1,60 @@
+"""
+모델 ID 생성/변환
+- ObjectId 기반: 4바이트 타임스탬프 + 프로세스별 랜덤 5바이트 + 증가 카운터 3바이트
+  → 여러 워커가 동시에 생성해도 충돌하지 않고, 생성 시간 순으로 정렬됨
+- 저장: MongoDB _id / 참조 필드에 12바이트 ObjectId (바이너리)
+- API/모델: 24자리 hex 문자열
+"""
+
+import hashlib
+import re
+import struct
+from typing import Any, Optional
+
+from bson import ObjectId
+
+# 모델 간 참조 필드 (저장 시 ObjectId로 변환)
+REFERENCE_FIELDS = ("product_id", "analysis_id", "content_id", "new_content_id")
+
+# 기존 ID 형식: str(datetime.now().timestamp()) (예: "1733812345.123456")
+_LEGACY_ID_PATTERN = re.compile(r"^\d{9,11}(\.\d+)?$")
+
+
+def new_id() -> str:
+    """시간 정렬 가능한 새 ID (24자리 hex)"""
+    return str(ObjectId())
+
+
+def is_legacy_id(value: Any) -> bool:
+    """타임스탬프 문자열 형식의 기존 ID인지 확인"""
+    return isinstance(value, str) and bool(_LEGACY_ID_PATTERN.match(value))
+
+
+def legacy_id_to_object_id(value: str) -> ObjectId:
+    """
+    기존 타임스탬프 ID → ObjectId (결정적 변환)
+    앞 4바이트는 원래 생성 시각, 나머지 8바이트는 원래 문자열의 해시
+    같은 입력은 항상 같은 ObjectId가 되므로 참조 필드를 컬렉션별로 따로 변환해도 일치함
+    """
+    seconds = int(float(value))
+    digest = hashlib.sha1(value.encode("utf-8")).digest()[:8]
+    return ObjectId(struct.pack(">I", seconds) + digest)
+
+
+def to_storage_id(value: Any) -> Any:
+    """API/모델 ID → 저장용 ObjectId (변환할 수 없는 값은 그대로)"""
+    if value is None or isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str):
+        if ObjectId.is_valid(value):
+            return ObjectId(value)
+        if is_legacy_id(value):
+            return legacy_id_to_object_id(value)
+    return value
+
+
+def to_api_id(value: Any) -> Optional[str]:
+    """저장용 ObjectId → API/모델 ID 문자열"""
+    if value is None:
+        return None
+    return str(value)
@@ -0,0 +1,274 @@
+"""
+LLM 응답 캐시 (Gemini / Claude 공통)
+- 키: (provider, model, temperature, 프롬프트 해시) → 같은 입력 재생성, 후속 단계 실패 후 재시도는 API 호출 없이 반환
+- 저장소: Redis (여러 워커 공유) 또는 SQLite 파일, TTL + 최대 항목 수 초과 시 오래 안 쓴 항목부터 제거 (LRU)
+- temperature > LLM_CACHE_MAX_TEMPERATURE인 호출(Claude 제목/HTML, 크루 Gemini 0.7 등)은 새 요청마다 다른 결과가 필요하므로
+  현재 작업(AgentLog task_id) 범위로만 캐시 → 같은 작업의 재시도/후속 단계 실패 후 재실행은 재사용, 새 요청은 새로 생성
+  작업 컨텍스트가 없는 호출(API 서버에서 직접 호출 등)은 캐시를 건너뜀
+- 적중/미스/건너뜀은 llm_cache_requests{provider, result} 메트릭으로 집계
+- LangChain(ChatGoogleGenerativeAI 등)은 install_langchain_cache()로 전역 캐시 등록
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    REDIS_URL,
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_PATH,
+)
+from utils.metrics import LLM_CACHE_REQUESTS
+from utils.agent_log import current_task_id
+
+KEY_PREFIX = "llmcache:"
+# Redis LRU 관리용 sorted set (member = 키, score = 마지막 사용 시각)
+REDIS_INDEX_KEY = "llmcache:index"
+
+
+def prompt_hash(prompt: Any) -> str:
+    """프롬프트(문자열 또는 메시지/파라미터 구조) → sha256"""
+    if not isinstance(prompt, str):
+        prompt = json.dumps(prompt, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def cache_key(provider: str, model: str, temperature: Optional[float], prompt: Any, scope: Optional[str] = None) -> str:
+    key = f"{KEY_PREFIX}{provider}:{model}:{temperature}:{prompt_hash(prompt)}"
+    return f"{key}:{scope}" if scope else key
+
+
+# ============================================
+# 저장소
+# ============================================
+
+class RedisLLMCacheStore:
+    """Redis 저장소 (키별 TTL + sorted set으로 최대 항목 수 유지)"""
+
+    def __init__(self, redis_conn, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.redis_conn = redis_conn
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[str]:
+        pipe = self.redis_conn.pipeline()
+        pipe.get(key)
+        pipe.zadd(REDIS_INDEX_KEY, {key: time.time()}, xx=True)
+        value, _ = pipe.execute()
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: int):
+        pipe = self.redis_conn.pipeline()
+        pipe.set(key, value, ex=ttl)
+        pipe.zadd(REDIS_INDEX_KEY, {key: time.time()})
+        pipe.zcard(REDIS_INDEX_KEY)
+        count = pipe.execute()[-1]
+        if count > self.max_entries:
+            # 가장 오래 안 쓴 항목부터 제거 (TTL로 이미 사라진 키도 인덱스에서 함께 정리)
+            stale = self.redis_conn.zrange(REDIS_INDEX_KEY, 0, count - self.max_entries - 1)
+            if stale:
+                pipe = self.redis_conn.pipeline()
+                pipe.delete(*stale)
+                pipe.zrem(REDIS_INDEX_KEY, *stale)
+                pipe.execute()
+
+    def clear(self):
+        keys = self.redis_conn.zrange(REDIS_INDEX_KEY, 0, -1)
+        if keys:
+            self.redis_conn.delete(*keys)
+        self.redis_conn.delete(REDIS_INDEX_KEY)
+
+
+class SQLiteLLMCacheStore:
+    """SQLite 파일 저장소 (Redis 없는 로컬 개발/배치용, 프로세스 간 공유)"""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, value TEXT, expires_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+
+def build_store(backend: str = LLM_CACHE_BACKEND):
+    """LLM_CACHE_BACKEND → 저장소 (none이면 None)"""
+    if backend == "redis":
+        from utils.backends import sync_redis
+        return RedisLLMCacheStore(sync_redis(REDIS_URL))
+    if backend == "sqlite":
+        return SQLiteLLMCacheStore()
+    return None
+
+
+# ============================================
+# 캐시
+# ============================================
+
+class LLMCache:
+    """
+    provider/model/temperature/프롬프트 기준 응답 캐시
+    저장소 오류는 캐시 미스로 처리 (LLM 호출은 항상 진행)
+    """
+
+    def __init__(self, store=None, ttl: int = LLM_CACHE_TTL, max_temperature: float = LLM_CACHE_MAX_TEMPERATURE):
+        self.store = store
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+
+    def _key(self, provider: str, model: str, temperature: Optional[float], prompt: Any) -> Optional[str]:
+        """캐시 키 (캐시하지 않는 호출이면 None) - 높은 temperature는 현재 작업 범위로 한정"""
+        if self.store is None:
+            return None
+        if (temperature or 0.0) <= self.max_temperature:
+            return cache_key(provider, model, temperature, prompt)
+        task_id = current_task_id()
+        return cache_key(provider, model, temperature, prompt, scope=f"task:{task_id}") if task_id else None
+
+    def lookup(self, provider: str, model: str, temperature: Optional[float], prompt: Any) -> Optional[str]:
+        key = self._key(provider, model, temperature, prompt)
+        if key is None:
+            LLM_CACHE_REQUESTS.inc(provider=provider, result="bypass")
+            return None
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            print(f"⚠️  LLM 캐시 조회 오류: {e}")
+            value = None
+        LLM_CACHE_REQUESTS.inc(provider=provider, result="hit" if value is not None else "miss")
+        return value
+
+    def update(self, provider: str, model: str, temperature: Optional[float], prompt: Any, value: str):
+        key = self._key(provider, model, temperature, prompt)
+        if key is None:
+            return
+        try:
+            self.store.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"⚠️  LLM 캐시 저장 오류: {e}")
+
+    def cached_call(self, provider: str, model: str, temperature: Optional[float], prompt: Any,
+                    call: Callable[[], Any], encode: Callable[[Any], str], decode: Callable[[str], Any]):
+        """
+        캐시 적중 시 decode(저장값), 아니면 call() 결과를 encode해서 저장 후 반환
+
+        Returns:
+            (결과, 캐시 적중 여부)
+        """
+        value = self.lookup(provider, model, temperature, prompt)
+        if value is not None:
+            return decode(value), True
+        result = call()
+        self.update(provider, model, temperature, prompt, encode(result))
+        return result, False
+
+    def clear(self):
+        if self.store is not None:
+            self.store.clear()
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """프로세스 공용 LLM 캐시 (처음 사용할 때 저장소 연결)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache(build_store())
+    return _cache
+
+
+# ============================================
+# LangChain 연동
+# ============================================
+
+_TEMPERATURE_PATTERN = re.compile(r"['\"]temperature['\"]\s*[:,]\s*([0-9.]+)")
+_MODEL_PATTERN = re.compile(r"['\"]model(?:_name)?['\"]\s*[:,]\s*['\"]([^'\"]+)['\"]")
+
+
+def parse_llm_string(llm_string: str):
+    """LangChain llm_string(모델 파라미터 직렬화 문자열) → (model, temperature)"""
+    model = _MODEL_PATTERN.search(llm_string)
+    temperature = _TEMPERATURE_PATTERN.search(llm_string)
+    return (model.group(1) if model else "unknown",
+            float(temperature.group(1)) if temperature else None)
+
+
+try:
+    from langchain_core.caches import BaseCache
+    from langchain_core.load import dumps as lc_dumps, loads as lc_loads
+
+    class LangChainLLMCache(BaseCache):
+        """LangChain 전역 캐시 어댑터 (set_llm_cache) → LLMCache"""
+
+        def __init__(self, cache: LLMCache, provider: str = "google"):
+            self.cache = cache
+            self.provider = provider
+
+        def lookup(self, prompt: str, llm_string: str):
+            model, temperature = parse_llm_string(llm_string)
+            value = self.cache.lookup(self.provider, model, temperature, [prompt, llm_string])
+            return lc_loads(value) if value is not None else None
+
+        def update(self, prompt: str, llm_string: str, return_val):
+            model, temperature = parse_llm_string(llm_string)
+            self.cache.update(self.provider, model, temperature, [prompt, llm_string], lc_dumps(return_val))
+
+        def clear(self, **kwargs):
+            self.cache.clear()
+
+except ImportError:
+    LangChainLLMCache = None
+
+
+def install_langchain_cache() -> bool:
+    """LangChain 모델 호출에 LLM 캐시 적용 (워커 프로세스 시작 시 1번)"""
+    if LangChainLLMCache is None or get_llm_cache().store is None:
+        return False
+    from langchain_core.globals import set_llm_cache
+    set_llm_cache(LangChainLLMCache(get_llm_cache()))
+    return True
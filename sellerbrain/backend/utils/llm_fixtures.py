@@ -0,0 +1,92 @@
+"""
+녹화된 LLM/검색 응답으로 소싱 크루 재생 (부하 테스트용)
+- LLM_FIXTURE_PATH를 지정하면 워커가 crew.create_sourcing_crew 대신 replay_sourcing_crew 실행
+  → Gemini/Claude/Serper 호출 없이 같은 진행 메시지, 단계 메트릭, AgentLog, 최종 JSON 생성
+- 각 호출은 녹화된 지연 시간 x LLM_FIXTURE_LATENCY_SCALE (± LLM_FIXTURE_LATENCY_JITTER 비율) 만큼 대기
+- 픽스처 형식 (benchmarks/fixtures/sourcing_crew.json):
+    {"stages": [{"name": "sourcing", "agent": "...", "model": "...",
+                 "calls": [{"kind": "llm" | "tool", "provider": "...", "latency": 2.4,
+                            "input_tokens": 900, "output_tokens": 350, "output": "..."}]}],
+     "final_output": {...}}
+  문자열 안의 {query}는 요청 쿼리로 치환
+
+측정 범위:
+- 크루 자체(CrewAI 에이전트/프롬프트 구성, LLM·검색 클라이언트, 응답 파싱)는 실행하지 않음
+  → 부하 테스트 결과는 API 수락 제어, 큐, 워커 슬롯, 결과 저장, WebSocket 전달 오버헤드 + 녹화 지연 대기만 반영
+- 크루 내부 오버헤드는 카세트 재생으로 따로 측정: python benchmarks/replay_pipeline.py replay --time-scale 0
+  (카세트는 요청 본문 해시로 응답을 찾으므로 요청마다 쿼리가 다른 부하 테스트에는 쓸 수 없음)
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import LLM_FIXTURE_PATH, LLM_FIXTURE_LATENCY_SCALE, LLM_FIXTURE_LATENCY_JITTER
+from utils.metrics import CREW_STAGE_SECONDS, record_llm_usage
+from utils.llm_instrumentation import estimate_cost
+from utils.agent_log import record_agent_run
+
+
+@lru_cache(maxsize=8)
+def load_fixture(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def scaled_latency(recorded: float, scale: float = LLM_FIXTURE_LATENCY_SCALE,
+                   jitter: float = LLM_FIXTURE_LATENCY_JITTER, rng: Optional[random.Random] = None) -> float:
+    """녹화 지연 시간 → 재생 대기 시간 (jitter=0.2면 ±20% 균등 분포)"""
+    delay = recorded * scale
+    if jitter and delay > 0:
+        delay *= 1 + (rng or random).uniform(-jitter, jitter)
+    return max(delay, 0.0)
+
+
+def _fill(value: Any, query: str) -> Any:
+    """문자열/리스트/딕셔너리 안의 {query} 치환 (JSON 직렬화 전에 치환해야 따옴표가 이스케이프됨)"""
+    if isinstance(value, str):
+        return value.replace("{query}", query)
+    if isinstance(value, list):
+        return [_fill(item, query) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, query) for key, item in value.items()}
+    return value
+
+
+def replay_sourcing_crew(query: str, callback_function: Optional[Callable[[str], None]] = None,
+                         fixture_path: str = LLM_FIXTURE_PATH, sleep: Callable[[float], None] = time.sleep,
+                         rng: Optional[random.Random] = None) -> str:
+    """
+    create_sourcing_crew와 같은 시그니처/부수효과로 녹화된 실행 재생
+
+    Returns:
+        최종 결과 문자열 (워커가 JSON을 파싱하는 형식 그대로)
+    """
+    fixture = load_fixture(fixture_path)
+    for stage in fixture["stages"]:
+        stage_started = time.perf_counter()
+        llm_calls = tokens = 0
+        cost = 0.0
+        for call in stage["calls"]:
+            started = time.perf_counter()
+            sleep(scaled_latency(call.get("latency", 0.0), rng=rng))
+            output = _fill(call.get("output", ""), query)
+            if call.get("kind", "llm") == "llm":
+                llm_calls += 1
+                tokens += (call.get("input_tokens") or 0) + (call.get("output_tokens") or 0)
+                cost += estimate_cost(stage["model"], call.get("input_tokens"), call.get("output_tokens")) or 0.0
+                record_llm_usage(call.get("provider", "fixture"), stage["model"], time.perf_counter() - started,
+                                 call.get("input_tokens"), call.get("output_tokens"))
+            if callback_function:
+                callback_function(f"Thinking: {output[:100]}...")
+        seconds = time.perf_counter() - stage_started
+        CREW_STAGE_SECONDS.observe(seconds, stage=stage["name"])
+        record_agent_run(stage["agent"], seconds, model=stage["model"], llm_calls=llm_calls,
+                         tokens_used=tokens or None, cost_usd=cost or None, input_data={"stage": stage["name"], "query": query})
+
+    return json.dumps(_fill(fixture["final_output"], query), ensure_ascii=False)
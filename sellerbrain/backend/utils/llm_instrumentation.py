@@ -0,0 +1,229 @@
+"""
+LLM 호출 사용량/비용 집계 (Claude / Gemini / LangChain 공통)
+- 호출 1건마다 입력/출력 토큰, 지연 시간, 재시도 횟수, 단가표 기준 예상 비용을 기록
+- 메트릭 (llm_call_duration_seconds, llm_tokens, llm_cost_usd, llm_retries) + AgentLog (task_id, 크루 단계 연결)
+- 크루 단계는 contextvar로 전달 (crew.py가 단계가 바뀔 때 set_current_stage 호출)
+- LangChain 모델(ChatGoogleGenerativeAI)은 callbacks=[LLMUsageCallback(...)]로 연결
+- 성공 지연 시간/타임아웃은 모델 라우터(utils/model_router.py)에, 성공/실패는 provider 서킷 브레이커(utils/resilience.py)에도 전달
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import LLM_PRICE_OVERRIDES
+from utils.metrics import LLM_COST_USD, LLM_RETRIES, record_llm_usage
+from utils.agent_log import log_llm_call
+from utils.model_router import get_model_router, is_timeout
+from utils.resilience import get_breaker
+
+# 현재 실행 중인 크루 단계 (sourcing, competitor_analysis, ...)
+_current_stage: ContextVar[Optional[str]] = ContextVar("llm_stage", default=None)
+
+
+def set_current_stage(stage: Optional[str]):
+    return _current_stage.set(stage)
+
+
+def reset_current_stage(token):
+    _current_stage.reset(token)
+
+
+def current_stage() -> Optional[str]:
+    return _current_stage.get()
+
+
+# ============================================
+# 모델 단가표
+# ============================================
+
+# 100만 토큰당 USD (입력, 출력), 공개 표준 요금 기준 (Gemini는 128k 이하 프롬프트 구간)
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-flash-8b": (0.0375, 0.15),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-opus": (15.00, 75.00),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+
+def _load_price_table() -> Dict[str, Tuple[float, float]]:
+    prices = dict(MODEL_PRICES)
+    if LLM_PRICE_OVERRIDES:
+        try:
+            for model, (input_price, output_price) in json.loads(LLM_PRICE_OVERRIDES).items():
+                prices[model] = (float(input_price), float(output_price))
+        except (ValueError, TypeError) as e:
+            print(f"⚠️  LLM_PRICE_OVERRIDES 형식 오류 (기본 단가 사용): {e}")
+    return prices
+
+
+PRICE_TABLE = _load_price_table()
+
+
+def model_price(model: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    모델명 → 단가 (버전/날짜 접미사는 가장 긴 접두사로 매칭, 모르는 모델은 None)
+
+    >>> model_price("claude-3-5-sonnet-20241022")
+    (3.0, 15.0)
+    """
+    if not model:
+        return None
+    name = model.split("/")[-1]  # "models/gemini-1.5-pro" 형식
+    if name in PRICE_TABLE:
+        return PRICE_TABLE[name]
+    matches = [key for key in PRICE_TABLE if name.startswith(key)]
+    return PRICE_TABLE[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: Optional[str], input_tokens: Optional[int], output_tokens: Optional[int]) -> Optional[float]:
+    """토큰 수 → 예상 비용 (USD), 단가를 모르면 None"""
+    price = model_price(model)
+    if price is None or (input_tokens is None and output_tokens is None):
+        return None
+    return round(((input_tokens or 0) * price[0] + (output_tokens or 0) * price[1]) / 1_000_000, 8)
+
+
+# ============================================
+# 기록
+# ============================================
+
+def record_llm_call(provider: str, agent_name: str, model: str, seconds: float,
+                    input_tokens: Optional[int] = None, output_tokens: Optional[int] = None,
+                    retries: int = 0, error: Optional[str] = None, timed_out: bool = False):
+    """LLM 호출 1건 → 메트릭 + AgentLog (현재 task_id, 크루 단계 연결) + 모델 라우터/서킷 브레이커 관측"""
+    cost = estimate_cost(model, input_tokens, output_tokens)
+    if error is None or timed_out:
+        get_model_router().observe(model, seconds, timed_out=timed_out)
+    get_breaker(provider).record(error is None)
+    record_llm_usage(provider, model, seconds, input_tokens=input_tokens, output_tokens=output_tokens)
+    if cost:
+        LLM_COST_USD.inc(cost, provider=provider, model=model)
+    if retries:
+        LLM_RETRIES.inc(retries, provider=provider, model=model)
+    return log_llm_call(
+        agent_name, model, seconds,
+        input_tokens=input_tokens, output_tokens=output_tokens,
+        error=error, cost_usd=cost, retries=retries,
+        input_data={"provider": provider, "stage": current_stage(),
+                    "input_tokens": input_tokens, "output_tokens": output_tokens}
+    )
+
+
+@contextmanager
+def instrument_llm_call(provider: str, agent_name: str, model: str):
+    """
+    with 블록(LLM 호출 1건)의 지연 시간/토큰/재시도 기록 (예외 발생 시 failed로 기록 후 다시 raise)
+
+    사용 예:
+        with instrument_llm_call("google", "GeminiVisionAnalyzer", "gemini-1.5-flash") as call:
+            response = model.generate_content(...)
+            call["input_tokens"] = response.usage_metadata.prompt_token_count
+    """
+    call: Dict[str, Any] = {"input_tokens": None, "output_tokens": None, "retries": 0}
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        record_llm_call(provider, agent_name, model, time.perf_counter() - started,
+                        retries=call["retries"], error=str(e), timed_out=is_timeout(e))
+        raise
+    record_llm_call(provider, agent_name, model, time.perf_counter() - started,
+                    input_tokens=call["input_tokens"], output_tokens=call["output_tokens"],
+                    retries=call["retries"])
+
+
+# ============================================
+# LangChain 연동
+# ============================================
+
+def langchain_token_usage(response) -> Tuple[Optional[int], Optional[int]]:
+    """LangChain LLMResult → (입력 토큰, 출력 토큰)"""
+    input_tokens = output_tokens = None
+    # 최신 langchain: 메시지의 usage_metadata (input_tokens / output_tokens)
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens = (input_tokens or 0) + (usage.get("input_tokens") or 0)
+                output_tokens = (output_tokens or 0) + (usage.get("output_tokens") or 0)
+    if input_tokens is not None or output_tokens is not None:
+        return input_tokens, output_tokens
+    # 구버전: llm_output의 usage_metadata / token_usage (Gemini 필드명)
+    llm_output = getattr(response, "llm_output", None) or {}
+    usage = llm_output.get("usage_metadata") or llm_output.get("token_usage") or {}
+    return (usage.get("prompt_token_count", usage.get("input_tokens")),
+            usage.get("candidates_token_count", usage.get("output_tokens")))
+
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class LLMUsageCallback(BaseCallbackHandler):
+        """
+        LangChain 모델 호출 1건마다 record_llm_call (on_retry로 자동 재시도 횟수 집계)
+        콜백은 모델을 호출한 스레드에서 실행되므로 task_id/단계 contextvar가 그대로 유지됨
+        """
+
+        def __init__(self, agent_name: Optional[str] = None, provider: str = "google", model: Optional[str] = None):
+            self.agent_name = agent_name
+            self.provider = provider
+            self.model = model
+            self._runs: Dict[Any, Dict[str, Any]] = {}
+
+        def _start(self, run_id, kwargs):
+            params = kwargs.get("invocation_params") or {}
+            self._runs[run_id] = {
+                "started": time.perf_counter(),
+                "retries": 0,
+                "model": params.get("model") or params.get("model_name") or self.model or "unknown",
+            }
+
+        def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+            self._start(run_id, kwargs)
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+            self._start(run_id, kwargs)
+
+        def on_retry(self, retry_state, *, run_id, **kwargs):
+            run = self._runs.get(run_id)
+            if run is not None:
+                run["retries"] += 1
+
+        def _finish(self, run_id, response=None, error: Optional[BaseException] = None):
+            run = self._runs.pop(run_id, None)
+            if run is None:
+                return
+            input_tokens, output_tokens = langchain_token_usage(response) if response is not None else (None, None)
+            record_llm_call(
+                self.provider, self.agent_name or current_stage() or "langchain", run["model"],
+                time.perf_counter() - run["started"],
+                input_tokens=input_tokens, output_tokens=output_tokens,
+                retries=run["retries"], error=str(error) if error is not None else None,
+                timed_out=error is not None and is_timeout(error)
+            )
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            self._finish(run_id, response=response)
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            self._finish(run_id, error=error)
+
+except ImportError:
+    LLMUsageCallback = None
+
+
+def langchain_callbacks(agent_name: Optional[str] = None, model: Optional[str] = None):
+    """ChatGoogleGenerativeAI(callbacks=...)에 넘길 목록 (langchain_core가 없으면 빈 목록)"""
+    if LLMUsageCallback is None:
+        return []
+    return [LLMUsageCallback(agent_name=agent_name, model=model)]
@@ -0,0 +1,342 @@
+"""
+Prometheus 텍스트 포맷 메트릭
+- 프로세스 내 레지스트리 (Counter / Gauge / Histogram)
+- Celery 워커는 작업 종료 시 누적치를 Redis 해시에 더하고(flush), API의 /metrics가 합산해서 노출
+- 워커 Gauge는 합산하지 않고 프로세스별(instance 라벨) 마지막 값으로 노출 (일정 시간 갱신이 없으면 만료)
+- 외부 의존성 없이 동작하도록 필요한 부분만 직접 구현
+"""
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 워커 메트릭 집계용 Redis 해시 키
+WORKER_METRICS_KEY = "metrics:workers"
+# 워커 Gauge: 프로세스별 해시(접두사 + instance) + instance 목록, 갱신이 없으면 WORKER_GAUGE_TTL초 후 만료
+WORKER_GAUGES_KEY_PREFIX = "metrics:gauges:"
+WORKER_GAUGE_INSTANCES_KEY = "metrics:gauge_instances"
+WORKER_GAUGE_TTL = 15 * 60
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+def _with_label(sample: str, name: str, value: str) -> str:
+    """샘플 식별자에 라벨 1개 추가 (이름{a="b"} → 이름{a="b",name="value"})"""
+    label = f'{name}="{_escape(value)}"'
+    if sample.endswith("}"):
+        return f"{sample[:-1]},{label}}}"
+    return f"{sample}{{{label}}}"
+
+
+def process_instance() -> str:
+    """워커 프로세스 식별자 (prefork 자식마다 다르도록 호출 시점의 pid 사용)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """메트릭 공통 (이름, 설명, 라벨)"""
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _collect(self) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+    def samples(self) -> Dict[str, float]:
+        """샘플 식별자(이름{라벨}) → 값"""
+        with self._lock:
+            return self._collect()
+
+    def drain(self) -> Dict[str, float]:
+        """샘플을 읽고 원자적으로 초기화 (워커 flush용)"""
+        with self._lock:
+            samples = self._collect()
+            self._clear()
+            return samples
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _collect(self) -> Dict[str, float]:
+        return {
+            f"{self.name}_total{_format_labels(zip(self.labelnames, key))}": value
+            for key, value in self._values.items()
+        }
+
+    def _clear(self):
+        self._values.clear()
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def _collect(self) -> Dict[str, float]:
+        return {
+            f"{self.name}{_format_labels(zip(self.labelnames, key))}": value
+            for key, value in self._values.items()
+        }
+
+    def _clear(self):
+        self._values.clear()
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[float]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0.0] * len(self.buckets))
+            for index, upper in enumerate(self.buckets):
+                if value <= upper:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간을 관측"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _collect(self) -> Dict[str, float]:
+        samples = {}
+        for key, counts in self._counts.items():
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0.0
+            for upper, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_value(upper)
+                samples[f"{self.name}_bucket{_format_labels(pairs + [('le', le)])}"] = cumulative
+            samples[f"{self.name}_sum{_format_labels(pairs)}"] = self._sums[key]
+            samples[f"{self.name}_count{_format_labels(pairs)}"] = cumulative
+        return samples
+
+    def _clear(self):
+        self._counts.clear()
+        self._sums.clear()
+
+
+class MetricsRegistry:
+    """메트릭 모음 + Prometheus 텍스트 렌더링"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicated metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self, remote_samples: Optional[Dict[str, float]] = None) -> str:
+        """
+        로컬 샘플 + 워커가 Redis에 올린 샘플을 합산하여 렌더링
+
+        Args:
+            remote_samples: "metric_name\\tsample" → 값 (워커 집계 해시)
+        """
+        remote_by_metric: Dict[str, Dict[str, float]] = {}
+        for field, value in (remote_samples or {}).items():
+            metric_name, _, sample = field.partition("\t")
+            remote_by_metric.setdefault(metric_name, {})[sample] = value
+
+        lines = []
+        for name, metric in self._metrics.items():
+            samples = metric.samples()
+            for sample, value in remote_by_metric.get(name, {}).items():
+                samples[sample] = samples.get(sample, 0.0) + value
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            for sample in sorted(samples):
+                lines.append(f"{sample} {_format_value(samples[sample])}")
+        return "\n".join(lines) + "\n"
+
+    def flush_to_redis(self, redis_conn):
+        """
+        누적치(Counter/Histogram)를 Redis 해시에 더하고 로컬 값을 초기화 (Celery 워커용, 동기 클라이언트)
+        Gauge는 프로세스 단위 값이라 합산하지 않고 instance 라벨을 붙여 프로세스별 해시에 덮어씀
+        """
+        try:
+            instance = process_instance()
+            gauges: Dict[str, float] = {}
+            pipe = redis_conn.pipeline()
+            for name, metric in self._metrics.items():
+                if isinstance(metric, Gauge):
+                    for sample, value in metric.samples().items():
+                        gauges[f"{name}\t{_with_label(sample, 'instance', instance)}"] = value
+                    continue
+                for sample, value in metric.drain().items():
+                    pipe.hincrbyfloat(WORKER_METRICS_KEY, f"{name}\t{sample}", value)
+            if gauges:
+                key = f"{WORKER_GAUGES_KEY_PREFIX}{instance}"
+                pipe.delete(key)
+                pipe.hset(key, mapping=gauges)
+                pipe.expire(key, WORKER_GAUGE_TTL)
+                pipe.sadd(WORKER_GAUGE_INSTANCES_KEY, instance)
+            pipe.execute()
+        except Exception as e:
+            print(f"워커 메트릭 전송 오류: {e}")
+
+
+def _decode(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+async def read_worker_samples(redis_conn) -> Dict[str, float]:
+    """워커 집계 샘플 + 프로세스별 Gauge 조회 (비동기 Redis 클라이언트)"""
+    try:
+        raw = await redis_conn.hgetall(WORKER_METRICS_KEY)
+        instances = [_decode(instance) for instance in await redis_conn.smembers(WORKER_GAUGE_INSTANCES_KEY)]
+        for instance in instances:
+            gauges = await redis_conn.hgetall(f"{WORKER_GAUGES_KEY_PREFIX}{instance}")
+            if not gauges:
+                # 만료된 프로세스 (종료/재시작된 워커)
+                await redis_conn.srem(WORKER_GAUGE_INSTANCES_KEY, instance)
+            raw.update(gauges)
+    except Exception as e:
+        print(f"워커 메트릭 조회 오류: {e}")
+        return {}
+    return {_decode(field): float(value) for field, value in raw.items()}
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ============================================
+# 핫패스 메트릭 정의
+# ============================================
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ["method", "route", "status"]
+)
+SOURCING_QUEUE_DEPTH = Gauge(
+    "sourcing_queue_depth", "Celery 브로커 대기열 길이"
+)
+SOURCING_TASK_SECONDS = Histogram(
+    "sourcing_task_duration_seconds", "소싱 작업 전체 소요 시간", ["status"]
+)
+CREW_STAGE_SECONDS = Histogram(
+    "crew_stage_duration_seconds", "CrewAI 단계별 소요 시간", ["stage"]
+)
+SAFETY_CHECK_SECONDS = Histogram(
+    "safety_check_duration_seconds", "키워드 안전성 검사 소요 시간"
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds", "LLM 호출 소요 시간", ["provider", "model"]
+)
+LLM_TOKENS = Counter(
+    "llm_tokens", "LLM 토큰 사용량", ["provider", "model", "direction"]
+)
+LLM_COST_USD = Counter(
+    "llm_cost_usd", "LLM 호출 예상 비용 (USD, 모델 단가표 기준)", ["provider", "model"]
+)
+LLM_RETRIES = Counter(
+    "llm_retries", "LLM 호출 재시도 횟수 (SDK/LangChain 자동 재시도 포함)", ["provider", "model"]
+)
+LLM_CIRCUIT_OPEN = Gauge(
+    "llm_circuit_open", "LLM provider 서킷 브레이커 차단 여부 (1 = open)", ["provider"]
+)
+LLM_HEDGES = Counter(
+    "llm_hedges", "헤지 요청 발생 (winner: primary/hedge 먼저 응답한 쪽)", ["provider", "winner"]
+)
+LLM_FALLBACKS = Counter(
+    "llm_fallbacks", "LLM 실패 후 대체 (target: 다른 provider 또는 mock 데이터)", ["provider", "target"]
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections", "현재 WebSocket 연결 수"
+)
+WEBSOCKET_DROPS = Counter(
+    "websocket_drops", "전송 실패로 끊긴 WebSocket 연결 수"
+)
+UPLOAD_REQUEST_SECONDS = Histogram(
+    "upload_request_duration_seconds", "오픈마켓 업로드 API 호출 소요 시간", ["platform", "outcome"]
+)
+UPLOAD_ITEMS = Counter(
+    "upload_items", "오픈마켓 업로드 결과 (상품 단위)", ["platform", "outcome"]
+)
+LLM_CACHE_REQUESTS = Counter(
+    "llm_cache_requests", "LLM 응답 캐시 조회 (result: hit/miss/bypass)", ["provider", "result"]
+)
+SEARCH_REQUESTS = Counter(
+    "search_requests", "웹 검색 요청 (source: memory/cache 캐시 적중, api 호출, error 실패)", ["source"]
+)
+
+
+def record_llm_usage(provider: str, model: str, seconds: float, input_tokens: Optional[int] = None, output_tokens: Optional[int] = None):
+    """LLM 호출 1건의 지연 시간과 토큰 수 기록"""
+    LLM_CALL_SECONDS.observe(seconds, provider=provider, model=model)
+    if input_tokens:
+        LLM_TOKENS.inc(input_tokens, provider=provider, model=model, direction="input")
+    if output_tokens:
+        LLM_TOKENS.inc(output_tokens, provider=provider, model=model, direction="output")
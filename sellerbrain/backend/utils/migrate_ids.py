@@ -0,0 +1,152 @@
+"""
+기존 타임스탬프 ID 문서 → ObjectId 마이그레이션
+
+기존 문서 형태:
+    {"_id": ObjectId(자동), "id": "1733812345.123456", "product_id": "1733812300.1", ...}
+변환 후:
+    {"_id": ObjectId(타임스탬프 기반), "product_id": ObjectId(...), ...}
+
+- 참조 필드도 같은 결정적 규칙(utils.ids.legacy_id_to_object_id)으로 변환하므로 컬렉션 순서와 무관
+- _id는 수정할 수 없어서 새 _id로 upsert 후 기존 문서 삭제 (배치 단위 bulk_write)
+- 이미 변환된 문서는 건너뛰고, 중간에 중단돼도 다시 실행하면 이어서 처리됨
+- id/참조 필드에 변환할 수 없는 문자열이 있는 문서는 원래 식별자를 잃지 않도록 그대로 두고 목록만 출력
+- 같은 기존 id를 가진 문서가 여러 건이면(같은 시각에 생성되어 충돌) 참조 대상을 알 수 없으므로 모두 그대로 두고 목록만 출력
+- 새 _id 자리에 다른 문서가 이미 있으면 덮어쓰지 않고 건너뜀
+
+사용법:
+    python -m utils.migrate_ids            # 실제 실행
+    python -m utils.migrate_ids --dry-run  # 변환 대상 수만 출력
+"""
+
+import os
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import bson
+from bson import ObjectId
+from pymongo import DeleteOne, MongoClient, ReplaceOne
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MONGO_URL
+from utils.ids import REFERENCE_FIELDS, is_legacy_id, to_storage_id
+from utils.repository import MODEL_SPECS
+
+# models.py 모델이 저장되는 컬렉션
+MODEL_COLLECTIONS = tuple(spec.name for spec in MODEL_SPECS.values())
+
+BATCH_SIZE = 500
+
+# 변환할 수 없는 문서를 출력할 때 보여줄 최대 _id 수
+REPORT_LIMIT = 20
+
+
+def unconvertible_fields(document: Dict[str, Any]) -> List[str]:
+    """ObjectId로 변환할 수 없는 문자열 id/참조 필드 목록"""
+    return [
+        field for field in ("id",) + REFERENCE_FIELDS
+        if isinstance(document.get(field), str) and not isinstance(to_storage_id(document[field]), ObjectId)
+    ]
+
+
+def migrate_document(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    문서 1건 변환. 변환이 필요 없거나 변환할 수 없는 필드가 있으면 None 반환
+
+    Args:
+        document: 원본 문서
+
+    Returns:
+        새 _id와 ObjectId 참조를 가진 문서 또는 None
+    """
+    if unconvertible_fields(document):
+        return None
+
+    legacy_id = document.get("id")
+    needs_migration = is_legacy_id(legacy_id) or any(
+        isinstance(document.get(field), str) for field in REFERENCE_FIELDS
+    )
+    if not needs_migration:
+        return None
+
+    migrated = dict(document)
+    if isinstance(legacy_id, str):
+        migrated["_id"] = to_storage_id(migrated.pop("id"))
+
+    for field in REFERENCE_FIELDS:
+        if field in migrated:
+            migrated[field] = to_storage_id(migrated[field])
+    return migrated
+
+
+def duplicate_legacy_ids(collection) -> set:
+    """2건 이상의 문서가 같이 쓰는 문자열 id (같은 _id로 변환되어 서로 덮어쓰게 됨)"""
+    counts = Counter(document["id"] for document in collection.find({"id": {"$type": "string"}}, {"id": 1}))
+    return {legacy_id for legacy_id, count in counts.items() if count > 1}
+
+
+def _report(collection_name: str, reason: str, ids: List[Any]):
+    print(f"⚠️  {collection_name}: {reason} 건너뛴 문서 {len(ids)}건 "
+          f"(_id: {', '.join(str(_id) for _id in ids[:REPORT_LIMIT])}{' ...' if len(ids) > REPORT_LIMIT else ''})")
+
+
+def migrate_collection(collection, dry_run: bool = False) -> int:
+    """컬렉션 하나를 마이그레이션하고 변환된 문서 수 반환"""
+    migrated_count = 0
+    operations = []
+    skipped = []
+    duplicated = []
+    conflicts = []
+    duplicates = duplicate_legacy_ids(collection)
+
+    for document in collection.find():
+        if unconvertible_fields(document):
+            skipped.append(document["_id"])
+            continue
+        if document.get("id") in duplicates:
+            duplicated.append(document["_id"])
+            continue
+        migrated = migrate_document(document)
+        if migrated is None:
+            continue
+        if migrated["_id"] != document["_id"]:
+            # 중단 후 재실행이면 같은 내용이 이미 upsert되어 있음 → 원본 삭제만 하면 됨
+            # (저장 시 datetime이 밀리초로 잘리므로 BSON 왕복 후 비교)
+            existing = collection.find_one({"_id": migrated["_id"]})
+            if existing is not None and existing != bson.decode(bson.encode(migrated)):
+                conflicts.append(document["_id"])
+                continue
+        migrated_count += 1
+        if dry_run:
+            continue
+
+        operations.append(ReplaceOne({"_id": migrated["_id"]}, migrated, upsert=True))
+        if migrated["_id"] != document["_id"]:
+            operations.append(DeleteOne({"_id": document["_id"]}))
+
+        if len(operations) >= BATCH_SIZE:
+            collection.bulk_write(operations, ordered=True)
+            operations = []
+
+    if operations:
+        collection.bulk_write(operations, ordered=True)
+    if skipped:
+        _report(collection.name, "변환할 수 없는 ID가 있어", skipped)
+    if duplicated:
+        _report(collection.name, "같은 기존 ID를 가진 문서가 여러 건이라", duplicated)
+    if conflicts:
+        _report(collection.name, "새 _id에 다른 문서가 이미 있어", conflicts)
+    return migrated_count
+
+
+def migrate_all(db, dry_run: bool = False) -> Dict[str, int]:
+    results = {}
+    for name in MODEL_COLLECTIONS:
+        results[name] = migrate_collection(db[name], dry_run=dry_run)
+        print(f"🔁 {name}: {results[name]}건 {'변환 대상' if dry_run else '변환 완료'}")
+    return results
+
+
+if __name__ == "__main__":
+    mongo_client = MongoClient(MONGO_URL)
+    migrate_all(mongo_client.ai_marketing, dry_run="--dry-run" in sys.argv)
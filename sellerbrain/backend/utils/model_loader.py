@@ -0,0 +1,33 @@
+"""
+내부 데이터(MongoDB 문서 등) → Pydantic 모델 로딩
+- pydantic v2 검증은 pydantic-core(Rust)에서 실행되어 문서 1건에 수 µs 수준
+  model_construct는 순수 Python이라 이득이 측정 오차 수준이고, 중첩 모델까지 만들면 오히려 느림
+  → 검증 생략 경로는 두지 않고 검증을 유지 (저장 문서 스키마가 어긋나면 바로 드러나는 장점도 있음)
+- 여러 문서는 TypeAdapter(List[Model]) 한 번의 호출로 묶어서 문서마다의 Python↔Rust 왕복을 없앰
+- 벤치마크: benchmarks/bench_model_construct.py
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model_cls: Type[BaseModel]) -> TypeAdapter:
+    # TypeAdapter 생성은 스키마 빌드 비용이 있으므로 클래스별로 한 번만
+    return TypeAdapter(List[model_cls])
+
+
+def load_one(model_cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    return model_cls.model_validate(data)
+
+
+def load_many(model_cls: Type[ModelT], items: Iterable[Dict[str, Any]]) -> List[ModelT]:
+    """여러 문서를 한 번에 검증 (find() 결과 등)"""
+    items = items if isinstance(items, list) else list(items)
+    if not items:
+        return []
+    return _list_adapter(model_cls).validate_python(items)
@@ -0,0 +1,237 @@
+"""
+지연 시간 기반 모델 라우터 (단계/툴별 모델 등급)
+- 단계(크루 단계, 툴)마다 등급 선언: fast (flash/haiku), quality (pro/sonnet), balanced (입력이 작으면 fast)
+- route(): 등급 → 모델, 입력 크기/마감 시간/관측된 모델 지연 시간(EWMA)에 따라 다른 등급으로 조정
+  호출부가 마감 시간을 주지 않으면 provider 요청 타임아웃(LLM_TIMEOUT_*)을 마감으로 사용
+  → 평소 지연 시간(EWMA)이 타임아웃을 넘는 모델은 타임아웃을 기다리지 않고 다른 등급으로 보냄
+- 타임아웃 난 모델은 MODEL_ROUTER_TIMEOUT_COOLDOWN초 동안 다른 등급 모델로 보냄
+- call()/acall(): 선택한 모델로 호출하다 타임아웃이면 다른 등급 모델로 1번 더 호출 (마감 시간이 남아 있을 때만)
+- 지연 시간 관측은 utils/llm_instrumentation.py가 LLM 호출마다 observe()로 전달 (최근 표본은 헤지 요청 p95 계산에도 사용)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    GEMINI_MODEL,
+    GEMINI_FAST_MODEL,
+    CLAUDE_MODEL,
+    CLAUDE_FAST_MODEL,
+    MODEL_ROUTER_STAGE_TIERS,
+    MODEL_ROUTER_SMALL_INPUT_CHARS,
+    MODEL_ROUTER_FAST_MAX_INPUT_CHARS,
+    MODEL_ROUTER_EWMA_ALPHA,
+    MODEL_ROUTER_TIMEOUT_COOLDOWN,
+    MODEL_ROUTER_TIMEOUT_RETRY,
+    MODEL_ROUTER_LATENCY_WINDOW,
+    LLM_TIMEOUT_ANTHROPIC,
+    LLM_TIMEOUT_GOOGLE,
+)
+from utils.agent_log import percentile
+
+FAST = "fast"
+QUALITY = "quality"
+BALANCED = "balanced"
+
+PROVIDER_MODELS: Dict[str, Dict[str, str]] = {
+    "google": {FAST: GEMINI_FAST_MODEL, QUALITY: GEMINI_MODEL},
+    "anthropic": {FAST: CLAUDE_FAST_MODEL, QUALITY: CLAUDE_MODEL},
+}
+
+# 마감 시간을 주지 않은 호출의 기본 마감 (요청 타임아웃, utils/resilience.PROVIDER_TIMEOUTS와 같은 값)
+PROVIDER_DEADLINES: Dict[str, float] = {
+    "anthropic": LLM_TIMEOUT_ANTHROPIC,
+    "google": LLM_TIMEOUT_GOOGLE,
+}
+
+# 단계별 기본 등급 (MODEL_ROUTER_STAGE_TIERS로 덮어쓰기)
+STAGE_TIERS: Dict[str, str] = {
+    # 크루 단계 (crew.py)
+    "sourcing": QUALITY,
+    "competitor_analysis": QUALITY,
+    "competitor_keyword": QUALITY,
+    "keyword_verification": FAST,     # 안전성/상표 확인 위주, 추론 부담 적음
+    "content_creation": QUALITY,
+    # 툴
+    "title_generation": QUALITY,
+    "detail_html": QUALITY,
+    "feedback_parsing": FAST,         # 짧은 피드백 → 정해진 JSON 액션
+    "vision_analysis": FAST,
+}
+
+
+def _load_stage_tiers() -> Dict[str, str]:
+    tiers = dict(STAGE_TIERS)
+    if MODEL_ROUTER_STAGE_TIERS:
+        try:
+            tiers.update(json.loads(MODEL_ROUTER_STAGE_TIERS))
+        except ValueError as e:
+            print(f"⚠️  MODEL_ROUTER_STAGE_TIERS 형식 오류 (기본 등급 사용): {e}")
+    return tiers
+
+
+def is_timeout(error: BaseException) -> bool:
+    """SDK마다 다른 타임아웃 예외 (TimeoutError, anthropic.APITimeoutError, httpx.TimeoutException, DeadlineExceeded)"""
+    name = type(error).__name__
+    return isinstance(error, TimeoutError) or "Timeout" in name or "DeadlineExceeded" in name
+
+
+class ModelRouter:
+    """프로세스 공용 라우터 (스레드 안전, 관측값은 프로세스별)"""
+
+    def __init__(self, provider_models: Dict[str, Dict[str, str]] = PROVIDER_MODELS,
+                 stage_tiers: Optional[Dict[str, str]] = None,
+                 small_input_chars: int = MODEL_ROUTER_SMALL_INPUT_CHARS,
+                 fast_max_input_chars: int = MODEL_ROUTER_FAST_MAX_INPUT_CHARS,
+                 alpha: float = MODEL_ROUTER_EWMA_ALPHA,
+                 timeout_cooldown: float = MODEL_ROUTER_TIMEOUT_COOLDOWN,
+                 latency_window: int = MODEL_ROUTER_LATENCY_WINDOW,
+                 deadlines: Optional[Dict[str, float]] = None,
+                 timeout_retry: bool = MODEL_ROUTER_TIMEOUT_RETRY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.provider_models = provider_models
+        self.stage_tiers = stage_tiers if stage_tiers is not None else _load_stage_tiers()
+        self.small_input_chars = small_input_chars
+        self.fast_max_input_chars = fast_max_input_chars
+        self.alpha = alpha
+        self.timeout_cooldown = timeout_cooldown
+        self.latency_window = latency_window
+        self.deadlines = deadlines if deadlines is not None else dict(PROVIDER_DEADLINES)
+        self.timeout_retry = timeout_retry
+        self._clock = clock
+        self._latency: Dict[str, float] = {}
+        self._samples: Dict[str, deque] = {}
+        self._cooldown_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ---------- 관측 ----------
+
+    def observe(self, model: str, seconds: float, timed_out: bool = False):
+        """LLM 호출 1건 결과 반영 (성공 지연 시간 → EWMA, 타임아웃 → 쿨다운)"""
+        with self._lock:
+            if timed_out:
+                self._cooldown_until[model] = self._clock() + self.timeout_cooldown
+                return
+            previous = self._latency.get(model)
+            self._latency[model] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+            self._samples.setdefault(model, deque(maxlen=self.latency_window)).append(seconds)
+
+    def expected_latency(self, model: str) -> Optional[float]:
+        return self._latency.get(model)
+
+    def latency_percentile(self, model: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """최근 성공 호출 지연 시간의 백분위수 (표본이 min_samples 미만이면 None)"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        return percentile(samples, q) if len(samples) >= max(min_samples, 1) else None
+
+    def cooling_down(self, model: str) -> bool:
+        return self._cooldown_until.get(model, 0.0) > self._clock()
+
+    # ---------- 선택 ----------
+
+    def tier_for(self, stage: str, input_chars: int = 0) -> str:
+        tier = self.stage_tiers.get(stage, QUALITY)
+        if tier == BALANCED:
+            tier = FAST if input_chars <= self.small_input_chars else QUALITY
+        elif tier == FAST and input_chars > self.fast_max_input_chars:
+            tier = QUALITY
+        return tier
+
+    def alternate(self, provider: str, model: str) -> Optional[str]:
+        """같은 provider의 다른 등급 모델 (없으면 None)"""
+        others = [m for m in self.provider_models[provider].values() if m != model]
+        return others[0] if others else None
+
+    def route(self, provider: str, stage: str, input_chars: int = 0, deadline: Optional[float] = None) -> str:
+        """
+        단계 → 모델
+
+        Args:
+            input_chars: 프롬프트 길이 (fast 등급이라도 너무 길면 quality, balanced는 짧으면 fast)
+            deadline: 남은 시간 (초), 관측된 지연 시간이 이보다(또는 provider 요청 타임아웃보다) 길면 더 빠른 쪽 모델
+        """
+        models = self.provider_models[provider]
+        tier = self.tier_for(stage, input_chars)
+        model = models[tier]
+        other = self.alternate(provider, model)
+        if other is None:
+            return model
+        if self.cooling_down(model) and not self.cooling_down(other):
+            return other
+        # 요청 1건은 provider 타임아웃보다 오래 기다리지 않으므로 둘 중 짧은 쪽 기준
+        limits = [limit for limit in (deadline, self.deadlines.get(provider)) if limit is not None]
+        deadline = min(limits) if limits else None
+        if deadline is not None:
+            expected = self.expected_latency(model)
+            other_expected = self.expected_latency(other)
+            if expected is not None and expected > deadline and (other_expected is None or other_expected < expected):
+                return other
+        return model
+
+    def _retry_model(self, provider: str, model: str, error: Exception,
+                     started: float, deadline: Optional[float]) -> Optional[str]:
+        """타임아웃 후 다시 부를 모델 (재시도 꺼짐 / 타임아웃 아님 / 마감 시간 소진이면 None)"""
+        if not self.timeout_retry or not is_timeout(error):
+            return None
+        if deadline is not None and self._clock() - started >= deadline:
+            return None
+        return self.alternate(provider, model)
+
+    def call(self, provider: str, stage: str, fn: Callable[[str], Any],
+             input_chars: int = 0, deadline: Optional[float] = None):
+        """
+        route()로 고른 모델로 fn(model) 실행, 타임아웃이면 다른 등급 모델로 1번 더 (deadline 안에서만)
+
+        fn은 LLM 호출 1건 (지연 시간/타임아웃은 llm_instrumentation이 observe로 전달)
+        """
+        started = self._clock()
+        model = self.route(provider, stage, input_chars, deadline)
+        try:
+            return fn(model)
+        except Exception as e:
+            other = self._retry_model(provider, model, e, started, deadline)
+            if other is None:
+                raise
+            print(f"⚠️  {model} 타임아웃 → {other}로 재시도 ({stage})")
+            return fn(other)
+
+    async def acall(self, provider: str, stage: str, fn: Callable[[str], Awaitable[Any]],
+                    input_chars: int = 0, deadline: Optional[float] = None):
+        """call()의 비동기 버전 (fn(model)은 코루틴)"""
+        started = self._clock()
+        model = self.route(provider, stage, input_chars, deadline)
+        try:
+            return await fn(model)
+        except Exception as e:
+            other = self._retry_model(provider, model, e, started, deadline)
+            if other is None:
+                raise
+            print(f"⚠️  {model} 타임아웃 → {other}로 재시도 ({stage})")
+            return await fn(other)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """모델별 관측 상태 (디버깅/대시보드용)"""
+        with self._lock:
+            models = set(self._latency) | set(self._cooldown_until)
+            return {model: {"ewma_seconds": self._latency.get(model), "cooling_down": self.cooling_down(model)}
+                    for model in models}
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router
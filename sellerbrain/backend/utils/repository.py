@@ -0,0 +1,402 @@
+"""
+MongoDB 저장소 (Repository) 레이어
+- models.py 모델 ↔ 컬렉션 매핑과 인덱스 선언을 한 곳에서 관리 (COLLECTION_SPECS)
+- 동기(PyMongo, Celery 워커)와 비동기(Motor, FastAPI) 저장소가 같은 스키마 정의/변환 로직을 공유
+- 대량 쓰기는 insert_many / bulk_write(ordered=False)로 배치 처리하여 왕복 횟수 최소화
+- redis_conn을 넘기면 쓰기 후 컬렉션 캐시 버전을 올려 읽기 API 캐시/ETag 무효화 (utils/http_cache.py)
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import SOURCING_RESULT_TTL_DAYS, AGENT_LOG_TTL_DAYS
+from models import Product, CompetitorAnalysis, GeneratedContent, FeedbackHistory, UploadRecord, AgentLog
+from utils.ids import REFERENCE_FIELDS, to_api_id, to_storage_id
+from utils.model_loader import load_many, load_one
+from utils.blob_store import AsyncBlobStore, SyncBlobStore, externalize_fields, ref_field
+from utils.revisions import HEADS_COLLECTION, REVISIONS_COLLECTION, REVISION_INDEXES, TEXT_DIFF_FIELDS
+from utils.http_cache import bump_version, bump_version_sync
+
+# 한 번의 insert_many / bulk_write로 보낼 최대 문서 수
+WRITE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """컬렉션 스키마 정의 (모델 + 인덱스 + 별도 저장할 대용량 필드 + 컬렉션 생성 옵션)"""
+    name: str
+    model: Optional[Type[BaseModel]] = None
+    indexes: Sequence[IndexModel] = field(default_factory=tuple)
+    blob_fields: Sequence[str] = field(default_factory=tuple)
+    create_options: Dict[str, Any] = field(default_factory=dict)
+
+
+def _sourcing_result_indexes() -> List[IndexModel]:
+    indexes = [
+        IndexModel([("task_id", ASCENDING)], name="task_id_1"),
+        IndexModel([("query", ASCENDING), ("timestamp", DESCENDING)], name="query_1_timestamp_-1"),
+    ]
+    if SOURCING_RESULT_TTL_DAYS > 0:
+        # 오래된 원본 결과 자동 삭제
+        indexes.append(IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=SOURCING_RESULT_TTL_DAYS * 24 * 60 * 60
+        ))
+    return indexes
+
+
+def _agent_log_options() -> Dict[str, Any]:
+    # time-series 컬렉션: 같은 에이전트의 로그가 시간순 버킷으로 묶여 저장/범위 조회가 효율적
+    options: Dict[str, Any] = {
+        "timeseries": {"timeField": "started_at", "metaField": "agent_name", "granularity": "minutes"}
+    }
+    if AGENT_LOG_TTL_DAYS > 0:
+        options["expireAfterSeconds"] = AGENT_LOG_TTL_DAYS * 24 * 60 * 60
+    return options
+
+
+PRODUCTS = CollectionSpec("products", Product, (
+    IndexModel([("status", ASCENDING), ("sourced_at", DESCENDING)]),
+    IndexModel([("keyword", ASCENDING)]),
+    IndexModel([("owner_id", ASCENDING), ("sourced_at", DESCENDING)]),
+    IndexModel([("updated_at", ASCENDING)]),
+))
+COMPETITOR_ANALYSES = CollectionSpec("competitor_analyses", CompetitorAnalysis, (
+    IndexModel([("product_id", ASCENDING), ("analyzed_at", DESCENDING)]),
+))
+GENERATED_CONTENTS = CollectionSpec("generated_contents", GeneratedContent, (
+    IndexModel([("product_id", ASCENDING), ("generated_at", DESCENDING)]),
+    IndexModel([("analysis_id", ASCENDING)]),
+), blob_fields=("detail_html",))
+FEEDBACK_HISTORIES = CollectionSpec("feedback_histories", FeedbackHistory, (
+    IndexModel([("content_id", ASCENDING), ("feedback_at", DESCENDING)]),
+))
+UPLOAD_RECORDS = CollectionSpec("upload_records", UploadRecord, (
+    IndexModel([("content_id", ASCENDING), ("platform", ASCENDING)]),
+    IndexModel([("status", ASCENDING), ("platform", ASCENDING)]),
+))
+AGENT_LOGS = CollectionSpec("agent_logs", AgentLog, (
+    IndexModel([("task_id", ASCENDING)]),
+    IndexModel([("agent_name", ASCENDING), ("started_at", DESCENDING)]),
+), create_options=_agent_log_options())
+AGENT_LOG_ROLLUPS = CollectionSpec("agent_log_rollups", None, (
+    IndexModel([("hour", DESCENDING)]),
+))
+SOURCING_RESULTS = CollectionSpec("sourcing_results", None, tuple(_sourcing_result_indexes()), blob_fields=("raw_output",))
+CONTENT_REVISIONS = CollectionSpec(REVISIONS_COLLECTION, None, REVISION_INDEXES)
+
+COLLECTION_SPECS: Dict[str, CollectionSpec] = {
+    spec.name: spec for spec in (
+        PRODUCTS, COMPETITOR_ANALYSES, GENERATED_CONTENTS,
+        FEEDBACK_HISTORIES, UPLOAD_RECORDS, AGENT_LOGS, AGENT_LOG_ROLLUPS, SOURCING_RESULTS, CONTENT_REVISIONS,
+    )
+}
+MODEL_SPECS: Dict[Type[BaseModel], CollectionSpec] = {
+    spec.model: spec for spec in COLLECTION_SPECS.values() if spec.model is not None
+}
+
+
+def blob_ref_sources() -> Dict[str, List[str]]:
+    """blob을 참조하는 컬렉션 → 참조 필드 경로 (blob 정리 시 사용)"""
+    sources = {
+        spec.name: [ref_field(name) for name in spec.blob_fields]
+        for spec in COLLECTION_SPECS.values() if spec.blob_fields
+    }
+    # revision base 스냅샷 / head 캐시의 긴 텍스트
+    for name in (REVISIONS_COLLECTION, HEADS_COLLECTION):
+        sources.setdefault(name, []).extend(f"snapshot.{ref_field(field)}" for field in TEXT_DIFF_FIELDS)
+    return sources
+
+
+# ============================================
+# 모델 ↔ 문서 변환 (동기/비동기 공용)
+# ============================================
+
+def to_document(model: BaseModel) -> Dict[str, Any]:
+    """모델 → 저장 문서 (id → _id, 참조 필드는 ObjectId)"""
+    document = model.model_dump()
+    if "id" in document:
+        document["_id"] = to_storage_id(document.pop("id"))
+    for name in REFERENCE_FIELDS:
+        if name in document:
+            document[name] = to_storage_id(document[name])
+    return document
+
+
+def _api_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(document)
+    if "_id" in data:
+        data["id"] = to_api_id(data.pop("_id"))
+    for name in REFERENCE_FIELDS:
+        if name in data:
+            data[name] = to_api_id(data[name])
+    return data
+
+
+def from_document(model_cls: Type[BaseModel], document: Dict[str, Any]) -> BaseModel:
+    """저장 문서 → 모델 (_id → id, 참조 필드는 문자열)"""
+    return load_one(model_cls, _api_fields(document))
+
+
+def from_documents(model_cls: Type[BaseModel], documents: Iterable[Dict[str, Any]]) -> List[BaseModel]:
+    """저장 문서 여러 건 → 모델 목록 (한 번의 검증 호출로 묶음)"""
+    return load_many(model_cls, [_api_fields(document) for document in documents])
+
+
+def to_storage_filter(query: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """API 형태 필터(id, 문자열 참조) → 저장 형태 필터"""
+    storage_query = {}
+    for key, value in (query or {}).items():
+        if key == "id":
+            key = "_id"
+        if key == "_id" or key in REFERENCE_FIELDS:
+            if isinstance(value, dict):
+                value = {op: ([to_storage_id(v) for v in operand] if isinstance(operand, list) else to_storage_id(operand))
+                         for op, operand in value.items()}
+            else:
+                value = to_storage_id(value)
+        storage_query[key] = value
+    return storage_query
+
+
+def _touch(model_cls: Type[BaseModel], fields: Dict[str, Any]) -> Dict[str, Any]:
+    """updated_at 필드가 있는 모델은 변경 시각 자동 갱신 (상태 변경 폴링 기준)"""
+    if "updated_at" in model_cls.model_fields and "updated_at" not in fields:
+        return {**fields, "updated_at": datetime.now()}
+    return fields
+
+
+def _blob_field_update(fields: Dict[str, Any], blob_fields: Sequence[str]) -> Dict[str, Any]:
+    """$set 업데이트에서 대용량 필드를 참조로 바꾸고, 인라인 값/참조 중 남는 쪽은 $unset"""
+    to_set = dict(fields)
+    blobs = externalize_fields([to_set], blob_fields)
+    to_unset = {}
+    for name in blob_fields:
+        if ref_field(name) in to_set:
+            to_unset[name] = ""
+        elif name in fields:
+            to_unset[ref_field(name)] = ""
+    update: Dict[str, Any] = {"$set": to_set, "blobs": blobs}
+    if to_unset:
+        update["$unset"] = to_unset
+    return update
+
+
+def _batches(items: Sequence[Any], size: int = WRITE_BATCH_SIZE) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ============================================
+# 동기 저장소 (PyMongo) - Celery 워커/스크립트용
+# ============================================
+
+class SyncRepository:
+    """PyMongo 기반 모델 저장소"""
+
+    def __init__(self, db, model_cls: Type[BaseModel], redis_conn=None):
+        self.spec = MODEL_SPECS[model_cls]
+        self.model_cls = model_cls
+        self.collection = db[self.spec.name]
+        self.blobs = SyncBlobStore(db)
+        self.redis_conn = redis_conn
+
+    def _changed(self):
+        if self.redis_conn is not None:
+            bump_version_sync(self.redis_conn, self.spec.name)
+
+    def _prepare(self, models: Sequence[BaseModel]) -> List[Dict[str, Any]]:
+        # 대용량 필드를 blobs에 먼저 저장해서 참조가 끊기지 않도록 함
+        documents = [to_document(model) for model in models]
+        self.blobs.put_many(externalize_fields(documents, self.spec.blob_fields))
+        return documents
+
+    def insert_one(self, model: BaseModel) -> str:
+        self.collection.insert_one(self._prepare([model])[0])
+        self._changed()
+        return model.id
+
+    def insert_many(self, models: Sequence[BaseModel]) -> int:
+        """배치 단위 unordered 삽입 (한 건 실패가 나머지를 막지 않음)"""
+        inserted = 0
+        for batch in _batches(self._prepare(models)):
+            result = self.collection.insert_many(list(batch), ordered=False)
+            inserted += len(result.inserted_ids)
+        if inserted:
+            self._changed()
+        return inserted
+
+    def bulk_write(self, operations: Sequence[Any]) -> int:
+        """배치 단위 unordered bulk_write, 변경된 문서 수 반환 (대용량 필드 분리는 하지 않음)"""
+        affected = 0
+        for batch in _batches(list(operations)):
+            result = self.collection.bulk_write(list(batch), ordered=False)
+            affected += result.inserted_count + result.modified_count + result.upserted_count + result.deleted_count
+        if affected:
+            self._changed()
+        return affected
+
+    def get(self, model_id: str) -> Optional[BaseModel]:
+        document = self.collection.find_one({"_id": to_storage_id(model_id)})
+        return from_document(self.model_cls, document) if document else None
+
+    def find(self, query: Optional[Dict[str, Any]] = None, sort=None, limit: int = 0) -> List[BaseModel]:
+        cursor = self.collection.find(to_storage_filter(query))
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return from_documents(self.model_cls, cursor)
+
+    def update_fields(self, model_id: str, fields: Dict[str, Any]) -> bool:
+        update = _blob_field_update(_touch(self.model_cls, fields), self.spec.blob_fields)
+        self.blobs.put_many(update.pop("blobs"))
+        result = self.collection.update_one({"_id": to_storage_id(model_id)}, update)
+        if result.matched_count:
+            self._changed()
+        return result.matched_count > 0
+
+    def load_blob(self, model: BaseModel, name: str) -> Optional[str]:
+        """분리 저장된 필드 지연 로딩 (모델에 값을 채워서 반환)"""
+        value = getattr(model, name)
+        ref = getattr(model, ref_field(name), None)
+        if value is None and ref:
+            value = self.blobs.get(ref)
+            setattr(model, name, value)
+        return value
+
+
+# ============================================
+# 비동기 저장소 (Motor) - FastAPI용
+# ============================================
+
+class AsyncRepository:
+    """Motor 기반 모델 저장소 (SyncRepository와 같은 스키마/변환 사용)"""
+
+    def __init__(self, db, model_cls: Type[BaseModel], redis_conn=None):
+        self.spec = MODEL_SPECS[model_cls]
+        self.model_cls = model_cls
+        self.collection = db[self.spec.name]
+        self.blobs = AsyncBlobStore(db)
+        self.redis_conn = redis_conn
+
+    async def _changed(self):
+        if self.redis_conn is not None:
+            await bump_version(self.redis_conn, self.spec.name)
+
+    async def _prepare(self, models: Sequence[BaseModel]) -> List[Dict[str, Any]]:
+        documents = [to_document(model) for model in models]
+        await self.blobs.put_many(externalize_fields(documents, self.spec.blob_fields))
+        return documents
+
+    async def insert_one(self, model: BaseModel) -> str:
+        await self.collection.insert_one((await self._prepare([model]))[0])
+        await self._changed()
+        return model.id
+
+    async def insert_many(self, models: Sequence[BaseModel]) -> int:
+        inserted = 0
+        for batch in _batches(await self._prepare(models)):
+            result = await self.collection.insert_many(list(batch), ordered=False)
+            inserted += len(result.inserted_ids)
+        if inserted:
+            await self._changed()
+        return inserted
+
+    async def bulk_write(self, operations: Sequence[Any]) -> int:
+        affected = 0
+        for batch in _batches(list(operations)):
+            result = await self.collection.bulk_write(list(batch), ordered=False)
+            affected += result.inserted_count + result.modified_count + result.upserted_count + result.deleted_count
+        if affected:
+            await self._changed()
+        return affected
+
+    async def get(self, model_id: str) -> Optional[BaseModel]:
+        document = await self.collection.find_one({"_id": to_storage_id(model_id)})
+        return from_document(self.model_cls, document) if document else None
+
+    async def find(self, query: Optional[Dict[str, Any]] = None, sort=None, limit: int = 0) -> List[BaseModel]:
+        cursor = self.collection.find(to_storage_filter(query))
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return from_documents(self.model_cls, [document async for document in cursor])
+
+    async def update_fields(self, model_id: str, fields: Dict[str, Any]) -> bool:
+        update = _blob_field_update(_touch(self.model_cls, fields), self.spec.blob_fields)
+        await self.blobs.put_many(update.pop("blobs"))
+        result = await self.collection.update_one({"_id": to_storage_id(model_id)}, update)
+        if result.matched_count:
+            await self._changed()
+        return result.matched_count > 0
+
+    async def load_blob(self, model: BaseModel, name: str) -> Optional[str]:
+        value = getattr(model, name)
+        ref = getattr(model, ref_field(name), None)
+        if value is None and ref:
+            value = await self.blobs.get(ref)
+            setattr(model, name, value)
+        return value
+
+
+# ============================================
+# 컬렉션 / 인덱스 보장
+# ============================================
+
+def ttl_changes(spec: CollectionSpec, index_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    이미 있는 TTL 인덱스 중 expireAfterSeconds가 선언과 다른 것 → collMod 명령 목록
+    (create_indexes는 옵션만 바뀐 인덱스에 IndexOptionsConflict를 내므로 TTL 변경은 collMod로 적용)
+    """
+    commands = []
+    for index in spec.indexes:
+        document = index.document
+        ttl = document.get("expireAfterSeconds")
+        existing = index_info.get(document["name"])
+        if ttl is None or existing is None or existing.get("expireAfterSeconds") == ttl:
+            continue
+        commands.append({"collMod": spec.name, "index": {"name": document["name"], "expireAfterSeconds": ttl}})
+    return commands
+
+
+def ensure_indexes_sync(db):
+    """옵션이 있는 컬렉션(time-series 등) 생성, TTL 변경 적용 후 선언된 모든 인덱스 생성 (이미 있으면 무시됨)"""
+    existing = set(db.list_collection_names())
+    for spec in COLLECTION_SPECS.values():
+        if spec.create_options and spec.name not in existing:
+            try:
+                db.create_collection(spec.name, **spec.create_options)
+            except Exception as e:
+                print(f"⚠️  {spec.name} 컬렉션 옵션 적용 실패, 일반 컬렉션으로 사용: {e}")
+        if spec.indexes:
+            for command in ttl_changes(spec, db[spec.name].index_information()):
+                db.command(command)
+            db[spec.name].create_indexes(list(spec.indexes))
+
+
+async def ensure_indexes(db):
+    """옵션이 있는 컬렉션 생성, TTL 변경 적용 후 선언된 모든 인덱스 생성 (Motor)"""
+    existing = set(await db.list_collection_names())
+    for spec in COLLECTION_SPECS.values():
+        if spec.create_options and spec.name not in existing:
+            try:
+                await db.create_collection(spec.name, **spec.create_options)
+            except Exception as e:
+                print(f"⚠️  {spec.name} 컬렉션 옵션 적용 실패, 일반 컬렉션으로 사용: {e}")
+        if spec.indexes:
+            try:
+                for command in ttl_changes(spec, await db[spec.name].index_information()):
+                    await db.command(command)
+                await db[spec.name].create_indexes(list(spec.indexes))
+            except Exception as e:
+                print(f"{spec.name} 인덱스 생성 오류: {e}")
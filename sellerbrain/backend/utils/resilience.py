@@ -0,0 +1,349 @@
+"""
+LLM provider 장애 대응 (Claude / Gemini 공통)
+- 타임아웃: provider별 SDK 요청 타임아웃 (LLM_TIMEOUT_ANTHROPIC / LLM_TIMEOUT_GOOGLE, 클라이언트 생성 시 적용)
+- 전체 마감 (call_deadline): 논리적 호출 1건(라우터 재시도 + 헤지 + provider 대체)을 LLM_CALL_DEADLINE 안에 끝냄
+    · 각 SDK 요청 타임아웃 = min(provider 타임아웃, 남은 시간), 시간이 다 되면 재시도/대체 없이 DeadlineExceededError
+    · 라우터 재시도나 헤지가 켜져 있으면 SDK 자동 재시도는 끔 (sdk_max_retries) → 재시도가 겹겹이 쌓이지 않음
+- 서킷 브레이커: 최근 구간 오류 비율이 기준 이상이면 provider 호출을 잠시 차단 (CircuitOpenError, 이후 1건 시험 호출)
+    · 호출 결과는 utils/llm_instrumentation.py가 LLM 호출마다 기록 (툴 호출 + LangChain 크루 호출 모두 반영)
+- 헤지 요청 (LLM_HEDGING): 모델의 최근 p95 지연 시간이 지나도 응답이 없으면 같은 요청을 1번 더 보내고 먼저 성공한 응답 사용
+    · 늦은 쪽은 아직 시작 전이면 취소, 이미 실행 중이면 결과를 버림 (동기 SDK 호출은 중간에 끊을 수 없고 SDK 타임아웃으로 종료)
+- provider 간 대체 (with_fallback): Claude 텍스트 생성이 실패/차단되면 Gemini로 생성
+- 비동기 버전 (ahedged_call / aresilient_call / awith_fallback): 늦은 쪽 요청은 태스크 취소로 실제 중단
+"""
+
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    LLM_TIMEOUT_ANTHROPIC,
+    LLM_TIMEOUT_GOOGLE,
+    CIRCUIT_WINDOW_SECONDS,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_ERROR_RATE,
+    CIRCUIT_OPEN_SECONDS,
+    LLM_HEDGING,
+    LLM_HEDGE_QUANTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_CALL_WORKERS,
+    LLM_CROSS_PROVIDER_FALLBACK,
+    LLM_CALL_DEADLINE,
+    MODEL_ROUTER_TIMEOUT_RETRY,
+)
+from utils.metrics import LLM_CIRCUIT_OPEN, LLM_FALLBACKS, LLM_HEDGES
+from utils.model_router import get_model_router
+
+PROVIDER_TIMEOUTS: Dict[str, float] = {
+    "anthropic": LLM_TIMEOUT_ANTHROPIC,
+    "google": LLM_TIMEOUT_GOOGLE,
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# 현재 논리적 호출의 마감 시각 (time.monotonic 기준, 헤지 스레드/asyncio.to_thread에도 전달됨)
+_call_deadline: ContextVar[Optional[float]] = ContextVar("llm_call_deadline", default=None)
+
+
+def provider_timeout(provider: str) -> float:
+    return PROVIDER_TIMEOUTS.get(provider, max(PROVIDER_TIMEOUTS.values()))
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """논리적 LLM 호출 1건의 전체 시간 예산(LLM_CALL_DEADLINE) 소진"""
+
+
+# ============================================
+# 전체 마감 시간
+# ============================================
+
+@contextmanager
+def call_deadline(seconds: float = LLM_CALL_DEADLINE):
+    """
+    with 블록 = 논리적 LLM 호출 1건 (바깥에 더 이른 마감이 있으면 그대로 유지)
+
+    사용 예:
+        with call_deadline():
+            get_model_router().call("anthropic", stage, call, deadline=time_left())
+    """
+    deadline = time.monotonic() + seconds
+    current = _call_deadline.get()
+    token = _call_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _call_deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """현재 호출의 남은 시간 (초, call_deadline 밖이면 None)"""
+    deadline = _call_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def request_timeout(provider: str) -> float:
+    """
+    SDK 요청 1건의 타임아웃 = min(provider 타임아웃, 남은 시간)
+
+    Raises:
+        DeadlineExceededError: 남은 시간이 없음 (요청을 보내지 않음)
+    """
+    left = time_left()
+    if left is None:
+        return provider_timeout(provider)
+    if left <= 0:
+        raise DeadlineExceededError(f"{provider} 호출 시간 예산 소진")
+    return min(provider_timeout(provider), left)
+
+
+def sdk_max_retries(configured: int) -> int:
+    """SDK 자동 재시도 횟수 (라우터 타임아웃 재시도나 헤지 요청이 있으면 0 → 재시도 중첩 방지)"""
+    return 0 if MODEL_ROUTER_TIMEOUT_RETRY or LLM_HEDGING else configured
+
+
+# ============================================
+# 서킷 브레이커
+# ============================================
+
+class CircuitBreaker:
+    """
+    provider 1개의 서킷 브레이커 (스레드 안전)
+    closed → (오류 비율 초과) → open → (open_seconds 경과) → half_open: 시험 호출 1건 → 성공이면 closed, 실패면 다시 open
+    """
+
+    def __init__(self, name: str, window_seconds: float = CIRCUIT_WINDOW_SECONDS,
+                 min_calls: int = CIRCUIT_MIN_CALLS, error_rate: float = CIRCUIT_ERROR_RATE,
+                 open_seconds: float = CIRCUIT_OPEN_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._outcomes: deque = deque()  # (시각, 성공 여부)
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(self._clock())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        return OPEN if now - self._opened_at < self.open_seconds else HALF_OPEN
+
+    def allow(self) -> bool:
+        """호출해도 되는지 (half_open이면 시험 호출 1건만 허용, 결과가 안 오면 open_seconds 후 다시 허용)"""
+        with self._lock:
+            now = self._clock()
+            state = self._state(now)
+            if state == CLOSED:
+                return True
+            if state == OPEN:
+                return False
+            if self._probe_started is None or now - self._probe_started >= self.open_seconds:
+                self._probe_started = now
+                return True
+            return False
+
+    def record(self, ok: bool):
+        with self._lock:
+            now = self._clock()
+            if self._opened_at is not None:
+                if self._state(now) == HALF_OPEN:
+                    if ok:
+                        self._close()
+                    else:
+                        self._open(now)
+                return
+            self._outcomes.append((now, ok))
+            while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+                self._outcomes.popleft()
+            failures = sum(1 for _, success in self._outcomes if not success)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._open(now)
+
+    def _open(self, now: float):
+        if self._opened_at is None:
+            print(f"⚠️  {self.name} 서킷 브레이커 open ({self.open_seconds:.0f}초 동안 호출 차단)")
+        self._opened_at = now
+        self._probe_started = None
+        self._outcomes.clear()
+        LLM_CIRCUIT_OPEN.set(1, provider=self.name)
+
+    def _close(self):
+        self._opened_at = None
+        self._probe_started = None
+        LLM_CIRCUIT_OPEN.set(0, provider=self.name)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(provider, CircuitBreaker(provider))
+    return breaker
+
+
+# ============================================
+# 헤지 요청
+# ============================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _call_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=LLM_CALL_WORKERS, thread_name_prefix="llm-call")
+        return _executor
+
+
+def hedge_delay(model: str) -> Optional[float]:
+    """헤지 요청을 보낼 시점 (꺼져 있거나 표본이 부족하면 None)"""
+    if not LLM_HEDGING:
+        return None
+    return get_model_router().latency_percentile(model, LLM_HEDGE_QUANTILE, min_samples=LLM_HEDGE_MIN_SAMPLES)
+
+
+def hedged_call(provider: str, fn: Callable[[], Any], hedge_after: Optional[float],
+                executor: Optional[ThreadPoolExecutor] = None):
+    """
+    fn() 실행, hedge_after초 안에 끝나지 않으면 fn()을 1번 더 실행해서 먼저 성공한 결과 반환
+    (hedge_after가 None이면 그냥 fn(), 둘 다 실패하면 먼저 난 예외)
+    """
+    if hedge_after is None:
+        return fn()
+    executor = executor or _call_executor()
+    # task_id/크루 단계 contextvar를 유지한 채 풀 스레드에서 실행
+    primary = executor.submit(contextvars.copy_context().run, fn)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    hedge = executor.submit(contextvars.copy_context().run, fn)
+    pending = {primary, hedge}
+    first_error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                LLM_HEDGES.inc(provider=provider, winner="primary" if future is primary else "hedge")
+                return future.result()
+            first_error = first_error or future.exception()
+    raise first_error
+
+
+async def ahedged_call(provider: str, fn: Callable[[], Awaitable[Any]], hedge_after: Optional[float]):
+    """hedged_call()의 비동기 버전 (fn()은 코루틴, 진 쪽 태스크는 취소)"""
+    if hedge_after is None:
+        return await fn()
+    primary = asyncio.ensure_future(fn())
+    pending = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        hedge = asyncio.ensure_future(fn())
+        pending = {primary, hedge}
+        first_error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    LLM_HEDGES.inc(provider=provider, winner="primary" if task is primary else "hedge")
+                    return task.result()
+                first_error = first_error or task.exception()
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# ============================================
+# 진입점
+# ============================================
+
+def resilient_call(provider: str, model: str, fn: Callable[[], Any], hedge: bool = True):
+    """
+    LLM 호출 1건: 서킷 브레이커 확인 → (헤지) 실행
+
+    fn은 타임아웃이 설정된 SDK 호출 + instrument_llm_call 기록을 포함해야 함 (결과가 브레이커/라우터에 반영됨)
+
+    Raises:
+        CircuitOpenError: provider 서킷이 열려 있음
+        DeadlineExceededError: 전체 시간 예산 소진
+    """
+    request_timeout(provider)
+    if not get_breaker(provider).allow():
+        raise CircuitOpenError(f"{provider} 서킷 브레이커 open (최근 오류 비율 초과)")
+    return hedged_call(provider, fn, hedge_delay(model) if hedge else None)
+
+
+async def aresilient_call(provider: str, model: str, fn: Callable[[], Awaitable[Any]], hedge: bool = True):
+    """resilient_call()의 비동기 버전"""
+    request_timeout(provider)
+    if not get_breaker(provider).allow():
+        raise CircuitOpenError(f"{provider} 서킷 브레이커 open (최근 오류 비율 초과)")
+    return await ahedged_call(provider, fn, hedge_delay(model) if hedge else None)
+
+
+def _deadline_passed() -> bool:
+    left = time_left()
+    return left is not None and left <= 0
+
+
+def with_fallback(provider: str, primary: Callable[[], Any], target: str, fallback: Callable[[], Any]):
+    """
+    primary() 실패(서킷 차단 포함) 시 다른 provider로 fallback()
+    (LLM_CROSS_PROVIDER_FALLBACK=false이거나 전체 시간 예산을 다 썼으면 그대로 raise)
+    """
+    try:
+        return primary()
+    except Exception as e:
+        if not LLM_CROSS_PROVIDER_FALLBACK or _deadline_passed():
+            raise
+        print(f"⚠️  {provider} 호출 실패 → {target}로 대체 생성: {e}")
+        LLM_FALLBACKS.inc(provider=provider, target=target)
+        return fallback()
+
+
+async def awith_fallback(provider: str, primary: Callable[[], Awaitable[Any]], target: str,
+                         fallback: Callable[[], Awaitable[Any]]):
+    """with_fallback()의 비동기 버전"""
+    try:
+        return await primary()
+    except Exception as e:
+        if not LLM_CROSS_PROVIDER_FALLBACK or _deadline_passed():
+            raise
+        print(f"⚠️  {provider} 호출 실패 → {target}로 대체 생성: {e}")
+        LLM_FALLBACKS.inc(provider=provider, target=target)
+        return await fallback()
@@ -0,0 +1,249 @@
+"""
+HITL 재생성 이력 (Delta 기반 Revision Store)
+- 재생성마다 GeneratedContent 전체를 새로 저장하지 않고, 기준 스냅샷(base) + 변경분(delta)만 저장
+- delta: 바뀐 필드만 저장, detail_html 같은 긴 텍스트는 토큰 단위 diff(복사 구간 + 삽입 문자열)
+- REVISION_KEYFRAME_INTERVAL마다 base를 새로 써서 임의 revision 복원 비용을 제한
+- 최신 revision 스냅샷은 head 문서에 캐시 → 최신본 조회는 문서 1건
+- compact()로 오래된 delta를 새 base로 접어서 정리 (Celery beat에서 주기 실행)
+"""
+
+import os
+import re
+import sys
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Union
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import REVISION_KEYFRAME_INTERVAL, REVISION_KEEP_LAST
+from utils.blob_store import SyncBlobStore, externalize_fields, ref_field
+
+REVISIONS_COLLECTION = "content_revisions"
+HEADS_COLLECTION = "content_revision_heads"
+
+# 토큰 단위 diff를 적용할 텍스트 필드
+TEXT_DIFF_FIELDS = ("detail_html",)
+
+REVISION_INDEXES = (
+    IndexModel([("content_id", ASCENDING), ("revision", DESCENDING)], unique=True),
+)
+
+# HTML 태그와 텍스트를 분리하여 토큰화 (태그 단위로 비교하면 인라인 CSS 수정에도 diff가 작음)
+_TOKEN_PATTERN = re.compile(r"(<[^>]*>)")
+
+TextOp = Union[List[int], str]
+
+
+# ============================================
+# diff / patch (순수 함수)
+# ============================================
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_PATTERN.split(text or "") if token]
+
+
+def diff_text(old: str, new: str) -> List[TextOp]:
+    """
+    텍스트 diff → 연산 목록
+    [start, end]: 이전 토큰 구간 복사 / "문자열": 새 내용 삽입
+    """
+    old_tokens = tokenize(old)
+    new_tokens = tokenize(new)
+    ops: List[TextOp] = []
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_tokens[j1:j2]))
+    return ops
+
+
+def apply_text_diff(old: str, ops: List[TextOp]) -> str:
+    old_tokens = tokenize(old)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.append("".join(old_tokens[op[0]:op[1]]))
+    return "".join(parts)
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """스냅샷 간 변경분 (set / unset / text)"""
+    delta: Dict[str, Any] = {"set": {}, "unset": [], "text": {}}
+    for name, value in new.items():
+        if name in old and old[name] == value:
+            continue
+        if name in TEXT_DIFF_FIELDS and isinstance(old.get(name), str) and isinstance(value, str):
+            delta["text"][name] = diff_text(old[name], value)
+        else:
+            delta["set"][name] = value
+    delta["unset"] = [name for name in old if name not in new]
+    return delta
+
+
+def apply_delta(snapshot: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    result = dict(snapshot)
+    for name in delta.get("unset", []):
+        result.pop(name, None)
+    for name, ops in delta.get("text", {}).items():
+        result[name] = apply_text_diff(result.get(name) or "", ops)
+    result.update(delta.get("set", {}))
+    return result
+
+
+def delta_is_empty(delta: Dict[str, Any]) -> bool:
+    return not (delta["set"] or delta["unset"] or delta["text"])
+
+
+def snapshot_of(content) -> Dict[str, Any]:
+    """GeneratedContent → revision 스냅샷 (ID/참조 키 제외, JSON 호환 값)"""
+    return content.model_dump(mode="json", exclude={"id", "detail_html_ref"})
+
+
+# ============================================
+# Revision Store (PyMongo, Celery 워커용)
+# ============================================
+
+class RevisionStore:
+    """GeneratedContent 재생성 이력 저장소"""
+
+    def __init__(self, db, keyframe_interval: int = REVISION_KEYFRAME_INTERVAL):
+        self.revisions = db[REVISIONS_COLLECTION]
+        self.heads = db[HEADS_COLLECTION]
+        self.blobs = SyncBlobStore(db)
+        self.keyframe_interval = max(keyframe_interval, 1)
+
+    def _store_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        # base 스냅샷의 긴 HTML은 blobs로 분리 (같은 HTML이면 중복 저장 안 됨)
+        stored = dict(snapshot)
+        self.blobs.put_many(externalize_fields([stored], TEXT_DIFF_FIELDS))
+        return stored
+
+    def _load_snapshot(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        snapshot = dict(stored)
+        for name in TEXT_DIFF_FIELDS:
+            ref = snapshot.pop(ref_field(name), None)
+            if ref:
+                snapshot[name] = self.blobs.get(ref)
+        return snapshot
+
+    def latest(self, content_id: str) -> Optional[Dict[str, Any]]:
+        """최신 revision (head 캐시에서 바로 반환)"""
+        head = self.heads.find_one({"_id": content_id})
+        if head is None:
+            return None
+        return {"revision": head["revision"], "snapshot": self._load_snapshot(head["snapshot"])}
+
+    def record(self, content_id: str, snapshot: Dict[str, Any], feedback_id: Optional[str] = None) -> int:
+        """
+        새 revision 기록
+
+        Args:
+            content_id: GeneratedContent ID
+            snapshot: 재생성 후 콘텐츠 필드 (model_dump(mode="json", exclude={"id"}))
+            feedback_id: 재생성을 일으킨 FeedbackHistory ID
+
+        Returns:
+            기록된 revision 번호 (변경이 없으면 기존 번호)
+        """
+        head = self.latest(content_id)
+        now = datetime.utcnow()
+
+        if head is None:
+            revision, kind, payload = 0, "base", {"snapshot": self._store_snapshot(snapshot)}
+        else:
+            delta = diff_snapshots(head["snapshot"], snapshot)
+            if delta_is_empty(delta):
+                return head["revision"]
+            revision = head["revision"] + 1
+            if revision % self.keyframe_interval == 0:
+                kind, payload = "base", {"snapshot": self._store_snapshot(snapshot)}
+            else:
+                kind, payload = "delta", {"delta": delta}
+
+        self.revisions.insert_one({
+            "content_id": content_id,
+            "revision": revision,
+            "kind": kind,
+            "feedback_id": feedback_id,
+            "created_at": now,
+            **payload
+        })
+        self.heads.replace_one(
+            {"_id": content_id},
+            {"_id": content_id, "revision": revision, "snapshot": self._store_snapshot(snapshot), "updated_at": now},
+            upsert=True
+        )
+        return revision
+
+    def materialize(self, content_id: str, revision: int) -> Optional[Dict[str, Any]]:
+        """임의 revision 복원 (가장 가까운 base + 이후 delta 적용)"""
+        head = self.heads.find_one({"_id": content_id}, {"revision": 1})
+        if head is not None and head["revision"] == revision:
+            return self.latest(content_id)["snapshot"]
+
+        base = self.revisions.find_one(
+            {"content_id": content_id, "kind": "base", "revision": {"$lte": revision}},
+            sort=[("revision", DESCENDING)]
+        )
+        if base is None:
+            return None
+
+        snapshot = self._load_snapshot(base["snapshot"])
+        deltas = self.revisions.find(
+            {"content_id": content_id, "revision": {"$gt": base["revision"], "$lte": revision}},
+            sort=[("revision", ASCENDING)]
+        )
+        for document in deltas:
+            if document["kind"] == "base":
+                snapshot = self._load_snapshot(document["snapshot"])
+            else:
+                snapshot = apply_delta(snapshot, document["delta"])
+        return snapshot
+
+    def compact(self, content_id: str, keep_last: int = REVISION_KEEP_LAST) -> int:
+        """
+        최근 keep_last개 revision만 복원 가능하도록 남기고 이전 이력을 새 base로 접음
+
+        Returns:
+            삭제된 revision 문서 수
+        """
+        head = self.heads.find_one({"_id": content_id}, {"revision": 1})
+        if head is None:
+            return 0
+        cutoff = head["revision"] - keep_last
+        if cutoff <= 0:
+            return 0
+
+        snapshot = self.materialize(content_id, cutoff)
+        if snapshot is None:
+            return 0
+        # 어떤 피드백이 이 revision을 만들었는지는 base로 접어도 유지
+        previous = self.revisions.find_one({"content_id": content_id, "revision": cutoff}, {"feedback_id": 1})
+        self.revisions.replace_one(
+            {"content_id": content_id, "revision": cutoff},
+            {
+                "content_id": content_id,
+                "revision": cutoff,
+                "kind": "base",
+                "feedback_id": (previous or {}).get("feedback_id"),
+                "snapshot": self._store_snapshot(snapshot),
+                "created_at": datetime.utcnow(),
+                "compacted": True
+            },
+            upsert=True
+        )
+        result = self.revisions.delete_many({"content_id": content_id, "revision": {"$lt": cutoff}})
+        return result.deleted_count
+
+    def compact_all(self, keep_last: int = REVISION_KEEP_LAST) -> int:
+        """revision이 keep_last보다 많이 쌓인 모든 콘텐츠 정리"""
+        deleted = 0
+        for head in self.heads.find({"revision": {"$gt": keep_last}}, {"_id": 1}):
+            deleted += self.compact(head["_id"], keep_last)
+        return deleted
@@ -0,0 +1,61 @@
+"""
+JSON 직렬화 공용 모듈 (orjson 기반)
+- API 응답 클래스: FastAPI 기본 인코더(jsonable_encoder + json.dumps) 대신 orjson으로 바로 bytes 생성
+- MongoDB 문서 코덱: ObjectId / datetime / Enum / Pydantic 모델을 별도 변환 없이 직렬화
+- 워커 → Redis → WebSocket 메시지도 같은 dumps()로 bytes 그대로 전달
+"""
+
+from typing import Any, Dict, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """orjson이 기본 지원하지 않는 타입 처리 (datetime, Enum, dataclass는 orjson이 직접 처리)"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """객체를 UTF-8 JSON bytes로 직렬화 (한글은 이스케이프하지 않음)"""
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """JSON bytes/str 역직렬화"""
+    return orjson.loads(data)
+
+
+def from_mongo(document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    MongoDB 문서를 API 응답 형태로 변환
+    _id → id 이름만 바꾸고, ObjectId/datetime 값 변환은 dumps()에 맡김
+    """
+    if document is None:
+        return None
+    if "_id" in document:
+        document["id"] = document.pop("_id")
+    return document
+
+
+class MongoJSONResponse(JSONResponse):
+    """
+    orjson 기반 응답 클래스
+    엔드포인트에서 이 클래스를 직접 반환하면 jsonable_encoder 단계도 건너뜀
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
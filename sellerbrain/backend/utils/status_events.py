@@ -0,0 +1,181 @@
+"""
+상품/콘텐츠 상태 변경 → 소유자 대상 WebSocket 이벤트 (API 프로세스에서 실행)
+- Replica set / Atlas: MongoDB change stream으로 products 상태 변경, generated_contents 생성을 구독
+- Standalone Mongo / BACKEND_MODE=memory (change stream 미지원): products.updated_at / generated_contents._id(ObjectId 시각) 기준 폴링
+- 이벤트는 owner_id의 WebSocket 연결에만 전송 → 프론트엔드는 GET /products/ 폴링 불필요
+    {"type": "product_status", "product_id", "status", "keyword"}
+    {"type": "content_generated", "product_id", "content_id"}
+"""
+
+import asyncio
+import os
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import STATUS_POLL_INTERVAL
+from utils.ids import to_api_id
+from utils.repository import PRODUCTS, GENERATED_CONTENTS
+
+Event = Dict[str, Any]
+Publisher = Callable[[str, Event], Awaitable[None]]
+
+# change stream 미지원 서버 오류 코드 (40573: replica set 아님, 115/303: 명령 미지원)
+_UNSUPPORTED_CODES = {40573, 115, 303}
+
+# 상품 캐시 크기 (product_id → (owner_id, 마지막 전송 상태))
+OWNER_CACHE_SIZE = 1024
+
+_PRODUCT_FIELDS = {"_id": 1, "owner_id": 1, "status": 1, "keyword": 1, "updated_at": 1}
+_CONTENT_FIELDS = {"_id": 1, "product_id": 1}
+
+
+def change_stream_pipeline():
+    """products 상태 변경 + generated_contents 생성만 전달받도록 서버에서 필터링"""
+    return [
+        {"$match": {"$or": [
+            {"ns.coll": PRODUCTS.name, "operationType": {"$in": ["insert", "replace"]}},
+            {"ns.coll": PRODUCTS.name, "operationType": "update",
+             "updateDescription.updatedFields.status": {"$exists": True}},
+            {"ns.coll": GENERATED_CONTENTS.name, "operationType": "insert"},
+        ]}},
+        {"$project": {
+            "ns": 1, "operationType": 1,
+            **{f"fullDocument.{name}": 1 for name in ("_id", "owner_id", "status", "keyword", "product_id")},
+        }},
+    ]
+
+
+def product_event(document: Dict[str, Any]) -> Tuple[Optional[str], Event]:
+    return document.get("owner_id"), {
+        "type": "product_status",
+        "product_id": to_api_id(document["_id"]),
+        "status": document.get("status"),
+        "keyword": document.get("keyword"),
+    }
+
+
+def content_event(document: Dict[str, Any]) -> Event:
+    return {
+        "type": "content_generated",
+        "product_id": to_api_id(document.get("product_id")),
+        "content_id": to_api_id(document["_id"]),
+    }
+
+
+class StatusWatcher:
+    """상태 변경을 감지해서 publish(owner_id, event) 호출"""
+
+    def __init__(self, db, publish: Publisher, poll_interval: float = STATUS_POLL_INTERVAL,
+                 use_change_stream: bool = True):
+        self.db = db
+        self.products = db[PRODUCTS.name]
+        self.contents = db[GENERATED_CONTENTS.name]
+        self.publish = publish
+        self.poll_interval = poll_interval
+        self.use_change_stream = use_change_stream
+        self._products: "OrderedDict[Any, Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+        self._resume_token = None
+
+    async def run(self):
+        if not self.use_change_stream:
+            await self._poll()
+            return
+        try:
+            await self._watch()
+        except OperationFailure as e:
+            if e.code not in _UNSUPPORTED_CODES and "replica set" not in str(e):
+                raise
+            print(f"⚠️  change stream 미지원 (standalone Mongo) → {self.poll_interval}초 간격 폴링으로 대체")
+            await self._poll()
+
+    # ----------------------------------------
+    # 공통
+    # ----------------------------------------
+
+    def _remember(self, product_id, owner_id: Optional[str], status: Optional[str]):
+        self._products[product_id] = (owner_id, status)
+        self._products.move_to_end(product_id)
+        while len(self._products) > OWNER_CACHE_SIZE:
+            self._products.popitem(last=False)
+
+    async def _owner_of(self, product_id) -> Optional[str]:
+        if product_id in self._products:
+            return self._products[product_id][0]
+        product = await self.products.find_one({"_id": product_id}, {"owner_id": 1, "status": 1})
+        if product is None:
+            return None
+        self._remember(product_id, product.get("owner_id"), product.get("status"))
+        return product.get("owner_id")
+
+    async def _emit_product(self, document: Dict[str, Any]):
+        owner_id, event = product_event(document)
+        previous = self._products.get(document["_id"])
+        self._remember(document["_id"], owner_id, event["status"])
+        # 폴링은 상태 외 필드 변경도 잡히므로 같은 상태는 다시 보내지 않음
+        if owner_id and (previous is None or previous[1] != event["status"]):
+            await self.publish(owner_id, event)
+
+    async def _emit_content(self, document: Dict[str, Any]):
+        owner_id = await self._owner_of(document.get("product_id"))
+        if owner_id:
+            await self.publish(owner_id, content_event(document))
+
+    # ----------------------------------------
+    # change stream
+    # ----------------------------------------
+
+    async def _watch(self):
+        while True:
+            try:
+                async with self.db.watch(
+                    change_stream_pipeline(),
+                    full_document="updateLookup",
+                    resume_after=self._resume_token
+                ) as stream:
+                    async for change in stream:
+                        self._resume_token = change["_id"]
+                        document = change.get("fullDocument")
+                        if not document:
+                            continue
+                        if change["ns"]["coll"] == PRODUCTS.name:
+                            await self._emit_product(document)
+                        else:
+                            await self._emit_content(document)
+            except OperationFailure as e:
+                if e.code in _UNSUPPORTED_CODES or "replica set" in str(e):
+                    raise
+                print(f"change stream 오류, 재연결: {e}")
+                await asyncio.sleep(1)
+            except PyMongoError as e:
+                # 일시적 네트워크 오류 등 → 마지막 resume token부터 다시 구독
+                print(f"change stream 오류, 재연결: {e}")
+                await asyncio.sleep(1)
+
+    # ----------------------------------------
+    # 폴링 (standalone)
+    # ----------------------------------------
+
+    async def _poll(self):
+        last_updated = datetime.now()
+        last_content_id = ObjectId.from_datetime(datetime.utcnow())
+        while True:
+            try:
+                cursor = self.products.find({"updated_at": {"$gt": last_updated}}, _PRODUCT_FIELDS).sort("updated_at", 1)
+                async for document in cursor:
+                    last_updated = max(last_updated, document["updated_at"])
+                    await self._emit_product(document)
+
+                cursor = self.contents.find({"_id": {"$gt": last_content_id}}, _CONTENT_FIELDS).sort("_id", 1)
+                async for document in cursor:
+                    if isinstance(document["_id"], ObjectId):
+                        last_content_id = max(last_content_id, document["_id"])
+                    await self._emit_content(document)
+            except PyMongoError as e:
+                print(f"상태 폴링 오류: {e}")
+            await asyncio.sleep(self.poll_interval)
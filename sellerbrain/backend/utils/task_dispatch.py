@@ -0,0 +1,180 @@
+"""
+Celery 작업 발행 + 수락 제어 (Admission Control)
+- 브로커 발행은 전용 스레드 풀 + Celery 프로듀서 풀에서 처리하여 이벤트 루프를 막지 않음
+- 대기열 길이와 워커 수를 보고 과부하 시 요청을 초기에 거절 (429/503 + Retry-After)
+"""
+
+import asyncio
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    CELERY_DISPATCH_POOL_SIZE,
+    SOURCING_MAX_QUEUE_DEPTH,
+    SOURCING_MAX_ESTIMATED_WAIT,
+    SOURCING_AVG_TASK_SECONDS,
+    CELERY_WORKER_STATS_TTL,
+)
+
+# Redis 브로커의 기본 큐 이름 (Celery task_default_queue)
+DEFAULT_QUEUE = "celery"
+
+
+@dataclass
+class AdmissionDecision:
+    """수락 제어 판정 결과"""
+    allowed: bool
+    status_code: int
+    queue_depth: int
+    worker_slots: int
+    estimated_wait_seconds: int
+    retry_after: Optional[int] = None
+    reason: Optional[str] = None
+
+
+def evaluate_admission(
+    queue_depth: int,
+    worker_slots: int,
+    avg_task_seconds: float = SOURCING_AVG_TASK_SECONDS,
+    max_queue_depth: int = SOURCING_MAX_QUEUE_DEPTH,
+    max_estimated_wait: int = SOURCING_MAX_ESTIMATED_WAIT,
+    no_worker_retry_after: int = CELERY_WORKER_STATS_TTL,
+) -> AdmissionDecision:
+    """
+    대기열 길이와 워커 슬롯 수로 새 작업 수락 여부를 판정합니다.
+
+    Args:
+        queue_depth: 브로커 큐에 쌓인 작업 수
+        worker_slots: 실행 가능한 워커 슬롯 수 (워커 수 x 동시성)
+        avg_task_seconds: 작업 1건 평균 소요 시간
+        max_queue_depth: 허용 대기열 길이
+        max_estimated_wait: 허용 예상 대기 시간 (초)
+        no_worker_retry_after: 워커가 없을 때 Retry-After 값
+
+    Returns:
+        AdmissionDecision (allowed=False면 status_code/retry_after 사용)
+    """
+
+    if worker_slots <= 0:
+        return AdmissionDecision(
+            allowed=False,
+            status_code=503,
+            queue_depth=queue_depth,
+            worker_slots=0,
+            estimated_wait_seconds=0,
+            retry_after=no_worker_retry_after,
+            reason="No active workers"
+        )
+
+    # 새 작업이 실행되기까지 앞에 있는 작업이 몇 "라운드" 처리되어야 하는지
+    rounds_ahead = math.ceil(queue_depth / worker_slots)
+    estimated_wait = int(rounds_ahead * avg_task_seconds)
+
+    if queue_depth >= max_queue_depth or estimated_wait > max_estimated_wait:
+        # 대기열이 한도 아래로 내려갈 때까지 걸리는 시간
+        over_budget = max(queue_depth - max_queue_depth + 1, 1)
+        retry_after = int(math.ceil(over_budget / worker_slots) * avg_task_seconds)
+        return AdmissionDecision(
+            allowed=False,
+            status_code=429,
+            queue_depth=queue_depth,
+            worker_slots=worker_slots,
+            estimated_wait_seconds=estimated_wait,
+            retry_after=max(retry_after, 1),
+            reason="Sourcing queue is over budget"
+        )
+
+    return AdmissionDecision(
+        allowed=True,
+        status_code=202,
+        queue_depth=queue_depth,
+        worker_slots=worker_slots,
+        estimated_wait_seconds=estimated_wait
+    )
+
+
+def admission_headers(decision: AdmissionDecision) -> Dict[str, str]:
+    """거절 응답용 Retry-After 헤더"""
+    if decision.retry_after is None:
+        return {}
+    return {"Retry-After": str(decision.retry_after)}
+
+
+class TaskDispatcher:
+    """
+    Celery 작업 비동기 발행기
+    send_task는 브로커 왕복이 있는 블로킹 호출이므로 전용 스레드 풀에서 실행하고,
+    각 스레드는 Celery 프로듀서 풀에서 커넥션을 빌려 재사용합니다.
+    local_runner(utils.backends.LocalTaskRunner)를 주면 브로커 없이 같은 프로세스에서 실행합니다.
+    """
+
+    def __init__(self, celery_app, redis_conn, queue: str = DEFAULT_QUEUE, local_runner=None):
+        self.celery_app = celery_app
+        self.redis_conn = redis_conn
+        self.queue = queue
+        self.local_runner = local_runner
+        self.executor = ThreadPoolExecutor(
+            max_workers=CELERY_DISPATCH_POOL_SIZE,
+            thread_name_prefix="celery-dispatch"
+        )
+        # 프로듀서 풀 크기를 발행 스레드 수에 맞춤
+        self.celery_app.conf.broker_pool_limit = CELERY_DISPATCH_POOL_SIZE
+
+        self._worker_slots = 0
+        self._worker_stats_at = float("-inf")
+        self._worker_stats_lock = asyncio.Lock()
+
+    def _send(self, name: str, args: List[Any]):
+        if self.local_runner is not None:
+            return self.local_runner.send_task(name, args=args)
+        with self.celery_app.producer_or_acquire() as producer:
+            return self.celery_app.send_task(name, args=args, producer=producer)
+
+    async def dispatch(self, name: str, args: List[Any]):
+        """작업 발행 (이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._send, name, args)
+
+    async def queue_depth(self) -> int:
+        """브로커 큐 길이 (Redis LLEN)"""
+        if self.local_runner is not None:
+            return self.local_runner.queue_depth()
+        return int(await self.redis_conn.llen(self.queue))
+
+    def _inspect_worker_slots(self) -> int:
+        stats = self.celery_app.control.inspect(timeout=1.0).stats() or {}
+        slots = 0
+        for worker_stats in stats.values():
+            slots += int(worker_stats.get("pool", {}).get("max-concurrency", 1))
+        return slots
+
+    async def worker_slots(self) -> int:
+        """활성 워커 슬롯 수 (inspect 결과를 TTL 동안 캐시)"""
+        if self.local_runner is not None:
+            return self.local_runner.worker_slots()
+        async with self._worker_stats_lock:
+            if time.monotonic() - self._worker_stats_at > CELERY_WORKER_STATS_TTL:
+                loop = asyncio.get_running_loop()
+                try:
+                    self._worker_slots = await loop.run_in_executor(self.executor, self._inspect_worker_slots)
+                except Exception as e:
+                    print(f"Celery 워커 상태 조회 오류: {e}")
+                    self._worker_slots = 0
+                self._worker_stats_at = time.monotonic()
+            return self._worker_slots
+
+    async def check_admission(self) -> AdmissionDecision:
+        """현재 대기열/워커 상태로 수락 여부 판정"""
+        queue_depth, worker_slots = await asyncio.gather(self.queue_depth(), self.worker_slots())
+        return evaluate_admission(queue_depth, worker_slots)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+        if self.local_runner is not None:
+            self.local_runner.shutdown()
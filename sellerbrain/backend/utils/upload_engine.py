@@ -0,0 +1,490 @@
+"""
+오픈마켓 업로드 엔진
+- APPROVED 상품의 최신 GeneratedContent를 플랫폼별 UploadRecord(PENDING)로 등록하고, 플랫폼별 큐로 병렬 업로드
+- 플랫폼마다 토큰 버킷(초당 호출 수) + 동시 요청 수 제한 (PLATFORM_LIMITS)
+- 일괄 등록 API가 있는 플랫폼은 batch_size 단위로 묶어서 전송
+- 429 / 5xx / 네트워크 오류는 지수 백오프(full jitter)로 재시도하며 retry_count 갱신 (Retry-After 헤더 우선)
+- 여러 워커가 동시에 돌아도 같은 레코드를 중복 업로드하지 않도록 claim 토큰으로 선점
+  (claimed_at 기준 UPLOAD_CLAIM_LEASE_SECONDS가 지난 선점은 워커가 죽은 것으로 보고 다시 가져감, 실행 중에는 배치마다 갱신)
+- 배치 처리 중 예외가 나면 해당 배치는 재시도 가능한 실패로 PENDING에 되돌리고, 끝나지 않은 선점은 종료 시 반납
+- 로컬 테스트: python utils/fake_marketplace.py 실행 후 MARKETPLACE_API_URL=http://localhost:9100
+"""
+
+import os
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+from pymongo import DESCENDING, UpdateOne
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    MARKETPLACE_API_URL,
+    UPLOAD_PLATFORMS,
+    UPLOAD_MAX_RETRIES,
+    UPLOAD_BACKOFF_BASE,
+    UPLOAD_BACKOFF_MAX,
+    UPLOAD_REQUEST_TIMEOUT,
+    UPLOAD_CLAIM_LEASE_SECONDS,
+)
+from models import GeneratedContent, Product, ProductStatus, UploadPlatform, UploadRecord, UploadStatus
+from utils.ids import new_id, to_storage_id
+from utils.metrics import UPLOAD_ITEMS, UPLOAD_REQUEST_SECONDS
+from utils.repository import SyncRepository
+
+
+@dataclass(frozen=True)
+class PlatformLimits:
+    """플랫폼별 호출 한도"""
+    rate_per_second: float  # 토큰 충전 속도 (초당 요청 수)
+    burst: int              # 버킷 크기 (순간 최대 요청 수)
+    concurrency: int        # 동시 요청 수
+    batch_size: int = 1     # 요청 1건에 담을 상품 수 (1 = 일괄 등록 API 없음)
+
+
+# 기본 한도 (판매자 계정별 계약 한도보다 약간 낮게 잡아서 사용)
+PLATFORM_LIMITS: Dict[UploadPlatform, PlatformLimits] = {
+    UploadPlatform.COUPANG: PlatformLimits(rate_per_second=5, burst=5, concurrency=4),
+    UploadPlatform.NAVER: PlatformLimits(rate_per_second=2, burst=4, concurrency=2, batch_size=10),
+    UploadPlatform.AUCTION: PlatformLimits(rate_per_second=1, burst=2, concurrency=2, batch_size=20),
+    UploadPlatform.GMARKET: PlatformLimits(rate_per_second=1, burst=2, concurrency=2, batch_size=20),
+}
+
+
+# ============================================
+# 토큰 버킷 / 백오프 (순수 로직)
+# ============================================
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (같은 플랫폼의 모든 업로드 스레드가 공유)"""
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self._updated = clock()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        토큰 차감 시도
+
+        Returns:
+            0이면 획득 성공, 아니면 다시 시도하기까지 기다릴 시간 (초)
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            self.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """429를 받으면 버킷을 비워서 seconds 동안 같은 플랫폼의 다른 스레드도 멈추게 함"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+def backoff_delay(attempt: int, base: float = UPLOAD_BACKOFF_BASE, cap: float = UPLOAD_BACKOFF_MAX,
+                  rng: Callable[[], float] = random.random) -> float:
+    """지수 백오프 + full jitter: [0, min(cap, base * 2^attempt))"""
+    return rng() * min(cap, base * (2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    try:
+        return max(float(value), 0.0) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+# ============================================
+# 오픈마켓 API 클라이언트
+# ============================================
+
+@dataclass
+class ItemResult:
+    """상품 1건의 업로드 결과"""
+    ref: str
+    ok: bool
+    platform_product_id: Optional[str] = None
+    product_url: Optional[str] = None
+    error: Optional[str] = None
+    retryable: bool = False
+    retry_after: float = 0.0
+
+
+class MarketplaceClient:
+    """
+    오픈마켓 업로드 API 클라이언트 (플랫폼 인증/서명은 MARKETPLACE_API_URL 게이트웨이에서 처리)
+    - 단건: POST {url}/{platform}/products  → {"product_id", "url"}
+    - 일괄: POST {url}/{platform}/products/batch {"items": [...]} → {"results": [{"ref", "ok", ...}]}
+    """
+
+    def __init__(self, base_url: str = MARKETPLACE_API_URL, session=None, timeout: float = UPLOAD_REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        # 커넥션 재사용 (스레드 간 공유)
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def upload(self, platform: str, listings: List[Dict[str, Any]]) -> List[ItemResult]:
+        batch = len(listings) > 1
+        url = f"{self.base_url}/{platform}/products" + ("/batch" if batch else "")
+        body = {"items": listings} if batch else listings[0]
+
+        try:
+            response = self.session.post(url, json=body, timeout=self.timeout)
+        except requests.RequestException as e:
+            return [ItemResult(listing["ref"], ok=False, error=str(e), retryable=True) for listing in listings]
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            error = f"HTTP {response.status_code}"
+            return [ItemResult(listing["ref"], ok=False, error=error, retryable=True, retry_after=retry_after)
+                    for listing in listings]
+        if response.status_code >= 400:
+            error = f"HTTP {response.status_code}: {response.text[:500]}"
+            return [ItemResult(listing["ref"], ok=False, error=error) for listing in listings]
+
+        data = response.json()
+        items = data.get("results", []) if batch else [{"ref": listings[0]["ref"], "ok": True, **data}]
+        by_ref = {item.get("ref"): item for item in items}
+        results = []
+        for listing in listings:
+            item = by_ref.get(listing["ref"])
+            if item is None:
+                results.append(ItemResult(listing["ref"], ok=False, error="응답에 결과 없음", retryable=True))
+            else:
+                results.append(ItemResult(
+                    listing["ref"],
+                    ok=item.get("ok", True),
+                    platform_product_id=item.get("product_id"),
+                    product_url=item.get("url"),
+                    error=item.get("error"),
+                    retryable=item.get("retryable", False)
+                ))
+        return results
+
+
+def build_listing(record: UploadRecord, content: GeneratedContent) -> Dict[str, Any]:
+    """UploadRecord + GeneratedContent → 업로드 요청 본문 (ref로 결과와 레코드 매칭)"""
+    best_title = max(content.titles, key=lambda title: title.score or 0, default=None)
+    return {
+        "ref": record.id,
+        "content_id": content.id,
+        "title": best_title.text if best_title else "",
+        "images": [image.url for image in content.images],
+        "detail_html": content.detail_html,
+    }
+
+
+# ============================================
+# 업로드 엔진 (PyMongo, Celery 워커용)
+# ============================================
+
+class UploadEngine:
+    """승인된 콘텐츠를 플랫폼별 한도에 맞춰 업로드"""
+
+    def __init__(self, db, client: Optional[MarketplaceClient] = None,
+                 limits: Optional[Dict[UploadPlatform, PlatformLimits]] = None,
+                 max_retries: int = UPLOAD_MAX_RETRIES,
+                 sleep: Callable[[float], None] = time.sleep,
+                 rng: Callable[[], float] = random.random,
+                 redis_conn=None,
+                 target_platforms: Optional[Iterable[str]] = None,
+                 lease_seconds: float = UPLOAD_CLAIM_LEASE_SECONDS):
+        # redis_conn: 상품 상태 변경(UPLOADED) 시 /products 응답 캐시 무효화
+        self.products = SyncRepository(db, Product, redis_conn)
+        self.contents = SyncRepository(db, GeneratedContent)
+        self.uploads = SyncRepository(db, UploadRecord)
+        self.client = client or MarketplaceClient()
+        self.limits = limits or PLATFORM_LIMITS
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.rng = rng
+        # 상품을 UPLOADED로 바꾸려면 이 플랫폼 모두에 성공해야 함
+        self.target_platforms = {UploadPlatform(platform) for platform in (target_platforms or UPLOAD_PLATFORMS)}
+        self.lease_seconds = lease_seconds
+        self.buckets = {
+            platform: TokenBucket(limit.rate_per_second, limit.burst, sleep=sleep)
+            for platform, limit in self.limits.items()
+        }
+        self._summary_lock = Lock()
+        self._lease_lock = Lock()
+        self._lease_renewed = 0.0
+
+    def enqueue_approved(self, platforms: Iterable[UploadPlatform]) -> int:
+        """
+        APPROVED 상품의 최신 콘텐츠를 플랫폼별 PENDING 레코드로 등록 (이미 등록된 조합은 건너뜀)
+
+        Returns:
+            새로 등록한 레코드 수
+        """
+        platforms = list(platforms)
+        approved = self.products.find({"status": ProductStatus.APPROVED.value})
+        if not approved:
+            return 0
+
+        latest: Dict[str, GeneratedContent] = {}
+        contents = self.contents.find(
+            {"product_id": {"$in": [product.id for product in approved]}},
+            sort=[("generated_at", DESCENDING)]
+        )
+        for content in contents:
+            latest.setdefault(content.product_id, content)
+
+        content_ids = [content.id for content in latest.values()]
+        existing = {
+            (record.content_id, record.platform)
+            for record in self.uploads.find({"content_id": {"$in": content_ids}})
+        }
+        records = [
+            UploadRecord(content_id=content_id, platform=platform)
+            for content_id in content_ids
+            for platform in platforms
+            if (content_id, platform) not in existing
+        ]
+        if records:
+            self.uploads.insert_many(records)
+        return len(records)
+
+    def _claim(self, platforms: List[UploadPlatform], token: str) -> List[UploadRecord]:
+        # update_many는 문서 단위로 원자적이라 다른 워커와 같은 레코드를 나눠 갖지 않음
+        now = datetime.now()
+        expired = now - timedelta(seconds=self.lease_seconds)
+        self.uploads.collection.update_many(
+            {
+                "platform": {"$in": [platform.value for platform in platforms]},
+                "$or": [
+                    {"status": UploadStatus.PENDING.value},
+                    {"status": UploadStatus.IN_PROGRESS.value, "claimed_at": {"$not": {"$gte": expired}}},
+                ]
+            },
+            {"$set": {"status": UploadStatus.IN_PROGRESS.value, "claim": token, "claimed_at": now}}
+        )
+        return self.uploads.find({"claim": token})
+
+    def _renew_lease(self, token: str):
+        """긴 실행 중에 선점을 빼앗기지 않도록 claimed_at 갱신 (유효 시간의 1/3마다)"""
+        with self._lease_lock:
+            if time.monotonic() - self._lease_renewed < self.lease_seconds / 3:
+                return
+            self._lease_renewed = time.monotonic()
+        self.uploads.collection.update_many(
+            {"claim": token, "status": UploadStatus.IN_PROGRESS.value},
+            {"$set": {"claimed_at": datetime.now()}}
+        )
+
+    def _release(self, token: str):
+        """이번 실행에서 끝내지 못한 선점을 PENDING으로 반납 (다음 실행에서 바로 다시 가져감)"""
+        self.uploads.collection.update_many(
+            {"claim": token, "status": UploadStatus.IN_PROGRESS.value},
+            {"$set": {"status": UploadStatus.PENDING.value}, "$unset": {"claim": "", "claimed_at": ""}}
+        )
+
+    def run(self, platforms: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        승인 콘텐츠 등록 → 선점 → 플랫폼별 병렬 업로드
+
+        Returns:
+            {platform: {"success": n, "failed": n}}
+        """
+        platforms = [UploadPlatform(platform) for platform in (platforms or UPLOAD_PLATFORMS)]
+        self.enqueue_approved(platforms)
+        token = new_id()
+        records = self._claim(platforms, token)
+        self._lease_renewed = time.monotonic()
+        summary = {platform.value: {"success": 0, "failed": 0} for platform in platforms}
+        if not records:
+            return summary
+        try:
+            self._upload_claimed(platforms, records, token, summary)
+        finally:
+            self._release(token)
+        return summary
+
+    def _upload_claimed(self, platforms: List[UploadPlatform], records: List[UploadRecord], token: str, summary):
+        contents = {
+            content.id: content
+            for content in self.contents.find({"id": {"$in": list({record.content_id for record in records})}})
+        }
+        for content in contents.values():
+            self.contents.load_blob(content, "detail_html")
+
+        missing = [record for record in records if record.content_id not in contents]
+        if missing:
+            self._write([self._failure_update(record.id, "콘텐츠를 찾을 수 없음", retried=False) for record in missing])
+            for record in missing:
+                summary[record.platform.value]["failed"] += 1
+
+        retry_counts = {record.id: record.retry_count for record in records}
+        jobs = []
+        for platform in platforms:
+            limit = self.limits[platform]
+            listings = [
+                build_listing(record, contents[record.content_id])
+                for record in records
+                if record.platform == platform and record.content_id in contents
+            ]
+            pending: "queue.Queue[List[Dict[str, Any]]]" = queue.Queue()
+            for start in range(0, len(listings), limit.batch_size):
+                pending.put(listings[start:start + limit.batch_size])
+            jobs.extend((platform, pending) for _ in range(min(limit.concurrency, pending.qsize())))
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = [executor.submit(self._drain, platform, pending, retry_counts, summary, token)
+                           for platform, pending in jobs]
+                for future in futures:
+                    future.result()
+
+        self._mark_products_uploaded(contents)
+
+    def _drain(self, platform: UploadPlatform, pending: queue.Queue, retry_counts: Dict[str, int], summary, token: str):
+        while True:
+            try:
+                batch = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self._renew_lease(token)
+                self._upload_batch(platform, batch, retry_counts, summary)
+            except Exception as e:
+                # 한 배치의 오류가 같은 플랫폼의 나머지 배치/다른 플랫폼 업로드를 막지 않도록 배치 단위로 기록
+                print(f"⚠️ [업로드] {platform.value} 배치 처리 실패: {e}")
+                self._fail_batch(platform, batch, retry_counts, summary, token, f"{type(e).__name__}: {e}")
+
+    def _fail_batch(self, platform: UploadPlatform, batch: List[Dict[str, Any]],
+                    retry_counts: Dict[str, int], summary, token: str, error: str):
+        """아직 처리 중인 항목을 재시도 가능한 실패로 기록 (재시도 한도를 넘으면 FAILED)"""
+        updates, failed, retried = [], 0, 0
+        for listing in batch:
+            ref = listing["ref"]
+            retry_counts[ref] += 1
+            final = retry_counts[ref] > self.max_retries
+            status = UploadStatus.FAILED if final else UploadStatus.PENDING
+            # 이미 성공/실패로 끝난 항목은 건드리지 않음
+            updates.append(UpdateOne(
+                {"_id": to_storage_id(ref), "status": UploadStatus.IN_PROGRESS.value, "claim": token},
+                {
+                    "$set": {"status": status.value, "error_message": error},
+                    "$inc": {"retry_count": 1},
+                    "$unset": {"claim": "", "claimed_at": ""}
+                }
+            ))
+            failed += final
+            retried += not final
+        self._write(updates)
+        self._count(platform, summary, 0, failed, retried)
+
+    def _upload_batch(self, platform: UploadPlatform, batch: List[Dict[str, Any]],
+                      retry_counts: Dict[str, int], summary):
+        bucket = self.buckets[platform]
+        attempt = 0
+        while batch:
+            bucket.acquire()
+            started = time.perf_counter()
+            results = self.client.upload(platform.value, batch)
+            outcome = "ok" if all(result.ok for result in results) else "error"
+            UPLOAD_REQUEST_SECONDS.observe(time.perf_counter() - started, platform=platform.value, outcome=outcome)
+
+            listings = {listing["ref"]: listing for listing in batch}
+            updates, retry, retry_after = [], [], 0.0
+            success = failed = 0
+            for result in results:
+                if result.ok:
+                    updates.append(self._success_update(result))
+                    success += 1
+                elif result.retryable and attempt < self.max_retries:
+                    retry_counts[result.ref] += 1
+                    updates.append(self._failure_update(result.ref, result.error, retried=True, final=False))
+                    retry.append(listings[result.ref])
+                    retry_after = max(retry_after, result.retry_after)
+                else:
+                    updates.append(self._failure_update(result.ref, result.error, retried=False))
+                    failed += 1
+            self._write(updates)
+            self._count(platform, summary, success, failed, len(retry))
+
+            if not retry:
+                return
+            if retry_after:
+                bucket.penalize(retry_after)
+            self.sleep(max(retry_after, backoff_delay(attempt, rng=self.rng)))
+            attempt += 1
+            batch = retry
+
+    def _success_update(self, result: ItemResult) -> UpdateOne:
+        return UpdateOne({"_id": to_storage_id(result.ref)}, {
+            "$set": {
+                "status": UploadStatus.SUCCESS.value,
+                "product_url": result.product_url,
+                "platform_product_id": result.platform_product_id,
+                "uploaded_at": datetime.now(),
+                "error_message": None,
+            },
+            "$unset": {"claim": "", "claimed_at": ""}
+        })
+
+    def _failure_update(self, ref: str, error: Optional[str], retried: bool, final: bool = True) -> UpdateOne:
+        update: Dict[str, Any] = {"$set": {"error_message": error}}
+        if retried:
+            update["$inc"] = {"retry_count": 1}
+        if final:
+            update["$set"]["status"] = UploadStatus.FAILED.value
+            update["$unset"] = {"claim": "", "claimed_at": ""}
+        return UpdateOne({"_id": to_storage_id(ref)}, update)
+
+    def _write(self, updates: List[UpdateOne]):
+        if updates:
+            self.uploads.bulk_write(updates)
+
+    def _count(self, platform: UploadPlatform, summary, success: int, failed: int, retried: int):
+        for outcome, count in (("success", success), ("failed", failed), ("retry", retried)):
+            if count:
+                UPLOAD_ITEMS.inc(count, platform=platform.value, outcome=outcome)
+        with self._summary_lock:
+            summary[platform.value]["success"] += success
+            summary[platform.value]["failed"] += failed
+
+    def _mark_products_uploaded(self, contents: Dict[str, GeneratedContent]):
+        """대상 플랫폼(target_platforms) 업로드가 모두 성공한 상품은 UPLOADED로 변경"""
+        records = self.uploads.find({"content_id": {"$in": list(contents)}, "status": UploadStatus.SUCCESS.value})
+        uploaded: Dict[str, set] = {}
+        for record in records:
+            uploaded.setdefault(record.content_id, set()).add(record.platform)
+        product_ids = {
+            contents[content_id].product_id
+            for content_id, platforms in uploaded.items()
+            if platforms >= self.target_platforms
+        }
+        if product_ids:
+            self.products.bulk_write([
+                UpdateOne({"_id": to_storage_id(product_id)}, {"$set": {"status": ProductStatus.UPLOADED.value, "updated_at": datetime.now()}})
+                for product_id in product_ids
+            ])
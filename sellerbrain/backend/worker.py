@@ -1,23 +1,76 @@
 from celery import Celery
-import os
 import time
 import json
-import redis
+from datetime import datetime
+
+from config import REDIS_URL, CELERY_BROKER_URL, CELERY_RESULT_BACKEND, LLM_FIXTURE_PATH
+from utils.backends import mongo_client, sync_redis
+from utils.serialization import dumps
+from utils.http_cache import bump_version_sync
+from utils.metrics import REGISTRY, SOURCING_TASK_SECONDS
+from models import GeneratedContent, Product, CompetitorAnalysis, ParsedFeedback
+from utils.repository import SOURCING_RESULTS, SyncRepository, blob_ref_sources
+from utils.blob_store import SyncBlobStore, externalize_fields, sweep_unreferenced
+from utils.revisions import RevisionStore
+from utils.content_feedback import apply_feedback
+from utils.upload_engine import UploadEngine
+from utils.llm_cache import install_langchain_cache
+from utils.cassette import install_cassette
+from utils.agent_log import get_agent_log_writer, rollup_agent_logs, set_current_task, reset_current_task
+from utils.llm_instrumentation import set_current_stage, reset_current_stage
 
 # Celery Configuration
 celery_app = Celery(
     "worker",
-    broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
-    backend=os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+    broker=CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND
 )
 
+# 주기 작업 (celery -A worker.celery_app beat)
+celery_app.conf.beat_schedule = {
+    "compact-content-revisions": {
+        "task": "worker.compact_content_revisions",
+        "schedule": 60 * 60,  # 1시간
+    },
+    "upload-approved-content": {
+        "task": "worker.upload_approved_content",
+        "schedule": 5 * 60,  # 5분
+    },
+    "rollup-agent-logs": {
+        "task": "worker.rollup_agent_logs",
+        "schedule": 5 * 60,  # 5분
+    },
+    "sweep-blobs": {
+        "task": "worker.sweep_blobs",
+        "schedule": 6 * 60 * 60,  # 6시간
+    },
+}
+
 # Redis Client for Pub/Sub (FastAPI WebSocket 통신용)
-redis_client = redis.Redis(host='localhost', port=6379, db=0)
+redis_client = sync_redis(REDIS_URL)
+
+# MongoDB Client (워커 프로세스당 1개, 커넥션 풀 재사용)
+_mongo_client = None
+
+def get_db():
+    global _mongo_client
+    if _mongo_client is None:
+        _mongo_client = mongo_client()
+    return _mongo_client.ai_marketing
+
+# AgentLog도 워커의 MongoClient를 공유
+get_agent_log_writer().configure(get_db)
+
+# LangChain(Gemini) 호출에 LLM 응답 캐시 적용
+install_langchain_cache()
+
+# CASSETTE_MODE=record/replay: 외부 API 호출 녹화/재생 (LLM 캐시 자리를 대신함)
+install_cassette()
 
 # (Legacy Task Removed)
 
-@celery_app.task(name="worker.run_sourcing_task")
-def run_sourcing_task(query: str):
+@celery_app.task(bind=True, name="worker.run_sourcing_task")
+def run_sourcing_task(self, query: str):
     """
     Executes the product sourcing logic in background
     """
@@ -33,9 +86,19 @@ def run_sourcing_task(query: str):
     publish_update(f"소싱 작업 시작: {query}")
     time.sleep(1)
     
+    started = time.perf_counter()
+    status = "failed"
+    # 크루/툴에서 남기는 AgentLog를 이 task에 연결
+    task_token = set_current_task(self.request.id)
+    stage_token = set_current_stage(None)
+
     # CrewAI Execution
     try:
-        from crew import create_sourcing_crew
+        if LLM_FIXTURE_PATH:
+            # 부하 테스트: 녹화된 응답 재생 (외부 API 호출 없음, 크루 내부 비용은 측정 대상 아님)
+            from utils.llm_fixtures import replay_sourcing_crew as create_sourcing_crew
+        else:
+            from crew import create_sourcing_crew
         publish_update("CrewAI 에이전트 팀 구성 중...")
         
         # Note: In a real scenario, we would pass a callback to capture CrewAI's verbose output
@@ -62,25 +125,115 @@ def run_sourcing_task(query: str):
             result_data = {"raw_output": result_str, "parse_error": str(parse_error)}
 
         # Publish final result for Frontend
-        redis_client.publish("sourcing_updates", json.dumps({
+        redis_client.publish("sourcing_updates", dumps({
             "type": "result",
+            "task_id": self.request.id,
             "data": result_data
-        }, ensure_ascii=False))
+        }))
         
         # Save to MongoDB (Sync)
-        from pymongo import MongoClient
-        mongo_client = MongoClient("mongodb://localhost:27017")
-        db = mongo_client.ai_marketing
-        db.sourcing_results.insert_one({
+        db = get_db()
+        # 큰 원본 출력은 blobs 컬렉션에 압축 저장하고 참조만 남김
+        stored_result = dict(result_data)
+        SyncBlobStore(db).put_many(externalize_fields([stored_result], SOURCING_RESULTS.blob_fields))
+        db[SOURCING_RESULTS.name].insert_one({
+            "task_id": self.request.id,
             "query": query,
-            "result": result_data,
+            "result": stored_result,
             "timestamp": time.time(),
+            "created_at": datetime.utcnow(),  # TTL 인덱스 기준 필드
             "status": "completed"
         })
+        # 읽기 API 응답 캐시/ETag 무효화
+        bump_version_sync(redis_client, "sourcing_results")
         
+        status = "completed"
         return {"query": query, "result": result_data, "status": "completed"}
         
     except Exception as e:
         error_msg = f"에러 발생: {str(e)}"
         publish_update(error_msg)
         return {"status": "failed", "error": str(e)}
+
+    finally:
+        SOURCING_TASK_SECONDS.observe(time.perf_counter() - started, status=status)
+        # 워커 메트릭을 Redis로 올려 API /metrics에서 합산
+        REGISTRY.flush_to_redis(redis_client)
+        reset_current_stage(stage_token)
+        reset_current_task(task_token)
+        get_agent_log_writer().flush()
+
+
+@celery_app.task(name="worker.process_content_feedback")
+def process_content_feedback(content_id: str, feedback_text: str):
+    """
+    HITL 피드백 처리: 파싱 → 해당 필드만 재생성 → 저장 + revision 기록
+    """
+    from agents.content_creator import regenerate_from_feedback
+    from tools.claude_tool import parse_user_feedback
+
+    db = get_db()
+    content = SyncRepository(db, GeneratedContent).get(content_id)
+    if content is None:
+        return {"status": "not_found", "content_id": content_id}
+    product = SyncRepository(db, Product).get(content.product_id)
+    analysis = SyncRepository(db, CompetitorAnalysis).get(content.analysis_id)
+
+    parsed = ParsedFeedback(**parse_user_feedback(feedback_text))
+    try:
+        changes = regenerate_from_feedback(
+            parsed.model_dump(mode="json"),
+            product_name=product.keyword if product else "",
+            golden_keywords=product.golden_keywords if product else [],
+            competitor_analysis=analysis.model_dump(mode="json") if analysis else {}
+        )
+        feedback = apply_feedback(db, content_id, feedback_text, parsed, changes, redis_conn=redis_client)
+    finally:
+        REGISTRY.flush_to_redis(redis_client)
+    if feedback is None:
+        return {"status": "not_found", "content_id": content_id}
+    return {"status": "ok", "feedback_id": feedback.id, "revision": feedback.revision}
+
+
+@celery_app.task(name="worker.compact_content_revisions")
+def compact_content_revisions():
+    """
+    HITL 재생성 이력 정리 (오래된 delta를 base 스냅샷으로 접음)
+    """
+    deleted = RevisionStore(get_db()).compact_all()
+    print(f"[이력 정리] 삭제된 revision: {deleted}건")
+    return {"deleted": deleted}
+
+
+@celery_app.task(name="worker.upload_approved_content")
+def upload_approved_content(platforms=None):
+    """
+    승인(APPROVED)된 콘텐츠를 오픈마켓에 업로드 (플랫폼별 호출 한도/재시도는 UploadEngine에서 처리)
+    """
+    try:
+        summary = UploadEngine(get_db(), redis_conn=redis_client).run(platforms)
+    finally:
+        REGISTRY.flush_to_redis(redis_client)
+    print(f"[업로드] {summary}")
+    return summary
+
+
+@celery_app.task(name="worker.rollup_agent_logs")
+def rollup_agent_logs_task():
+    """
+    AgentLog 시간별 롤업 갱신 (/stats/agents는 롤업만 읽음)
+    """
+    get_agent_log_writer().flush()
+    count = rollup_agent_logs(get_db())
+    bump_version_sync(redis_client, "agent_log_rollups")
+    return {"rollups": count}
+
+
+@celery_app.task(name="worker.sweep_blobs")
+def sweep_blobs():
+    """
+    어떤 문서도 참조하지 않는 blob 삭제 (TTL로 지워진 소싱 결과, 정리된 revision의 원본 출력/HTML)
+    """
+    deleted = sweep_unreferenced(get_db(), blob_ref_sources())
+    print(f"[blob 정리] 삭제된 blob: {deleted}건")
+    return {"deleted": deleted}